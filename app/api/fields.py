@@ -0,0 +1,77 @@
+"""Metadata projection of search results.
+
+Search endpoints accept a ``fields`` parameter naming a preset or listing
+metadata fields, so list views receive only what they render. Trimming
+happens after caching and before serialization: cached results keep the
+full metadata and every projection is served from them. Full company
+details stay available from ``/api/company/{id}``, which is served from
+the in-memory catalog.
+"""
+
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+# Metadata fields kept by each preset, None keeps everything
+CARD_FIELDS = ("name", "slug", "one_liner", "small_logo_thumb_url", "batch")
+FIELD_PRESETS: Dict[str, Optional[Tuple[str, ...]]] = {
+    "card": CARD_FIELDS,
+    "summary": CARD_FIELDS + ("website", "industry", "industries", "tags", "status", "team_size", "regions"),
+    "full": None,
+}
+
+
+def resolve_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Resolve a ``fields`` parameter to the metadata fields to keep.
+
+    Args:
+        fields: Preset name (``card``, ``summary``, ``full``) or comma-separated field names
+
+    Returns:
+        Optional[Tuple[str, ...]]: Fields to keep, None to keep all metadata
+    """
+    if not fields or not fields.strip():
+        return None
+    preset = fields.strip().lower()
+    if preset in FIELD_PRESETS:
+        return FIELD_PRESETS[preset]
+    return tuple(field.strip() for field in fields.split(",") if field.strip())
+
+
+def project(results: List[Dict[str, Any]], fields: Optional[Tuple[str, ...]]) -> List[Dict[str, Any]]:
+    """Keep only some metadata fields of each result.
+
+    Args:
+        results: Normalized results with id, score and metadata
+        fields: Fields to keep, None to return the results unchanged
+
+    Returns:
+        List[Dict[str, Any]]: Results with trimmed metadata
+    """
+    if fields is None:
+        return results
+    projected = []
+    for item in results:
+        metadata = item["metadata"] or {}
+        projected.append({
+            "id": item["id"],
+            "score": item["score"],
+            "metadata": {field: metadata[field] for field in fields if field in metadata},
+        })
+    return projected
+
+
+async def project_events(
+    events: AsyncIterator[Dict[str, Any]], fields: Optional[Tuple[str, ...]]
+) -> AsyncIterator[Dict[str, Any]]:
+    """Project the results carried by streamed search events.
+
+    Args:
+        events: Events with an ``event`` name and payload
+        fields: Fields to keep, None to pass events through unchanged
+
+    Yields:
+        Dict[str, Any]: Events whose ``results`` have trimmed metadata
+    """
+    async for event in events:
+        if fields is not None and "results" in event:
+            event = {**event, "results": project(event["results"], fields)}
+        yield event
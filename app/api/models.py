@@ -1,7 +1,41 @@
 """Pydantic models for API requests and responses."""
 
-from pydantic import BaseModel, Field
-from typing import Dict, List, Any, Optional
+from pydantic import BaseModel, Field, model_validator
+from typing import Dict, List, Any, Literal, Optional
+
+
+class SearchFilters(BaseModel):
+    """Structured filters restricting the companies a search can return.
+    
+    List fields accept any of their values; all given conditions must hold.
+    
+    Attributes:
+        batch: Accepted YC batches
+        industry: Accepted industries
+        status: Accepted company statuses
+        team_size_min: Smallest accepted team size
+        team_size_max: Largest accepted team size
+    """
+    batch: Optional[List[str]] = Field(None, min_length=1, description="Accepted YC batches, e.g. W21")
+    industry: Optional[List[str]] = Field(None, min_length=1, description="Accepted industries")
+    status: Optional[List[str]] = Field(None, min_length=1, description="Accepted statuses, e.g. Active")
+    team_size_min: Optional[int] = Field(None, ge=0, description="Smallest accepted team size")
+    team_size_max: Optional[int] = Field(None, ge=0, description="Largest accepted team size")
+
+    @model_validator(mode="after")
+    def check_team_size_range(self) -> "SearchFilters":
+        """Reject an empty team size range.
+
+        Raises:
+            ValueError: If ``team_size_min`` exceeds ``team_size_max``
+        """
+        if (
+            self.team_size_min is not None
+            and self.team_size_max is not None
+            and self.team_size_min > self.team_size_max
+        ):
+            raise ValueError("team_size_min must not exceed team_size_max")
+        return self
 
 
 class QueryRequest(BaseModel):
@@ -9,8 +43,48 @@ class QueryRequest(BaseModel):
     
     Attributes:
         query: The search query string
+        limit: Page size; enables pagination
+        cursor: Cursor of the next page, from a previous response
+        fields: Metadata projection, a preset or comma-separated field names
+        filters: Structured filters on company metadata
     """
     query: str = Field(..., description="The search query string")
+    limit: Optional[int] = Field(None, ge=1, description="Page size; enables pagination")
+    cursor: Optional[str] = Field(None, description="Cursor of the next page, from a previous response")
+    fields: Optional[str] = Field(
+        None, description="Metadata to return: card, summary, full (default) or comma-separated field names"
+    )
+    filters: Optional[SearchFilters] = Field(None, description="Structured filters on company metadata")
+
+
+class DeepResearchRequest(QueryRequest):
+    """Request model for deep research.
+    
+    Attributes:
+        rerank: Re-ranking of the merged results
+        mmr_lambda: MMR trade-off between relevance (1.0) and diversity (0.0)
+    """
+    rerank: Optional[Literal["sum", "rrf", "normalized", "mmr"]] = Field(
+        None, description="Re-ranking of the merged results, the server default if omitted"
+    )
+    mmr_lambda: Optional[float] = Field(
+        None, ge=0.0, le=1.0, description="MMR trade-off between relevance (1.0) and diversity (0.0)"
+    )
+
+
+class BatchQueryRequest(BaseModel):
+    """Request model for batch searches.
+    
+    Attributes:
+        queries: The search query strings
+        fields: Metadata projection, a preset or comma-separated field names
+        filters: Structured filters on company metadata, applied to every query
+    """
+    queries: List[str] = Field(..., min_length=1, description="The search query strings")
+    fields: Optional[str] = Field(
+        None, description="Metadata to return: card, summary, full (default) or comma-separated field names"
+    )
+    filters: Optional[SearchFilters] = Field(None, description="Structured filters on company metadata")
 
 
 class CompanyMetadata(BaseModel):
@@ -35,11 +109,18 @@ class CompanyResult(BaseModel):
     
     Attributes:
         id: Unique company identifier
-        score: Relevance score from the search
+        score: Relevance score from the search, whose scale depends on the ranking
         metadata: Company metadata
     """
     id: str = Field(..., description="Unique company identifier")
-    score: float = Field(..., description="Relevance score")
+    score: float = Field(
+        ...,
+        description=(
+            "Relevance score, comparable within one response only: cosine similarity for vector "
+            "matches, a reciprocal rank fusion score (about 0.01 to 0.03) for keyword queries fused "
+            "with lexical hits, 1.0 for the company a query names"
+        ),
+    )
     metadata: Dict[str, Any] = Field(..., description="Company metadata")
 
 
@@ -48,5 +129,27 @@ class SearchResponse(BaseModel):
     
     Attributes:
         results: List of company results
+        next_cursor: Cursor of the next page, in paginated responses
+    """
+    results: List[CompanyResult] = Field([], description="Search results")
+    next_cursor: Optional[str] = Field(None, description="Cursor of the next page, in paginated responses")
+
+
+class QueryResults(BaseModel):
+    """Results of one query of a batch search.
+    
+    Attributes:
+        query: The search query string
+        results: List of company results
+    """
+    query: str = Field(..., description="The search query string")
+    results: List[CompanyResult] = Field([], description="Search results")
+
+
+class BatchSearchResponse(BaseModel):
+    """Response model for batch searches.
+    
+    Attributes:
+        results: Results of each query, in request order
     """
-    results: List[CompanyResult] = Field([], description="Search results") 
\ No newline at end of file
+    results: List[QueryResults] = Field([], description="Results of each query")
@@ -24,3 +24,4 @@ a clean separation of concerns and improve maintainability.
 
 from app.api.routes.search import router as search_router
 from app.api.routes.companies import router as companies_router
+from app.api.routes.admin import router as admin_router
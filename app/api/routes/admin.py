@@ -0,0 +1,48 @@
+"""API routes for administrative operations."""
+
+from fastapi import APIRouter, HTTPException, Header
+import hmac
+import logging
+from typing import Dict, Optional
+
+from app.core.config import get_settings
+from app.services.search_service import invalidate_search_cache
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+# Get settings
+settings = get_settings()
+
+
+def verify_admin_token(token: Optional[str]) -> None:
+    """Check the admin token sent with a request.
+    
+    Args:
+        token: Value of the ``X-Admin-Token`` header
+        
+    Raises:
+        HTTPException: If admin endpoints are disabled or the token is wrong
+    """
+    if not settings.admin_token:
+        raise HTTPException(status_code=404, detail="Not found")
+    if not token or not hmac.compare_digest(token, settings.admin_token):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+
+@router.post("/index_reingested")
+async def index_reingested(x_admin_token: Optional[str] = Header(None)) -> Dict[str, str]:
+    """Invalidate cached search responses after the vector index is re-ingested.
+    
+    Only the worker that receives the call is invalidated; bump
+    ``INDEX_VERSION`` on redeploy to invalidate every worker.
+    
+    Args:
+        x_admin_token: Admin token header
+        
+    Returns:
+        Dict[str, str]: The new index version stamp
+    """
+    verify_admin_token(x_admin_token)
+    version = invalidate_search_cache()
+    logging.info(f"Search response cache invalidated, index version is now {version}")
+    return {"index_version": version}
@@ -1,9 +1,10 @@
 """API routes for company data retrieval."""
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 import logging
 from typing import Dict, Any
 
+from app.db.catalog import catalog
 from app.db.company_data import return_data
 
 router = APIRouter(tags=["companies"])
@@ -12,6 +13,9 @@ router = APIRouter(tags=["companies"])
 @router.get("/company/{id}")
 async def get_company(id: str) -> Dict[str, Any]:
     """Get company data by ID or name.
+
+    Served from the in-memory catalog when it is loaded; names the catalog
+    does not know fall back to the MongoDB lookup (including text search).
     
     Args:
         id: Company ID or name
@@ -22,8 +26,16 @@ async def get_company(id: str) -> Dict[str, Any]:
     Raises:
         HTTPException: If company not found or other errors occur
     """
+    if catalog.ready:
+        record = catalog.lookup(id)
+        if record is not None:
+            return Response(content=record, media_type="application/json")
+
     try:
-        return return_data(id)
+        return await return_data(id)
+    except HTTPException:
+        # Keep 404s from the lookup instead of turning them into 500s
+        raise
     except Exception as e:
         logging.error(f"Error in get_company: {e}")
         raise HTTPException(status_code=500, detail="Internal server error") 
\ No newline at end of file
@@ -1,81 +1,337 @@
 """API routes for search functionality."""
 
-from fastapi import APIRouter, HTTPException, Depends
-from concurrent.futures import ThreadPoolExecutor
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from fastapi.responses import StreamingResponse
 import logging
+from typing import Any, AsyncIterator, Dict, List, Optional
 
-from app.api.models import QueryRequest, SearchResponse
-from app.services.pinecone_service import get_index, query_index
-from app.services.openai_service import create_embeddings, explain_user_query, deep_question
-from app.utils.data_normalization import normalize_data
+from app.api.fields import project, project_events, resolve_fields
+from app.api.models import (
+    BatchQueryRequest,
+    BatchSearchResponse,
+    DeepResearchRequest,
+    QueryRequest,
+    SearchFilters,
+    SearchResponse,
+)
+from app.core.config import get_settings
+from app.services.pagination import Cursor, CursorExpired, InvalidCursor, decode_cursor, first_page, next_page
+from app.services.search_service import (
+    run_search,
+    run_search_batch,
+    research_result_sets,
+    rerank_results,
+    cached_response,
+    hydrate_results,
+    index_version,
+    stream_search,
+    stream_deep_research,
+)
+from app.utils.serialization import dumps, encode_page, encode_results
+
+# Get settings
+settings = get_settings()
 
 router = APIRouter(tags=["search"])
 
+# Page size of paginated requests sending a cursor without a limit
+DEFAULT_PAGE_SIZE = 30
+
+
+def search_filters(filters: Optional[SearchFilters]) -> Optional[Dict[str, Any]]:
+    """Convert request filters to the form used by the search services.
+    
+    Args:
+        filters: Filters of the request
+        
+    Returns:
+        Optional[Dict[str, Any]]: The given conditions, None if there are none
+    """
+    if filters is None:
+        return None
+    return filters.model_dump(exclude_none=True) or None
+
+
+def search_response(results: List[Dict[str, Any]], fields: Optional[str] = None) -> Response:
+    """Encode search results as a JSON response.
+    
+    Results are projected to the requested metadata fields and encoded
+    with orjson, skipping Pydantic validation. In debug mode they are
+    validated against ``SearchResponse`` first.
+    
+    Args:
+        results: Normalized search results
+        fields: Metadata projection, all metadata if None
+        
+    Returns:
+        Response: The JSON response
+    """
+    results = project(results, resolve_fields(fields))
+    if settings.debug:
+        SearchResponse(results=results)
+    return Response(content=encode_results(results), media_type="application/json")
+
+
+def page_response(
+    results: List[Dict[str, Any]], next_cursor: Optional[str], fields: Optional[str] = None
+) -> Response:
+    """Encode one page of search results as a JSON response.
+    
+    Args:
+        results: Normalized results of the page
+        next_cursor: Cursor of the next page, None on the last page
+        fields: Metadata projection, all metadata if None
+        
+    Returns:
+        Response: The JSON response
+    """
+    results = project(results, resolve_fields(fields))
+    if settings.debug:
+        SearchResponse(results=results, next_cursor=next_cursor)
+    return Response(content=encode_page(results, next_cursor), media_type="application/json")
+
+
+def read_cursor(request: QueryRequest, endpoint: str) -> Cursor:
+    """Return the position of a paginated request in its ranking.
+    
+    A request without a cursor starts at the first page of its own search.
+    With a cursor, the page comes from the ranking the cursor carries and
+    the request's query, filters and ranking options are ignored.
+    
+    Args:
+        request: Search query request
+        endpoint: Endpoint serving the request
+        
+    Returns:
+        Cursor: The page's position, with the rest of the ranking
+        
+    Raises:
+        HTTPException: 400 for a malformed cursor or one issued by another
+            endpoint, 410 once it expired
+    """
+    if request.cursor is None:
+        return Cursor(endpoint, index_version())
+    try:
+        return decode_cursor(request.cursor, endpoint, index_version())
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except CursorExpired as e:
+        raise HTTPException(status_code=410, detail=str(e))
+
+
+async def cursor_page(cursor: Cursor, request: QueryRequest) -> Response:
+    """Serve a later page of a paginated search from its cursor.
+    
+    Args:
+        cursor: Decoded cursor of the request
+        request: Search query request
+        
+    Returns:
+        Response: The page and the cursor of the next one as a ``SearchResponse`` body
+    """
+    ranked, next_cursor = next_page(cursor, request.limit or DEFAULT_PAGE_SIZE)
+    return page_response(await hydrate_results(ranked), next_cursor, request.fields)
+
+
+def event_stream(events: AsyncIterator[Dict[str, Any]], request: Request) -> StreamingResponse:
+    """Encode pipeline events as Server-Sent Events or NDJSON.
+    
+    SSE is used when the client accepts ``text/event-stream``, NDJSON
+    (one JSON object per line) otherwise. Failures are reported as a
+    final ``error`` event since the status code has already been sent.
+    
+    Args:
+        events: Events with an ``event`` name and payload
+        request: The incoming request, used for content negotiation
+        
+    Returns:
+        StreamingResponse: The encoded event stream
+    """
+    sse = "text/event-stream" in request.headers.get("accept", "")
+
+    async def encode() -> AsyncIterator[str]:
+        try:
+            async for event in events:
+                payload = dumps(event).decode()
+                yield f"event: {event['event']}\ndata: {payload}\n\n" if sse else payload + "\n"
+        except Exception as e:
+            logging.error(f"Error while streaming search results: {e}")
+            error = dumps({"event": "error", "detail": "Internal server error"}).decode()
+            yield f"event: error\ndata: {error}\n\n" if sse else error + "\n"
+
+    media_type = "text/event-stream" if sse else "application/x-ndjson"
+    return StreamingResponse(encode(), media_type=media_type, headers={"Cache-Control": "no-cache"})
+
 
 @router.post("/search_companies", response_model=SearchResponse)
-async def search_companies(request: QueryRequest) -> SearchResponse:
+async def search_companies(request: QueryRequest) -> Response:
     """Find similar companies based on a query string using Pinecone.
     
+    Responses are cached per normalized query, filters and index version.
+    Keyword queries fuse vector matches with lexical hits, so their scores
+    are reciprocal rank fusion scores (about 0.01 to 0.03) rather than
+    cosine similarities. Filters are applied inside the vector query, so a
+    filtered search still returns a full page of eligible companies. With a
+    ``limit``, the top ``RESULT_WINDOW_SIZE`` results are ranked and returned
+    a page at a time; later pages are requested with the ``next_cursor`` of
+    the previous one. The cursor carries the ids and scores of the rest of
+    the ranking, so any worker serves a later page without searching again.
+    
     Args:
         request: Search query request
         
     Returns:
-        SearchResponse: Normalized search results
+        Response: Normalized search results as a ``SearchResponse`` body
         
     Raises:
         HTTPException: If an error occurs during search
     """
+    paginated = request.limit is not None or request.cursor is not None
+    if paginated:
+        cursor = read_cursor(request, "search_companies")
+    filters = search_filters(request.filters)
     try:
+        if request.cursor is not None:
+            return await cursor_page(cursor, request)
+        if paginated:
+            results = await cached_response(
+                "search_companies_window",
+                request.query,
+                lambda: run_search(request.query, settings.result_window_size, filters),
+                filters,
+            )
+            return page_response(*first_page(results, cursor, request.limit), request.fields)
+
         number_of_results = 30
-        index = get_index()
-        explained_query = explain_user_query(request.query)
-        vector = create_embeddings(explained_query)
-        results = query_index(index, vector, number_of_results)
-        
-        return SearchResponse(results=normalize_data(results))
+        results = await cached_response(
+            "search_companies", request.query, lambda: run_search(request.query, number_of_results, filters), filters
+        )
+        return search_response(results, request.fields)
     except Exception as e:
         logging.error(f"Error in search_companies: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.post("/search_companies/batch", response_model=BatchSearchResponse)
+async def search_companies_batch(request: BatchQueryRequest) -> Response:
+    """Search many queries in one request.
+    
+    Duplicate queries are searched once, expansions run concurrently, and
+    all queries share one embeddings call and one vector backend call.
+    Results come back per query, in request order.
+    
+    Args:
+        request: Batch search request
+        
+    Returns:
+        Response: Results of each query as a ``BatchSearchResponse`` body
+        
+    Raises:
+        HTTPException: If the batch is too large or an error occurs during search
+    """
+    if len(request.queries) > settings.batch_max_queries:
+        raise HTTPException(
+            status_code=400, detail=f"At most {settings.batch_max_queries} queries per batch"
+        )
+    try:
+        number_of_results = 30
+        result_sets = await run_search_batch(request.queries, number_of_results, search_filters(request.filters))
+        fields = resolve_fields(request.fields)
+        body = {
+            "results": [
+                {"query": query, "results": project(results, fields)}
+                for query, results in zip(request.queries, result_sets)
+            ]
+        }
+        if settings.debug:
+            BatchSearchResponse(**body)
+        return Response(content=dumps(body), media_type="application/json")
+    except Exception as e:
+        logging.error(f"Error in search_companies_batch: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
 @router.post("/deep_research", response_model=SearchResponse)
-async def deep_research(request: QueryRequest) -> SearchResponse:
+async def deep_research(request: DeepResearchRequest) -> Response:
     """Perform deep research using question generation and Pinecone search.
     
     This endpoint expands the original query into multiple questions
-    and performs parallel searches with all of them to find more comprehensive results.
+    and searches them concurrently, bounded per request and process-wide,
+    with a timeout on each sub-search. The per-question results are cached
+    per normalized query, filters and index version, then merged by company
+    id and re-ranked with the requested strategy (raw score sum, RRF,
+    normalized scores or MMR diversification). With a ``limit``, they are
+    returned a page at a time like ``/search_companies``.
     
     Args:
         request: Search query request
         
     Returns:
-        SearchResponse: Combined and ranked search results
+        Response: Combined and ranked search results as a ``SearchResponse`` body
         
     Raises:
         HTTPException: If an error occurs during research
     """
+    cursor = read_cursor(request, "deep_research")
+    filters = search_filters(request.filters)
     try:
-        questions = deep_question(request.query)
-        final_data = []
-        
-        with ThreadPoolExecutor() as executor:
-            # Create query requests for each question
-            query_requests = [QueryRequest(query=q) for q in questions]
-            # Execute searches in parallel
-            results = list(executor.map(search_companies, query_requests))
-        
-        # Combine and deduplicate results
-        for data in results:
-            for item in data.results:
-                existing_item = next((x for x in final_data if x['id'] == item['id']), None)
-                if existing_item is None:
-                    final_data.append(item)
-                else:
-                    existing_item['score'] += item['score']
-        
-        # Sort by final score
-        final_data.sort(key=lambda x: x['score'], reverse=True)
-        return SearchResponse(results=final_data)
+        if request.cursor is not None:
+            return await cursor_page(cursor, request)
+        result_sets = await cached_response(
+            "deep_research",
+            request.query,
+            lambda: research_result_sets(request.query, filters=filters),
+            filters,
+        )
+        results = await rerank_results(result_sets, request.rerank, request.mmr_lambda)
+        if request.limit is None:
+            return search_response(results, request.fields)
+        return page_response(*first_page(results, cursor, request.limit), request.fields)
     except Exception as e:
         logging.error(f"Error in deep_research: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.post("/search_companies/stream")
+async def search_companies_stream(request: QueryRequest, http_request: Request) -> StreamingResponse:
+    """Streaming variant of ``/search_companies``.
+    
+    Emits an ``expanded`` event once the query expansion finishes and a
+    ``done`` event with the results, as SSE or NDJSON.
+    
+    Args:
+        request: Search query request
+        http_request: The incoming HTTP request
+        
+    Returns:
+        StreamingResponse: Stream of search events
+    """
+    events = project_events(
+        stream_search(request.query, filters=search_filters(request.filters)), resolve_fields(request.fields)
+    )
+    return event_stream(events, http_request)
+
+
+@router.post("/deep_research/stream")
+async def deep_research_stream(request: DeepResearchRequest, http_request: Request) -> StreamingResponse:
+    """Streaming variant of ``/deep_research``.
+    
+    Emits the generated ``questions``, an ``update`` with the merged top
+    results each time a sub-search completes, and a ``done`` event whose
+    results match the non-streaming endpoint, as SSE or NDJSON.
+    
+    Args:
+        request: Search query request
+        http_request: The incoming HTTP request
+        
+    Returns:
+        StreamingResponse: Stream of research events
+    """
+    research = stream_deep_research(
+        request.query,
+        filters=search_filters(request.filters),
+        rerank=request.rerank,
+        mmr_lambda=request.mmr_lambda,
+    )
+    events = project_events(research, resolve_fields(request.fields))
+    return event_stream(events, http_request)
@@ -16,18 +16,151 @@ class Settings(BaseSettings):
     Attributes:
         app_name: Name of the application
         openai_api_key: OpenAI API key
+        openai_base_url: Optional OpenAI-compatible base URL (e.g. a local stub)
         pinecone_api_key: Pinecone API key
         pinecone_host_url: Pinecone host URL
+        pinecone_query_threads: Size of the thread pool and connection pool used for Pinecone queries
+        pinecone_timeout: Timeout in seconds of one Pinecone query attempt
+        pinecone_max_retries: Maximum attempts of a Pinecone query failing with 429/5xx or a timeout
+        openai_max_connections: Size of the OpenAI connection pool
+        openai_timeout: Default timeout in seconds of one OpenAI call attempt
+        embedding_timeout: Timeout in seconds of one embeddings call attempt
+        openai_max_retries: Retries of an OpenAI call failing with 429/5xx or a connection error
+        connect_timeout: Timeout in seconds for opening a connection
+        keepalive_expiry: Seconds an idle pooled connection is kept open
+        http2: Use HTTP/2 for OpenAI calls when the h2 package is installed
+        retry_base_delay: Cap in seconds of the first jittered retry delay
+        retry_max_delay: Upper bound in seconds of any retry delay
+        openai_requests_per_minute: Assumed OpenAI request limit per model until reported, 0 if unknown
+        openai_tokens_per_minute: Assumed OpenAI token limit per model until reported, 0 if unknown
+        rate_limit_max_wait: Seconds an optional LLM call waits for rate-limit budget before being skipped
+        vector_backend: Vector search backend, "pinecone" or "local"
+        local_index_path: Directory of the local vector index
+        local_index_mode: Local search mode, "exact", "ivf" or "hnsw"
+        ivf_nprobe: Number of IVF clusters scanned per query
+        hnsw_ef: HNSW search beam size, raised to ``result_window_size`` when smaller
         mongo_uri: MongoDB connection URI
         mongo_collection: MongoDB collection name
-        debug: Debug mode flag
+        deep_research_concurrency: Maximum sub-searches in flight per deep research request
+        deep_research_global_concurrency: Maximum sub-searches in flight across all requests
+        sub_query_timeout: Timeout in seconds for a single deep research sub-search
+        stream_update_size: Number of merged results sent in each streaming update event
+        embedding_dimensions: Reduced (Matryoshka) embedding size used for retrieval, 0 for full size
+        embedding_reduction: How embeddings are reduced, "api" (dimensions parameter) or "local" (truncation)
+        rerank_candidates: Candidates re-ranked with full-dimension vectors, 0 disables re-ranking
+        embedding_cache_max_bytes: Memory budget of the in-process embedding cache
+        embedding_cache_path: SQLite file for the persistent embedding cache, disabled if empty
+        embedding_cache_disk_max_entries: Maximum number of embeddings kept on disk
+        llm_cache_max_entries: Maximum number of memoized LLM outputs per cache
+        llm_cache_ttl: Seconds a memoized LLM output stays valid
+        llm_cache_pin_temperature: Use temperature 0 so memoized expansions are deterministic
+        response_cache_max_bytes: Memory budget of the search response cache
+        response_cache_ttl: Seconds a cached search response stays valid, 0 disables the cache
+        index_version: Version stamp of the vector index contents, change after re-ingesting
+        admin_token: Token required by the admin endpoints, which are disabled if empty
+        catalog_enabled: Serve company lookups from an in-memory snapshot of the collection
+        catalog_max_bytes: Memory ceiling of the company snapshot, lookups use MongoDB above it
+        catalog_poll_interval: Seconds between snapshot reloads when change streams are unavailable
+        company_key_field: Company document field matching the vector ids, used to fuse lexical hits
+        hybrid_search: Fuse BM25 lexical hits with the vector matches of keyword (direct) queries
+        lexical_candidates: Number of lexical hits fused with the vector matches
+        lexical_weight: Weight of the lexical hits relative to the vector matches in hybrid fusion
+        rrf_k: Rank smoothing constant of reciprocal rank fusion
+        lexical_decisive_ratio: Score ratio over the runner-up that makes a name match decisive
+        query_router: Route name and keyword queries around the LLM expansion
+        router_direct_max_words: Longest keyword query embedded without LLM expansion
+        router_cache_max_entries: Maximum number of cached routing decisions
+        batch_max_queries: Maximum number of queries in one batch search request
+        result_window_size: Results ranked for paginated single-query searches, also the largest page
+        result_window_ttl: Seconds the cursors of a paginated search stay valid
+        cursor_secret: Key signing pagination cursors, shared by every instance serving the API
+        vector_metadata_from_catalog: Query Pinecone without metadata and fill it from the company catalog
+        vector_metadata_fields: Comma-separated company fields stored as vector metadata, kept in
+            metadata built from company documents; empty keeps every field but ``_id``
+        deep_research_rerank: Default re-ranking of deep research results: sum, rrf, normalized or mmr
+        mmr_lambda: Default MMR trade-off between relevance (1.0) and diversity (0.0)
+        mmr_top_k: Leading deep research results picked by MMR, the rest follow by marginal gain
+        mmr_dimensions: Leading vector components compared for MMR diversity
+        server_timing: Add a Server-Timing header with per-stage durations to responses
+        web_concurrency: Worker processes of the production server, 0 for one per CPU
+        graceful_timeout: Seconds a stopping worker keeps serving in-flight requests
+        warmup_timeout: Seconds each startup warm-up step may take before it is reported as failed
+        debug: Debug mode flag, also validates search responses with Pydantic
     """
     app_name: str = "YC ATLAS Backend"
     openai_api_key: str = os.getenv("OPENAI_API_KEY", "")
+    openai_base_url: str = os.getenv("OPENAI_BASE_URL", "")
     pinecone_api_key: str = os.getenv("PINECONE_API_KEY", "")
     pinecone_host_url: str = os.getenv("PINECONE_HOST_URL2", "")
+    pinecone_query_threads: int = int(os.getenv("PINECONE_QUERY_THREADS", "32"))
+    pinecone_timeout: float = float(os.getenv("PINECONE_TIMEOUT", "10"))
+    pinecone_max_retries: int = int(os.getenv("PINECONE_MAX_RETRIES", "3"))
+    openai_max_connections: int = int(os.getenv("OPENAI_MAX_CONNECTIONS", "100"))
+    openai_timeout: float = float(os.getenv("OPENAI_TIMEOUT", "30"))
+    embedding_timeout: float = float(os.getenv("EMBEDDING_TIMEOUT", "15"))
+    openai_max_retries: int = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+    connect_timeout: float = float(os.getenv("CONNECT_TIMEOUT", "5"))
+    keepalive_expiry: float = float(os.getenv("KEEPALIVE_EXPIRY", "60"))
+    http2: bool = os.getenv("HTTP2", "true").lower() == "true"
+    retry_base_delay: float = float(os.getenv("RETRY_BASE_DELAY", "0.25"))
+    retry_max_delay: float = float(os.getenv("RETRY_MAX_DELAY", "4"))
+    openai_requests_per_minute: int = int(os.getenv("OPENAI_RPM", "0"))
+    openai_tokens_per_minute: int = int(os.getenv("OPENAI_TPM", "0"))
+    rate_limit_max_wait: float = float(os.getenv("RATE_LIMIT_MAX_WAIT", "2"))
+    vector_backend: str = os.getenv("VECTOR_BACKEND", "pinecone")
+    local_index_path: str = os.getenv("LOCAL_INDEX_PATH", "data/vector_index")
+    local_index_mode: str = os.getenv("LOCAL_INDEX_MODE", "exact")
+    ivf_nprobe: int = int(os.getenv("IVF_NPROBE", "8"))
+    hnsw_ef: int = int(os.getenv("HNSW_EF", "64"))
     mongo_uri: str = os.getenv("MONGO_URI", "")
     mongo_collection: str = os.getenv("COLLECTION_NAME", "companies")
+    deep_research_concurrency: int = int(os.getenv("DEEP_RESEARCH_CONCURRENCY", "10"))
+    deep_research_global_concurrency: int = int(os.getenv("DEEP_RESEARCH_GLOBAL_CONCURRENCY", "200"))
+    sub_query_timeout: float = float(os.getenv("SUB_QUERY_TIMEOUT", "20"))
+    stream_update_size: int = int(os.getenv("STREAM_UPDATE_SIZE", "30"))
+    embedding_dimensions: int = int(os.getenv("EMBEDDING_DIMENSIONS", "0"))
+    embedding_reduction: str = os.getenv("EMBEDDING_REDUCTION", "local")
+    rerank_candidates: int = int(os.getenv("RERANK_CANDIDATES", "0"))
+    embedding_cache_max_bytes: int = int(os.getenv("EMBEDDING_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    embedding_cache_path: str = os.getenv("EMBEDDING_CACHE_PATH", "")
+    embedding_cache_disk_max_entries: int = int(os.getenv("EMBEDDING_CACHE_DISK_MAX_ENTRIES", "100000"))
+    llm_cache_max_entries: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+    llm_cache_ttl: float = float(os.getenv("LLM_CACHE_TTL", "86400"))
+    llm_cache_pin_temperature: bool = os.getenv("LLM_CACHE_PIN_TEMPERATURE", "false").lower() == "true"
+    response_cache_max_bytes: int = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(128 * 1024 * 1024)))
+    response_cache_ttl: float = float(os.getenv("RESPONSE_CACHE_TTL", "3600"))
+    index_version: str = os.getenv("INDEX_VERSION", "1")
+    admin_token: str = os.getenv("ADMIN_TOKEN", "")
+    catalog_enabled: bool = os.getenv("CATALOG_ENABLED", "true").lower() == "true"
+    catalog_max_bytes: int = int(os.getenv("CATALOG_MAX_BYTES", str(256 * 1024 * 1024)))
+    catalog_poll_interval: float = float(os.getenv("CATALOG_POLL_INTERVAL", "60"))
+    company_key_field: str = os.getenv("COMPANY_KEY_FIELD", "slug")
+    hybrid_search: bool = os.getenv("HYBRID_SEARCH", "true").lower() == "true"
+    lexical_candidates: int = int(os.getenv("LEXICAL_CANDIDATES", "30"))
+    lexical_weight: float = float(os.getenv("LEXICAL_WEIGHT", "0.5"))
+    rrf_k: int = int(os.getenv("RRF_K", "60"))
+    lexical_decisive_ratio: float = float(os.getenv("LEXICAL_DECISIVE_RATIO", "2.0"))
+    query_router: bool = os.getenv("QUERY_ROUTER", "true").lower() == "true"
+    router_direct_max_words: int = int(os.getenv("ROUTER_DIRECT_MAX_WORDS", "4"))
+    router_cache_max_entries: int = int(os.getenv("ROUTER_CACHE_MAX_ENTRIES", "10000"))
+    batch_max_queries: int = int(os.getenv("BATCH_MAX_QUERIES", "50"))
+    result_window_size: int = int(os.getenv("RESULT_WINDOW_SIZE", "100"))
+    result_window_ttl: float = float(os.getenv("RESULT_WINDOW_TTL", "600"))
+    cursor_secret: str = os.getenv("CURSOR_SECRET", "")
+    vector_metadata_from_catalog: bool = os.getenv("VECTOR_METADATA_FROM_CATALOG", "false").lower() == "true"
+    vector_metadata_fields: str = os.getenv(
+        "VECTOR_METADATA_FIELDS",
+        "name,slug,one_liner,small_logo_thumb_url,website,batch,status,industry,industries,"
+        "subindustry,tags,regions,team_size",
+    )
+    deep_research_rerank: str = os.getenv("DEEP_RESEARCH_RERANK", "sum")
+    mmr_lambda: float = float(os.getenv("MMR_LAMBDA", "0.5"))
+    mmr_top_k: int = int(os.getenv("MMR_TOP_K", "30"))
+    mmr_dimensions: int = int(os.getenv("MMR_DIMENSIONS", "256"))
+    server_timing: bool = os.getenv("SERVER_TIMING", "false").lower() == "true"
+    web_concurrency: int = int(os.getenv("WEB_CONCURRENCY", "0"))
+    graceful_timeout: int = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+    warmup_timeout: float = float(os.getenv("WARMUP_TIMEOUT", "20"))
     debug: bool = bool(os.getenv("DEBUG", False))
 
 
@@ -0,0 +1,179 @@
+"""Startup preloading, dependency warm-up and readiness.
+
+``preload`` runs once in the production server's master process, before
+workers are forked (see ``gunicorn.conf.py``). It loads the local vector
+index, the company catalog and its lexical index, so every worker shares
+them copy-on-write instead of loading its own copy. Network clients and
+file handles are not shared: ``reset_after_fork`` drops any the worker
+inherited, so each worker opens its own.
+
+Each worker then runs ``warm_up`` in the background: it opens connections
+to OpenAI, Pinecone and MongoDB, touches the local index and waits for the
+catalog, without blocking startup. ``/health`` answers 503 until warm-up
+has finished, so traffic only reaches warm workers.
+"""
+
+import asyncio
+import gc
+import logging
+from typing import Any, Awaitable, Dict
+
+import certifi
+import numpy as np
+from openai import APIStatusError
+from pymongo import MongoClient
+from pymongo.server_api import ServerApi
+
+from app.core.config import get_settings
+from app.db import company_data
+from app.db.catalog import catalog
+from app.services import pinecone_service
+from app.services.clients import get_openai_client
+from app.services.embedding_cache import embedding_cache
+from app.services.lexical_index import get_lexical_index, preload_lexical_index
+from app.services.vector_store import get_vector_backend
+
+# Get settings
+settings = get_settings()
+
+
+class Readiness:
+    """Warm-up progress of this worker.
+
+    Attributes:
+        checks: Outcome of each warm-up step, ``pending``, ``ok`` or the error type
+        ready: Whether warm-up has finished
+    """
+
+    def __init__(self):
+        """Initialize as not ready."""
+        self.checks: Dict[str, str] = {}
+        self.ready = False
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the readiness flag and the outcome of each step.
+
+        Returns:
+            Dict[str, Any]: Readiness and warm-up checks
+        """
+        return {"ready": self.ready, "checks": dict(self.checks)}
+
+
+readiness = Readiness()
+
+
+def preload() -> None:
+    """Load shared read-only state before the server forks its workers.
+
+    Errors are logged and leave loading to the workers. Preloaded objects
+    are moved out of the garbage collector's reach (``gc.freeze``) so
+    collections in the workers do not touch, and thereby copy, their pages.
+    """
+    if not settings.cursor_secret:
+        logging.warning(
+            "CURSOR_SECRET is not set: pagination cursors only work on this instance and until it restarts"
+        )
+
+    if settings.vector_backend == "local":
+        try:
+            get_vector_backend()
+        except Exception as e:
+            logging.error(f"Error preloading local vector index: {e}")
+
+    if settings.catalog_enabled:
+        client = MongoClient(
+            settings.mongo_uri,
+            server_api=ServerApi('1'),
+            tls=True,
+            tlsCAFile=certifi.where(),
+            serverSelectionTimeoutMS=int(1000 * settings.warmup_timeout),
+        )
+        try:
+            if catalog.preload(client[company_data.db.name][settings.mongo_collection]):
+                preload_lexical_index()
+                logging.info(f"Preloaded company catalog with {len(catalog)} companies ({catalog.size_bytes} bytes)")
+        except Exception as e:
+            logging.error(f"Error preloading company catalog: {e}")
+        finally:
+            client.close()
+
+    gc.freeze()
+
+
+def reset_after_fork() -> None:
+    """Drop the network clients a forked worker inherited from the master.
+
+    Connection pools, TLS sessions and client background threads do not
+    survive ``fork()``, so clients created while importing or preloading
+    the application in the master are replaced by fresh ones of the worker.
+    The embedding cache reopens its SQLite store by itself in a new process.
+    """
+    get_openai_client.cache_clear()
+    pinecone_service.get_index.cache_clear()
+    pinecone_service.get_client.cache_clear()
+    company_data.connect()
+
+
+async def _warm_vector_index() -> None:
+    backend = await asyncio.to_thread(get_vector_backend)
+    if settings.vector_backend == "pinecone":
+        # Opens the pooled connections to the index host
+        index = backend.service.get_index()
+        await backend.service.run_blocking(index.describe_index_stats)
+        return
+    # One exact scan faults the memory-mapped vectors into the page cache
+    base = getattr(backend.index, "base", backend.index)
+    await backend.query(np.ones(base.dimension, dtype=np.float32).tolist(), 1)
+
+
+async def _warm_openai() -> None:
+    try:
+        await get_openai_client().models.list()
+    except APIStatusError:
+        # Any HTTP answer means the connection is open
+        pass
+
+
+async def _warm_mongodb() -> None:
+    await company_data.client.admin.command("ping")
+
+
+async def _warm_embedding_cache() -> None:
+    # Opens this worker's SQLite store off the event loop
+    await asyncio.to_thread(lambda: embedding_cache.disk)
+
+
+async def _warm_catalog() -> None:
+    while not catalog.ready:
+        await asyncio.sleep(0.1)
+    await get_lexical_index()
+
+
+async def _check(name: str, step: Awaitable[None]) -> None:
+    readiness.checks[name] = "pending"
+    try:
+        await asyncio.wait_for(step, timeout=settings.warmup_timeout)
+        readiness.checks[name] = "ok"
+    except Exception as e:
+        readiness.checks[name] = f"failed: {type(e).__name__}"
+        logging.warning(f"Warm-up of {name} failed: {e!r}")
+
+
+async def warm_up() -> None:
+    """Warm up every dependency concurrently, then mark the worker ready.
+
+    Failed or timed out steps are reported on ``/health`` but do not keep
+    the worker out of rotation; requests then fall back as they would
+    without warm-up.
+    """
+    steps = {
+        "vector_index": _warm_vector_index(),
+        "openai": _warm_openai(),
+        "mongodb": _warm_mongodb(),
+        "embedding_cache": _warm_embedding_cache(),
+    }
+    if settings.catalog_enabled:
+        steps["catalog"] = _warm_catalog()
+    await asyncio.gather(*(_check(name, step) for name, step in steps.items()))
+    readiness.ready = True
+    logging.info(f"Warm-up finished: {readiness.checks}")
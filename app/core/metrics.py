@@ -0,0 +1,255 @@
+"""Prometheus metrics and per-request Server-Timing.
+
+Pipeline stages and outbound dependencies are timed with the ``stage`` and
+``dependency`` context managers. Each records a Prometheus histogram and,
+when ``SERVER_TIMING`` is enabled, adds its duration to the ``Server-Timing``
+header of the current response so a single slow request can be broken down
+from the browser or ``curl -i``.
+
+``MetricsMiddleware`` measures request latency, in-flight requests and
+response sizes per route. Cache and scheduler counters are read when
+``/metrics`` is scraped by collectors registered with ``register_collector``.
+
+Under the multi-worker server, ``PROMETHEUS_MULTIPROC_DIR`` is set and
+``/metrics`` aggregates the histograms and counters of every worker; the
+collectors registered here still report the worker answering the scrape.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+from pymongo import monitoring
+
+from app.core.config import get_settings
+
+# Get settings
+settings = get_settings()
+
+# Latency buckets from sub-millisecond lookups to slow LLM completions
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+REQUEST_SECONDS = Histogram(
+    "yc_atlas_http_request_seconds", "HTTP request latency", ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "yc_atlas_http_requests_in_flight", "HTTP requests being served", multiprocess_mode="livesum"
+)
+RESPONSE_BYTES = Histogram("yc_atlas_http_response_bytes", "HTTP response body size", ["route"], buckets=SIZE_BUCKETS)
+STAGE_SECONDS = Histogram("yc_atlas_stage_seconds", "Search pipeline stage latency", ["stage"], buckets=LATENCY_BUCKETS)
+DEPENDENCY_SECONDS = Histogram(
+    "yc_atlas_dependency_seconds", "Outbound call latency", ["dependency", "operation", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+DEPENDENCY_IN_FLIGHT = Gauge(
+    "yc_atlas_dependency_in_flight", "Outbound calls in flight", ["dependency"], multiprocess_mode="livesum"
+)
+ROUTE_SECONDS = Histogram(
+    "yc_atlas_search_route_seconds", "Single-query search latency per query route", ["route"],
+    buckets=LATENCY_BUCKETS,
+)
+SHED_CALLS = Counter("yc_atlas_shed_calls", "Optional calls skipped for lack of rate-limit budget", ["model"])
+
+# Collectors registered with register_collector, for multi-process scrapes
+_collectors: List[Collector] = []
+
+# Stage durations of the current request, for the Server-Timing header
+_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("timings", default=None)
+
+
+def record_timing(name: str, seconds: float) -> None:
+    """Add a duration to the current request's Server-Timing entries.
+
+    Args:
+        name: Timing name; durations with the same name are summed
+        seconds: Duration in seconds
+    """
+    timings = _timings.get()
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + seconds
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a pipeline stage.
+
+    Args:
+        name: Stage name
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_SECONDS.labels(name).observe(elapsed)
+        record_timing(name, elapsed)
+
+
+@contextmanager
+def dependency(name: str, operation: str) -> Iterator[None]:
+    """Time an outbound call and count it as in flight.
+
+    Args:
+        name: Dependency name (``openai``, ``pinecone``, ``mongodb``)
+        operation: Operation or model name
+    """
+    started = time.perf_counter()
+    outcome = "error"
+    DEPENDENCY_IN_FLIGHT.labels(name).inc()
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        elapsed = time.perf_counter() - started
+        DEPENDENCY_IN_FLIGHT.labels(name).dec()
+        DEPENDENCY_SECONDS.labels(name, operation, outcome).observe(elapsed)
+        record_timing(name, elapsed)
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """pymongo command listener timing every MongoDB command."""
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        DEPENDENCY_IN_FLIGHT.labels("mongodb").inc()
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._observe(event, "ok")
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._observe(event, "error")
+
+    def _observe(self, event, outcome: str) -> None:
+        seconds = event.duration_micros / 1e6
+        DEPENDENCY_IN_FLIGHT.labels("mongodb").dec()
+        DEPENDENCY_SECONDS.labels("mongodb", event.command_name, outcome).observe(seconds)
+        record_timing("mongodb", seconds)
+
+
+class StatsCollector(Collector):
+    """Export in-process counters at scrape time.
+
+    Gauges are given as ``name -> (help, label, read)``: ``read`` returns a
+    number, or a mapping of ``label`` values to numbers when ``label`` is set.
+    """
+
+    def __init__(
+        self,
+        caches: Dict[str, Callable[[], Dict[str, Any]]],
+        gauges: Dict[str, Tuple[str, Optional[str], Callable[[], Any]]],
+    ):
+        """Initialize the collector.
+
+        Args:
+            caches: Functions returning ``LRUCache``-style stats, by cache name
+            gauges: Extra gauges by metric name
+        """
+        self.caches = caches
+        self.gauges = gauges
+
+    def collect(self):
+        hits = CounterMetricFamily("yc_atlas_cache_hits", "Cache lookups that found an entry", labels=["cache"])
+        misses = CounterMetricFamily("yc_atlas_cache_misses", "Cache lookups that found nothing", labels=["cache"])
+        entries = GaugeMetricFamily("yc_atlas_cache_entries", "Entries held by a cache", labels=["cache"])
+        ratio = GaugeMetricFamily("yc_atlas_cache_hit_ratio", "Cache hit ratio since start", labels=["cache"])
+        for name, stats in self.caches.items():
+            values = stats()
+            hits.add_metric([name], values.get("hits", 0))
+            misses.add_metric([name], values.get("misses", 0))
+            entries.add_metric([name], values.get("entries", 0))
+            ratio.add_metric([name], values.get("hit_ratio", 0.0))
+        yield from (hits, misses, entries, ratio)
+
+        for name, (documentation, label, read) in self.gauges.items():
+            if label is None:
+                yield GaugeMetricFamily(f"yc_atlas_{name}", documentation, value=read())
+                continue
+            gauge = GaugeMetricFamily(f"yc_atlas_{name}", documentation, labels=[label])
+            for label_value, value in read().items():
+                gauge.add_metric([label_value], value)
+            yield gauge
+
+
+def register_collector(collector: Collector) -> None:
+    """Register a collector with the default registry.
+
+    Args:
+        collector: Collector to register
+    """
+    _collectors.append(collector)
+    REGISTRY.register(collector)
+
+
+def render_metrics() -> tuple:
+    """Render every registered metric in the Prometheus text format.
+
+    Returns:
+        tuple: Encoded metrics and their content type
+    """
+    if not os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    for collector in _collectors:
+        registry.register(collector)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+class MetricsMiddleware:
+    """ASGI middleware measuring HTTP requests and adding Server-Timing.
+
+    Requests are labelled with their route template (e.g.
+    ``/api/company/{id}``) rather than the raw path, to bound cardinality.
+    """
+
+    def __init__(self, app):
+        """Wrap an ASGI application.
+
+        Args:
+            app: ASGI application
+        """
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        timings: Dict[str, float] = {}
+        token = _timings.set(timings)
+        status = {"code": 500, "bytes": 0}
+        REQUESTS_IN_FLIGHT.inc()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                if settings.server_timing:
+                    entries = [f"{name};dur={1000 * seconds:.1f}" for name, seconds in timings.items()]
+                    entries.append(f"total;dur={1000 * (time.perf_counter() - started):.1f}")
+                    headers: List = list(message.get("headers", []))
+                    headers.append((b"server-timing", ", ".join(entries).encode()))
+                    message = {**message, "headers": headers}
+            elif message["type"] == "http.response.body":
+                status["bytes"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            _timings.reset(token)
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            REQUEST_SECONDS.labels(scope["method"], route_path, str(status["code"])).observe(
+                time.perf_counter() - started
+            )
+            RESPONSE_BYTES.labels(route_path).observe(status["bytes"])
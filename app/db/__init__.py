@@ -14,4 +14,4 @@ The module implements repository pattern to abstract database operations
 from the rest of the application, enhancing maintainability and testability.
 """
 
-from app.db.company_data import return_data, search_company_by_name
+from app.db.company_data import return_data, search_company_by_name, find_company, find_company_by_name, ensure_indexes
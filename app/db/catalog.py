@@ -0,0 +1,318 @@
+"""In-memory snapshot of the company collection.
+
+The collection is small and almost read-only, so the catalog loads every
+company at startup as a pre-serialized JSON record (ObjectIds already
+stringified) with id, slug and name indexes. Lookups are dictionary hits
+that keep working while MongoDB is briefly unreachable.
+
+A change stream keeps the snapshot fresh. Where change streams are not
+available (standalone servers), the catalog falls back to reloading the
+collection periodically. If the snapshot outgrows its memory ceiling it is
+dropped and lookups fall back to MongoDB.
+"""
+
+import asyncio
+import bisect
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import orjson
+
+from app.core.config import get_settings
+from app.db import company_data
+from app.db.company_data import convert_objectid, normalize_name
+
+# Get settings
+settings = get_settings()
+
+# Company fields kept in metadata, empty to keep the whole document
+METADATA_FIELDS = tuple(field.strip() for field in settings.vector_metadata_fields.split(",") if field.strip())
+
+
+def serialize_company(doc: Dict[str, Any]) -> bytes:
+    """Serialize a company document to JSON bytes.
+
+    Args:
+        doc: MongoDB document
+
+    Returns:
+        bytes: JSON encoding with ObjectIds as strings
+    """
+    return orjson.dumps(convert_objectid(doc), default=str)
+
+
+def company_metadata(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape a company document like the metadata of a vector match.
+
+    Keeps the ``VECTOR_METADATA_FIELDS`` the vectors were stored with, or
+    every field but ``_id`` when that setting is empty.
+
+    Args:
+        doc: Company document with a stringified ``_id``
+
+    Returns:
+        Dict[str, Any]: The metadata fields of the document
+    """
+    if METADATA_FIELDS:
+        return {field: doc[field] for field in METADATA_FIELDS if field in doc}
+    return {field: value for field, value in doc.items() if field != "_id"}
+
+
+class CompanyCatalog:
+    """Pre-serialized company records indexed by id, slug and name.
+
+    Attributes:
+        records: JSON bytes by stringified ``_id``
+        ready: Whether the snapshot is loaded and within its memory ceiling
+        size_bytes: Total size of the serialized records
+        version: Counter bumped on every change, for indexes derived from the snapshot
+        resume_token: Change stream position of a preloaded snapshot, None once syncing
+    """
+
+    def __init__(self, max_bytes: int):
+        """Initialize an empty catalog.
+
+        Args:
+            max_bytes: Memory ceiling for the serialized records
+        """
+        self.max_bytes = max_bytes
+        self.records: Dict[str, bytes] = {}
+        self.by_slug: Dict[str, str] = {}
+        self.by_name: Dict[str, str] = {}
+        self._keys: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        self._sorted_names: Optional[List[Tuple[str, str]]] = None
+        self.size_bytes = 0
+        self.ready = False
+        self.version = 0
+        self.resume_token: Optional[Dict[str, Any]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def load(self, docs: Iterable[Dict[str, Any]]) -> bool:
+        """Replace the snapshot with the given documents.
+
+        Args:
+            docs: Every company document
+
+        Returns:
+            bool: True if the snapshot fits within the memory ceiling
+        """
+        catalog = CompanyCatalog(self.max_bytes)
+        for doc in docs:
+            catalog.put(doc)
+            if catalog.size_bytes > self.max_bytes:
+                logging.error(
+                    f"Company catalog exceeds its {self.max_bytes} byte ceiling, serving lookups from MongoDB"
+                )
+                self.clear()
+                return False
+
+        self.records = catalog.records
+        self.by_slug = catalog.by_slug
+        self.by_name = catalog.by_name
+        self._keys = catalog._keys
+        self._sorted_names = None
+        self.size_bytes = catalog.size_bytes
+        self.ready = True
+        self.version += 1
+        return True
+
+    def clear(self) -> None:
+        """Drop the snapshot so lookups fall back to MongoDB."""
+        self.records, self.by_slug, self.by_name, self._keys = {}, {}, {}, {}
+        self._sorted_names = None
+        self.size_bytes = 0
+        self.ready = False
+        self.version += 1
+
+    def put(self, doc: Dict[str, Any]) -> None:
+        """Insert or replace one company.
+
+        Args:
+            doc: MongoDB document
+        """
+        company_id = str(doc["_id"])
+        self.remove(company_id)
+        record = serialize_company(doc)
+        self.records[company_id] = record
+        self.size_bytes += len(record)
+        self.version += 1
+
+        slug = doc.get("slug") if isinstance(doc.get("slug"), str) else None
+        name = normalize_name(doc["name"]) if isinstance(doc.get("name"), str) else None
+        if slug:
+            self.by_slug[slug] = company_id
+        if name:
+            self.by_name.setdefault(name, company_id)
+            self._sorted_names = None
+        self._keys[company_id] = (slug, name)
+
+    def remove(self, company_id: str) -> None:
+        """Remove one company if present.
+
+        Args:
+            company_id: Stringified ``_id``
+        """
+        record = self.records.pop(company_id, None)
+        if record is None:
+            return
+        self.size_bytes -= len(record)
+        self.version += 1
+        slug, name = self._keys.pop(company_id, (None, None))
+        if slug and self.by_slug.get(slug) == company_id:
+            del self.by_slug[slug]
+        if name and self.by_name.get(name) == company_id:
+            del self.by_name[name]
+            self._sorted_names = None
+
+    def lookup(self, key: str) -> Optional[bytes]:
+        """Find a company by id, slug, exact name or name prefix.
+
+        Args:
+            key: ObjectId string, slug or (partial) company name
+
+        Returns:
+            Optional[bytes]: The serialized company, or None
+        """
+        record = self.records.get(key)
+        if record is not None:
+            return record
+
+        normalized = normalize_name(key)
+        if not normalized:
+            return None
+        company_id = self.by_slug.get(normalized.replace(" ", "-")) or self.by_name.get(normalized)
+        if company_id is None:
+            company_id = self._prefix_match(normalized)
+        return self.records.get(company_id) if company_id else None
+
+    def document(self, key: str, exact: bool = False) -> Optional[Dict[str, Any]]:
+        """Find a company by id, slug or name and decode it.
+
+        Args:
+            key: ObjectId string, slug or company name
+            exact: Only match ``key`` as an id or slug, without the name fallbacks
+
+        Returns:
+            Optional[Dict[str, Any]]: The company metadata, see ``company_metadata``, or None
+        """
+        if exact:
+            record = self.records.get(key) or self.records.get(self.by_slug.get(key, ""))
+        else:
+            record = self.lookup(key)
+        if record is None:
+            return None
+        return company_metadata(orjson.loads(record))
+
+    def _prefix_match(self, prefix: str) -> Optional[str]:
+        if self._sorted_names is None:
+            self._sorted_names = sorted(self.by_name.items())
+        position = bisect.bisect_left(self._sorted_names, (prefix, ""))
+        if position < len(self._sorted_names) and self._sorted_names[position][0].startswith(prefix):
+            return self._sorted_names[position][1]
+        return None
+
+    def apply_change(self, change: Dict[str, Any]) -> None:
+        """Apply one change stream event to the snapshot.
+
+        Args:
+            change: Change stream document
+        """
+        operation = change.get("operationType")
+        if operation in ("insert", "update", "replace") and change.get("fullDocument"):
+            self.put(change["fullDocument"])
+        elif operation == "delete":
+            self.remove(str(change["documentKey"]["_id"]))
+        elif operation in ("drop", "rename", "invalidate"):
+            raise RuntimeError(f"Company collection {operation}, reloading catalog")
+
+        if self.size_bytes > self.max_bytes:
+            logging.error(f"Company catalog exceeds its {self.max_bytes} byte ceiling, serving lookups from MongoDB")
+            self.clear()
+
+    def preload(self, collection) -> bool:
+        """Load the snapshot with a synchronous client, before the event loop starts.
+
+        Lets the server's master process load the catalog once for every
+        worker. The change stream position at load time is kept in
+        ``resume_token`` so workers catch up from it instead of reloading.
+
+        Args:
+            collection: Synchronous pymongo collection of the companies
+
+        Returns:
+            bool: True if the snapshot fits within the memory ceiling
+        """
+        try:
+            with collection.watch(full_document="updateLookup") as stream:
+                token = stream.resume_token
+        except Exception as e:
+            logging.warning(f"Company catalog change stream unavailable ({e}), workers will poll")
+            token = None
+        loaded = self.load(collection.find({}))
+        self.resume_token = token if loaded else None
+        return loaded
+
+    async def reload(self) -> None:
+        """Reload the snapshot from MongoDB."""
+        docs = await company_data.collection.find({}).to_list(length=None)
+        if self.load(docs):
+            logging.info(f"Company catalog loaded {len(self)} companies ({self.size_bytes} bytes)")
+
+    async def _sync(self) -> None:
+        """Keep the snapshot fresh with a change stream, or by polling."""
+        while True:
+            resume_token, self.resume_token = self.resume_token, None
+            try:
+                async with await company_data.collection.watch(
+                    full_document="updateLookup", resume_after=resume_token
+                ) as stream:
+                    # Resync after (re)opening the stream so no change is missed,
+                    # unless catching up from the position of a preloaded snapshot
+                    if resume_token is None:
+                        await self.reload()
+                    async for change in stream:
+                        self.apply_change(change)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.warning(
+                    f"Company catalog change stream unavailable ({e}), "
+                    f"reloading every {settings.catalog_poll_interval}s"
+                )
+                # Reload before waiting, so a deployment without change streams
+                # (standalone MongoDB) serves the catalog from startup
+                try:
+                    await self.reload()
+                except Exception as reload_error:
+                    logging.error(f"Error reloading company catalog: {reload_error}")
+                await asyncio.sleep(settings.catalog_poll_interval)
+
+    def start(self) -> None:
+        """Start loading and syncing the snapshot in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._sync())
+
+    async def stop(self) -> None:
+        """Stop the background sync."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the catalog size counters.
+
+        Returns:
+            Dict[str, Any]: Readiness, company count and memory use
+        """
+        return {"ready": self.ready, "companies": len(self), "bytes": self.size_bytes, "max_bytes": self.max_bytes}
+
+
+# Shared catalog instance, populated at startup when enabled
+catalog = CompanyCatalog(max_bytes=settings.catalog_max_bytes)
@@ -1,41 +1,53 @@
 """Database operations for company data stored in MongoDB."""
 
 import os
+import re
 import json
 import logging
 from fastapi import HTTPException
-from pymongo.mongo_client import MongoClient
+from pymongo import AsyncMongoClient, UpdateOne
 from pymongo.server_api import ServerApi
 from bson import ObjectId
 import certifi
 from typing import List, Dict, Any, Optional
 
 from app.core.config import get_settings
+from app.core.metrics import MongoCommandMetrics
 
 # Get settings
 settings = get_settings()
 
-# MongoDB Connection setup with improved error handling
-try:
-    client = MongoClient(
-        settings.mongo_uri,
-        server_api=ServerApi('1'),
-        tls=True,
-        tlsCAFile=certifi.where(),
-        connectTimeoutMS=30000,
-        socketTimeoutMS=30000
-    )
-    
-    # Test connection
-    client.admin.command('ping')
-    logging.info("Successfully connected to MongoDB")
-    
-    # Get database and collection
-    db = client.get_database(name='sample_mflix')
-    collection = db[settings.mongo_collection]
-except Exception as e:
-    logging.error(f"Failed to connect to MongoDB: {e}")
-    # Don't raise here to allow application to start even if DB is temporarily down
+
+def connect() -> None:
+    """Create the MongoDB client of this process.
+
+    The async client connects lazily, so constructing it never blocks the
+    event loop. It is created at import and again in each forked server
+    worker (see ``app.core.lifecycle.reset_after_fork``), since a client
+    must not be shared across ``fork()``.
+    """
+    global client, db, collection
+    # MongoDB Connection setup with improved error handling
+    try:
+        client = AsyncMongoClient(
+            settings.mongo_uri,
+            server_api=ServerApi('1'),
+            tls=True,
+            tlsCAFile=certifi.where(),
+            connectTimeoutMS=30000,
+            socketTimeoutMS=30000,
+            event_listeners=[MongoCommandMetrics()]
+        )
+
+        # Get database and collection
+        db = client.get_database(name='sample_mflix')
+        collection = db[settings.mongo_collection]
+    except Exception as e:
+        logging.error(f"Failed to connect to MongoDB: {e}")
+        # Don't raise here to allow application to start even if DB is temporarily down
+
+
+connect()
 
 
 def convert_objectid(obj: Any) -> Any:
@@ -60,7 +72,7 @@ def convert_objectid(obj: Any) -> Any:
         return obj
 
 
-def return_data(id: str) -> Dict[str, Any]:
+async def return_data(id: str) -> Dict[str, Any]:
     """Get company data by ID or name.
     
     Args:
@@ -73,7 +85,7 @@ def return_data(id: str) -> Dict[str, Any]:
         HTTPException: If company not found or other errors occur
     """
     try:
-        data = search_company_by_name(id)
+        data = await search_company_by_name(id, limit=1)
         
         if not data or len(data) == 0:
             raise HTTPException(status_code=404, detail="Company not found")
@@ -87,20 +99,143 @@ def return_data(id: str) -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-def search_company_by_name(name: str) -> List[Dict[str, Any]]:
-    """Search for companies by name in MongoDB.
+def normalize_name(name: str) -> str:
+    """Normalize a company name for the indexed ``name_lower`` field.
     
     Args:
-        name: Company name or partial name
+        name: Company name or user input
         
     Returns:
-        List[Dict[str, Any]]: List of matching companies
+        str: Trimmed, lowercased name with collapsed whitespace
+    """
+    return " ".join(name.split()).lower()
+
+
+async def ensure_indexes() -> None:
+    """Create the indexes used by company lookups.
+    
+    - ``slug``: unique, for exact slug lookups
+    - ``name_lower``: for exact and anchored prefix name lookups
+    - ``company_text``: text index over name, one-liner and tags for the
+      ranked fuzzy fallback
+    """
+    await collection.create_index(
+        "slug",
+        name="slug_unique",
+        unique=True,
+        partialFilterExpression={"slug": {"$type": "string"}}
+    )
+    await collection.create_index("name_lower", name="name_lower")
+    await collection.create_index(
+        [("name", "text"), ("one_liner", "text"), ("tags", "text")],
+        name="company_text",
+        weights={"name": 10, "one_liner": 3, "tags": 2},
+        default_language="english"
+    )
+
+
+async def backfill_name_lower(batch_size: int = 500) -> int:
+    """Set ``name_lower`` on documents where it is missing or stale.
+    
+    Args:
+        batch_size: Number of updates sent per bulk write
+        
+    Returns:
+        int: Number of updated documents
+    """
+    updates = []
+    updated = 0
+    cursor = collection.find({"name": {"$type": "string"}}, {"name": 1, "name_lower": 1})
+    async for doc in cursor:
+        name_lower = normalize_name(doc["name"])
+        if doc.get("name_lower") != name_lower:
+            updates.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"name_lower": name_lower}}))
+        if len(updates) >= batch_size:
+            updated += (await collection.bulk_write(updates, ordered=False)).modified_count
+            updates = []
+    if updates:
+        updated += (await collection.bulk_write(updates, ordered=False)).modified_count
+    return updated
+
+
+async def find_company(key: str) -> Optional[Dict[str, Any]]:
+    """Find a single company by id, slug or exact name using unique or equality indexes.
+    
+    Args:
+        key: ObjectId string, slug or company name
+        
+    Returns:
+        Optional[Dict[str, Any]]: The company document, or None
+    """
+    if ObjectId.is_valid(key):
+        doc = await collection.find_one({"_id": ObjectId(key)})
+        if doc:
+            return doc
+
+    normalized = normalize_name(key)
+    if not normalized:
+        return None
+    doc = await collection.find_one({"slug": normalized.replace(" ", "-")})
+    if doc:
+        return doc
+    return await collection.find_one({"name_lower": normalized})
+
+
+async def find_company_by_name(name: str) -> Optional[Dict[str, Any]]:
+    """Find a single company by slug or exact name in one round trip.
+    
+    Args:
+        name: Slug or company name
+        
+    Returns:
+        Optional[Dict[str, Any]]: The company document, preferring a slug match, or None
+    """
+    normalized = normalize_name(name)
+    if not normalized:
+        return None
+    slug = normalized.replace(" ", "-")
+    docs = await collection.find({"$or": [{"slug": slug}, {"name_lower": normalized}]}).limit(2).to_list(length=2)
+    return next((doc for doc in docs if doc.get("slug") == slug), docs[0] if docs else None)
+
+
+async def search_company_by_name(name: str, limit: int = 10) -> List[Dict[str, Any]]:
+    """Search for companies by id, slug or name in MongoDB.
+    
+    Lookups go from cheapest to most expensive, each served by an index:
+    exact id/slug/name, then an anchored prefix match on ``name_lower``
+    (user input is escaped, so regex metacharacters are matched literally),
+    then a text search ranked by relevance.
+    
+    Args:
+        name: Company id, slug, name or partial name
+        limit: Maximum number of results
+        
+    Returns:
+        List[Dict[str, Any]]: List of matching companies, best match first
         
     Raises:
         HTTPException: If no companies found or other errors occur
     """
     try:
-        results = list(collection.find({"name": {"$regex": name, "$options": "i"}}).limit(10))
+        exact = await find_company(name)
+        if exact:
+            return [exact]
+
+        normalized = normalize_name(name)
+        if not normalized:
+            raise HTTPException(status_code=404, detail="No companies found")
+
+        cursor = collection.find({"name_lower": {"$regex": f"^{re.escape(normalized)}"}}).limit(limit)
+        results = await cursor.to_list(length=limit)
+        if not results:
+            cursor = collection.find(
+                {"$text": {"$search": name}},
+                {"text_score": {"$meta": "textScore"}}
+            ).sort([("text_score", {"$meta": "textScore"})]).limit(limit)
+            results = await cursor.to_list(length=limit)
+            for doc in results:
+                doc.pop("text_score", None)
+
         if not results:
             raise HTTPException(status_code=404, detail="No companies found")
         return results
@@ -109,4 +244,4 @@ def search_company_by_name(name: str) -> List[Dict[str, Any]]:
         raise
     except Exception as e:
         logging.error(f"Error searching for company: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Internal server error")
@@ -1,16 +1,46 @@
 """Main application module for YC ATLAS Backend."""
 
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 
 from app.api.routes.search import router as search_router
 from app.api.routes.companies import router as companies_router
+from app.api.routes.admin import router as admin_router
 from app.core.config import get_settings
+from app.core.lifecycle import readiness, warm_up
+from app.core.metrics import MetricsMiddleware, StatsCollector, register_collector, render_metrics
+from app.db.catalog import catalog
+from app.services.clients import close_clients
+from app.services.embedding_cache import embedding_cache
+from app.services.openai_service import expansion_cache, question_cache
+from app.services.search_service import response_cache, index_version
+from app.services.query_router import decision_cache, route_stats
+from app.services.rate_limiter import scheduler
 
 # Get application settings
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop background services.
+
+    Warm-up runs in the background so the worker accepts connections
+    (and answers ``/health`` with 503) while it is still warming up.
+    """
+    if settings.catalog_enabled:
+        catalog.start()
+    warm_up_task = asyncio.create_task(warm_up())
+    yield
+    readiness.ready = False
+    warm_up_task.cancel()
+    await catalog.stop()
+    await close_clients()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="YC ATLAS API",
@@ -18,6 +48,7 @@ app = FastAPI(
     version="0.1.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -30,10 +61,29 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
+
+# Export cache and scheduler counters on /metrics
+register_collector(StatsCollector(
+    caches={
+        "embedding": embedding_cache.memory.stats,
+        "expansion": expansion_cache.cache.stats,
+        "question": question_cache.cache.stats,
+        "response": response_cache.cache.stats,
+        "route_decision": decision_cache.stats,
+    },
+    gauges={
+        "openai_queue_depth": ("OpenAI calls waiting for rate-limit budget", "priority",
+                               lambda: scheduler.stats()["queue_depth"]),
+        "catalog_companies": ("Companies in the in-memory catalog", None, lambda: len(catalog)),
+        "catalog_bytes": ("Size of the in-memory catalog", None, lambda: catalog.size_bytes),
+    },
+))
 
 # Include routers
 app.include_router(search_router, prefix="/api")
 app.include_router(companies_router, prefix="/api")
+app.include_router(admin_router, prefix="/api")
 
 
 @app.get("/", tags=["health"])
@@ -47,9 +97,33 @@ async def root():
 
 
 @app.get("/health", tags=["health"])
-async def health_check():
-    """Health check endpoint."""
-    return {"status": "healthy"}
+async def health_check(response: Response):
+    """Readiness endpoint, answering 503 until this worker has warmed up."""
+    if not readiness.ready:
+        response.status_code = 503
+        return {"status": "starting", **readiness.stats()}
+    return {"status": "healthy", **readiness.stats()}
+
+
+@app.get("/stats", tags=["health"])
+async def stats():
+    """Cache statistics endpoint."""
+    return {
+        "embedding_cache": embedding_cache.stats(),
+        "expansion_cache": expansion_cache.stats(),
+        "question_cache": question_cache.stats(),
+        "response_cache": {**response_cache.stats(), "index_version": index_version()},
+        "company_catalog": catalog.stats(),
+        "query_router": {"routes": route_stats.stats(), "decision_cache": decision_cache.stats()},
+        "openai_scheduler": scheduler.stats()
+    }
+
+
+@app.get("/metrics", tags=["health"])
+async def prometheus_metrics() -> Response:
+    """Prometheus metrics endpoint."""
+    content, media_type = render_metrics()
+    return Response(content=content, media_type=media_type)
 
 
 # Run with: uvicorn app.main:app --reload
@@ -17,4 +17,6 @@ allowing for easy testing, mocking, and potential replacement of providers.
 """
 
 from app.services.pinecone_service import get_index, query_index
-from app.services.openai_service import create_embeddings, explain_user_query, deep_question
+from app.services.openai_service import create_embeddings, create_embeddings_batch, explain_user_query, deep_question
+from app.services.vector_store import get_vector_backend, VectorBackend, VectorMatch
+from app.services.search_service import run_search, run_deep_research
@@ -0,0 +1,376 @@
+"""Approximate nearest neighbor indexes for the local vector backend.
+
+Two modes wrap a ``LocalVectorIndex`` and expose the same ``search``
+interface, so the local backend can swap exact search for an ANN index:
+- ``ivf``: inverted file index built with spherical k-means in NumPy.
+  Queries scan the ``nprobe`` closest clusters and score their rows exactly.
+- ``hnsw``: hierarchical navigable small world graph from the optional
+  ``hnswlib`` package. ``ef`` controls the size of the search beam.
+
+Larger ``nprobe`` / ``ef`` raise recall at the cost of latency; use
+``benchmarks.ann_recall`` to pick values that keep recall@30 high.
+"""
+
+import json
+import os
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from app.services.local_index import LocalVectorIndex, normalize_rows, top_k
+
+try:
+    import hnswlib
+except ImportError:  # Optional dependency, only needed for the hnsw mode
+    hnswlib = None
+
+# Supported local index modes
+INDEX_MODES = ("exact", "ivf", "hnsw")
+
+# Rows assigned to clusters per block while building
+ASSIGN_BLOCK_ROWS = 4096
+
+
+def assign_clusters(index: LocalVectorIndex, centroids: np.ndarray) -> np.ndarray:
+    """Assign every row of an index to its most similar centroid.
+
+    Args:
+        index: Index whose rows are assigned
+        centroids: Unit-length centroids of shape (nlist, dimension)
+
+    Returns:
+        np.ndarray: Cluster id of each row
+    """
+    count = len(index)
+    assignments = np.empty(count, dtype=np.int32)
+    for start in range(0, count, ASSIGN_BLOCK_ROWS):
+        rows = np.arange(start, min(start + ASSIGN_BLOCK_ROWS, count))
+        assignments[start:start + len(rows)] = np.argmax(index.vectors_for(rows) @ centroids.T, axis=1)
+    return assignments
+
+
+def train_centroids(sample: np.ndarray, nlist: int, iterations: int = 20, seed: int = 0) -> np.ndarray:
+    """Train cluster centroids with spherical k-means.
+
+    Args:
+        sample: Unit-length training vectors of shape (n, dimension)
+        nlist: Number of clusters
+        iterations: Number of k-means iterations
+        seed: Random seed for initialization
+
+    Returns:
+        np.ndarray: Unit-length centroids of shape (nlist, dimension)
+    """
+    rng = np.random.default_rng(seed)
+    nlist = min(nlist, len(sample))
+    centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, sample)
+        counts = np.bincount(assignments, minlength=nlist)
+        empty = counts == 0
+        if empty.any():
+            # Restart empty clusters from random training vectors
+            sums[empty] = sample[rng.choice(len(sample), int(empty.sum()), replace=False)]
+        centroids = normalize_rows(sums)
+    return centroids
+
+
+class IVFIndex:
+    """Inverted file index over a ``LocalVectorIndex``.
+
+    Attributes:
+        base: The wrapped exact index, providing vectors, ids and metadata
+        centroids: Unit-length cluster centroids
+        list_offsets: Start offset of each cluster in ``list_rows``
+        list_rows: Row ids grouped by cluster
+        nprobe: Number of clusters scanned per query
+    """
+
+    mode = "ivf"
+    filename = "ivf.npz"
+
+    def __init__(
+        self,
+        base: LocalVectorIndex,
+        centroids: np.ndarray,
+        list_offsets: np.ndarray,
+        list_rows: np.ndarray,
+        nprobe: int = 8,
+    ):
+        """Wrap trained IVF structures.
+
+        Args:
+            base: The exact index
+            centroids: Cluster centroids
+            list_offsets: Offsets of each cluster in ``list_rows`` (length nlist + 1)
+            list_rows: Row ids grouped by cluster
+            nprobe: Number of clusters scanned per query
+        """
+        self.base = base
+        self.centroids = centroids
+        self.list_offsets = list_offsets
+        self.list_rows = list_rows
+        self.nprobe = nprobe
+        self.ids = base.ids
+        self.metadata = base.metadata
+
+    def __len__(self) -> int:
+        return len(self.base)
+
+    @classmethod
+    def build(
+        cls,
+        base: LocalVectorIndex,
+        nlist: Optional[int] = None,
+        train_size: int = 100000,
+        iterations: int = 20,
+        nprobe: int = 8,
+    ) -> "IVFIndex":
+        """Train centroids on a sample of the index and assign every row.
+
+        Args:
+            base: The exact index to partition
+            nlist: Number of clusters, defaults to about 4 * sqrt(n)
+            train_size: Maximum number of rows used for training
+            iterations: Number of k-means iterations
+            nprobe: Default number of clusters scanned per query
+
+        Returns:
+            IVFIndex: The built index
+        """
+        count = len(base)
+        nlist = nlist or max(1, int(4 * np.sqrt(count)))
+        rng = np.random.default_rng(0)
+        sample_rows = np.sort(rng.choice(count, min(train_size, count), replace=False))
+        centroids = train_centroids(base.vectors_for(sample_rows), nlist, iterations)
+
+        assignments = assign_clusters(base, centroids)
+        list_rows = np.argsort(assignments, kind="stable").astype(np.int64)
+        counts = np.bincount(assignments, minlength=len(centroids))
+        list_offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        return cls(base, centroids, list_offsets, list_rows, nprobe)
+
+    def save(self, directory: str) -> None:
+        """Write the IVF structures next to the exact index files.
+
+        Args:
+            directory: Index directory
+        """
+        np.savez(
+            os.path.join(directory, self.filename),
+            centroids=self.centroids,
+            list_offsets=self.list_offsets,
+            list_rows=self.list_rows,
+        )
+
+    @classmethod
+    def load(cls, base: LocalVectorIndex, directory: str, nprobe: int = 8) -> "IVFIndex":
+        """Load IVF structures saved by ``save``.
+
+        Args:
+            base: The exact index loaded from the same directory
+            directory: Index directory
+            nprobe: Number of clusters scanned per query
+
+        Returns:
+            IVFIndex: The loaded index
+        """
+        with np.load(os.path.join(directory, cls.filename)) as data:
+            return cls(base, data["centroids"], data["list_offsets"], data["list_rows"], nprobe)
+
+    def candidate_rows(self, query: np.ndarray, nprobe: Optional[int] = None) -> np.ndarray:
+        """Return the rows of the clusters closest to a query.
+
+        Args:
+            query: Query vector
+            nprobe: Number of clusters to scan, defaults to ``self.nprobe``
+
+        Returns:
+            np.ndarray: Candidate row ids
+        """
+        nprobe = min(nprobe or self.nprobe, len(self.centroids))
+        probes = top_k(self.centroids @ query, nprobe)
+        rows = np.concatenate([
+            self.list_rows[self.list_offsets[c]:self.list_offsets[c + 1]] for c in probes
+        ])
+        # Sorted rows read the memory-mapped matrix sequentially
+        return np.sort(rows)
+
+    def search(self, query: np.ndarray, k: int, nprobe: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Find approximately the ``k`` rows most similar to a query.
+
+        Args:
+            query: Query vector of shape (dimension,)
+            k: Number of results
+            nprobe: Number of clusters to scan, defaults to ``self.nprobe``
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Row positions and their scores, best first
+        """
+        query = self.base.prepare_query(query)
+        rows = self.candidate_rows(query, nprobe)
+        scores = self.base.score(query, rows)
+        best = top_k(scores, k)
+        return rows[best], scores[best]
+
+
+class HNSWIndex:
+    """HNSW graph index over a ``LocalVectorIndex`` (requires ``hnswlib``).
+
+    Attributes:
+        base: The wrapped exact index, providing ids and metadata
+        graph: The ``hnswlib`` index
+        ef: Search beam size
+    """
+
+    mode = "hnsw"
+    filename = "hnsw.bin"
+    params_filename = "hnsw.json"
+
+    def __init__(self, base: LocalVectorIndex, graph, ef: int = 64, params: Optional[Dict[str, int]] = None):
+        """Wrap a built graph.
+
+        Args:
+            base: The exact index
+            graph: The ``hnswlib.Index``
+            ef: Search beam size
+            params: Build parameters, saved alongside the graph
+        """
+        self.base = base
+        self.graph = graph
+        self.ef = ef
+        self.params = params or {}
+        self.ids = base.ids
+        self.metadata = base.metadata
+        self.graph.set_ef(ef)
+
+    def __len__(self) -> int:
+        return len(self.base)
+
+    @staticmethod
+    def _require_hnswlib() -> None:
+        if hnswlib is None:
+            raise ImportError("The hnsw index mode requires the optional 'hnswlib' package")
+
+    @classmethod
+    def build(cls, base: LocalVectorIndex, m: int = 16, ef_construction: int = 200, ef: int = 64) -> "HNSWIndex":
+        """Insert every row of the exact index into a new graph.
+
+        Args:
+            base: The exact index
+            m: Number of graph links per node
+            ef_construction: Beam size used while building
+            ef: Default search beam size
+
+        Returns:
+            HNSWIndex: The built index
+        """
+        cls._require_hnswlib()
+        graph = hnswlib.Index(space="cosine", dim=base.dimension)
+        graph.init_index(max_elements=len(base), ef_construction=ef_construction, M=m)
+        for start in range(0, len(base), ASSIGN_BLOCK_ROWS):
+            rows = np.arange(start, min(start + ASSIGN_BLOCK_ROWS, len(base)))
+            graph.add_items(base.vectors_for(rows), rows)
+        return cls(base, graph, ef, {"m": m, "ef_construction": ef_construction})
+
+    def save(self, directory: str) -> None:
+        """Write the graph next to the exact index files.
+
+        Args:
+            directory: Index directory
+        """
+        self.graph.save_index(os.path.join(directory, self.filename))
+        with open(os.path.join(directory, self.params_filename), "w") as f:
+            json.dump(self.params, f)
+
+    @classmethod
+    def load(cls, base: LocalVectorIndex, directory: str, ef: int = 64) -> "HNSWIndex":
+        """Load a graph saved by ``save``.
+
+        Args:
+            base: The exact index loaded from the same directory
+            directory: Index directory
+            ef: Search beam size
+
+        Returns:
+            HNSWIndex: The loaded index
+        """
+        cls._require_hnswlib()
+        graph = hnswlib.Index(space="cosine", dim=base.dimension)
+        graph.load_index(os.path.join(directory, cls.filename), max_elements=len(base))
+        with open(os.path.join(directory, cls.params_filename)) as f:
+            params = json.load(f)
+        return cls(base, graph, ef, params)
+
+    def set_ef(self, ef: int) -> None:
+        """Change the search beam size.
+
+        The beam size is state of the shared graph, so it must not change
+        while other threads search; it is meant for single-threaded tuning.
+
+        Args:
+            ef: Search beam size
+        """
+        self.ef = ef
+        self.graph.set_ef(ef)
+
+    def search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Find approximately the ``k`` rows most similar to a query.
+
+        The graph is searched with a beam of ``max(ef, k)``; the beam size
+        itself is never changed per query, so concurrent searches are safe.
+
+        Args:
+            query: Query vector of shape (dimension,)
+            k: Number of results
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Row positions and their scores, best first
+        """
+        k = min(k, len(self.base))
+        labels, distances = self.graph.knn_query(self.base.prepare_query(query), k=k)
+        return labels[0].astype(np.int64), (1.0 - distances[0]).astype(np.float32)
+
+
+def load_index(directory: str, mode: str = "exact", nprobe: int = 8, ef: int = 64):
+    """Load a local index directory in the requested search mode.
+
+    Args:
+        directory: Index directory
+        mode: One of ``INDEX_MODES``
+        nprobe: IVF clusters scanned per query
+        ef: HNSW search beam size
+
+    Returns:
+        LocalVectorIndex, IVFIndex or HNSWIndex: Index exposing ``search``
+
+    Raises:
+        ValueError: If the mode is unknown
+    """
+    base = LocalVectorIndex.load(directory)
+    if mode == "exact":
+        return base
+    if mode == "ivf":
+        return IVFIndex.load(base, directory, nprobe=nprobe)
+    if mode == "hnsw":
+        return HNSWIndex.load(base, directory, ef=ef)
+    raise ValueError(f"Unknown local index mode {mode!r}, expected one of {INDEX_MODES}")
+
+
+def index_info(index) -> Dict[str, object]:
+    """Describe a loaded index.
+
+    Args:
+        index: Index returned by ``load_index``
+
+    Returns:
+        Dict[str, object]: Mode, size and tuning parameters
+    """
+    info: Dict[str, object] = {"mode": getattr(index, "mode", "exact"), "vectors": len(index)}
+    if isinstance(index, IVFIndex):
+        info.update(nlist=len(index.centroids), nprobe=index.nprobe)
+    elif isinstance(index, HNSWIndex):
+        info.update(ef=index.ef, **index.params)
+    return info
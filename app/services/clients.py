@@ -0,0 +1,62 @@
+"""Shared, tuned clients for the outbound OpenAI API.
+
+One ``AsyncOpenAI`` client is shared by the process. Its connection pool is
+sized for the expected concurrency and keeps connections alive between
+requests, so bursts reuse warm TLS connections instead of handshaking again.
+HTTP/2 is used when enabled and the optional ``h2`` package is installed.
+Failed calls are retried by the SDK on 429 and 5xx responses, with jittered
+exponential backoff that honours ``Retry-After``.
+
+The Pinecone index handle is managed in ``pinecone_service``.
+"""
+
+import importlib.util
+from functools import lru_cache
+
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+import httpx
+
+from app.core.config import get_settings
+
+# Get settings
+settings = get_settings()
+
+
+def http2_available() -> bool:
+    """Tell whether HTTP/2 can be used.
+
+    Returns:
+        bool: True if HTTP/2 is enabled and the ``h2`` package is installed
+    """
+    return settings.http2 and importlib.util.find_spec("h2") is not None
+
+
+@lru_cache()
+def get_openai_client() -> AsyncOpenAI:
+    """Get the shared OpenAI client.
+
+    Returns:
+        AsyncOpenAI: Client with a tuned, keep-alive connection pool
+    """
+    http_client = DefaultAsyncHttpxClient(
+        http2=http2_available(),
+        limits=httpx.Limits(
+            max_connections=settings.openai_max_connections,
+            max_keepalive_connections=settings.openai_max_connections,
+            keepalive_expiry=settings.keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(settings.openai_timeout, connect=settings.connect_timeout),
+    )
+    return AsyncOpenAI(
+        api_key=settings.openai_api_key,
+        base_url=settings.openai_base_url or None,
+        http_client=http_client,
+        max_retries=settings.openai_max_retries,
+        timeout=httpx.Timeout(settings.openai_timeout, connect=settings.connect_timeout),
+    )
+
+
+async def close_clients() -> None:
+    """Close the pooled connections of the shared clients."""
+    if get_openai_client.cache_info().currsize:
+        await get_openai_client().close()
@@ -0,0 +1,230 @@
+"""Content-addressed cache for query embeddings.
+
+Embeddings are keyed by the embedding model plus a SHA-256 hash of the
+normalized text. An in-process LRU tier bounded by bytes answers repeated
+queries without any I/O, and an optional SQLite tier keeps vectors across
+restarts. Vectors are stored as packed float32.
+
+The SQLite tier is opened on first use in each process: a connection must
+not cross ``fork()``, and the production server imports this module in the
+master before forking its workers.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from typing import Dict, List, Optional, Any
+
+from app.core.config import get_settings
+from app.utils.cache import LRUCache
+from app.utils.data_normalization import normalize_text
+
+# Get settings
+settings = get_settings()
+
+
+def embedding_key(model: str, content: str) -> str:
+    """Build the cache key for a text embedded with a model.
+
+    Args:
+        model: Embedding model name
+        content: Text to embed
+
+    Returns:
+        str: Key of the form ``<model>:<sha256 of normalized text>``
+    """
+    digest = hashlib.sha256(normalize_text(content).encode("utf-8")).hexdigest()
+    return f"{model}:{digest}"
+
+
+class SQLiteEmbeddingStore:
+    """Persistent embedding tier backed by a SQLite file.
+
+    Rows keep their last access time so the store can drop the least
+    recently used vectors once it grows past ``max_entries``.
+    """
+
+    def __init__(self, path: str, max_entries: int):
+        """Open (and create if needed) the store.
+
+        Args:
+            path: Path of the SQLite database file
+            max_entries: Maximum number of stored vectors
+        """
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, vector BLOB NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS embeddings_accessed_at ON embeddings (accessed_at)")
+        self._conn.commit()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        """Fetch stored vectors and refresh their access time.
+
+        Args:
+            keys: Cache keys to look up
+
+        Returns:
+            Dict[str, bytes]: Packed float32 vectors of the keys that were found
+        """
+        if not keys:
+            return {}
+        placeholders = ",".join("?" * len(keys))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", keys
+            ).fetchall()
+            if rows:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET accessed_at = ? WHERE key = ?", [(now, key) for key, _ in rows]
+                )
+                self._conn.commit()
+        return dict(rows)
+
+    def put_many(self, items: Dict[str, bytes]) -> None:
+        """Store vectors, trimming the least recently used rows over the limit.
+
+        Args:
+            items: Packed float32 vectors by cache key
+        """
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, accessed_at) VALUES (?, ?, ?)",
+                [(key, vector, now) for key, vector in items.items()],
+            )
+            self._count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            overflow = self._count - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM embeddings WHERE key IN "
+                    "(SELECT key FROM embeddings ORDER BY accessed_at LIMIT ?)",
+                    (overflow,),
+                )
+                self._count -= overflow
+                self.evictions += overflow
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the store counters.
+
+        Returns:
+            Dict[str, Any]: Entry and eviction counters
+        """
+        return {"entries": self._count, "evictions": self.evictions}
+
+
+class EmbeddingCache:
+    """Two-tier embedding cache: in-process LRU in front of an optional disk store."""
+
+    def __init__(self, max_bytes: int, disk_path: str = "", disk_max_entries: int = 100000):
+        """Initialize the cache.
+
+        Args:
+            max_bytes: Memory budget of the in-process tier in bytes
+            disk_path: SQLite file for the persistent tier, disabled if empty
+            disk_max_entries: Maximum number of vectors kept on disk
+        """
+        self.memory = LRUCache(max_weight=max_bytes, weigher=len)
+        self.disk_path = disk_path
+        self.disk_max_entries = disk_max_entries
+        self.disk_hits = 0
+        self._disk: Optional[SQLiteEmbeddingStore] = None
+        self._disk_pid: Optional[int] = None
+
+    @property
+    def disk(self) -> Optional[SQLiteEmbeddingStore]:
+        """Persistent tier of the current process, opened on first use.
+
+        Returns:
+            Optional[SQLiteEmbeddingStore]: The store, None if disabled or it failed to open
+        """
+        if not self.disk_path or self._disk_pid == os.getpid():
+            return self._disk
+        self._disk_pid = os.getpid()
+        try:
+            self._disk = SQLiteEmbeddingStore(self.disk_path, self.disk_max_entries)
+        except Exception as e:
+            self._disk = None
+            logging.error(f"Failed to open embedding cache at {self.disk_path}: {e}")
+        return self._disk
+
+    async def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """Look up vectors, promoting disk hits into memory.
+
+        Args:
+            keys: Cache keys to look up
+
+        Returns:
+            Dict[str, List[float]]: Vectors of the keys that were found
+        """
+        found: Dict[str, bytes] = {}
+        for key in keys:
+            packed = self.memory.get(key)
+            if packed is not None:
+                found[key] = packed
+
+        missing = [key for key in keys if key not in found]
+        disk = self.disk if missing else None
+        if disk is not None:
+            try:
+                from_disk = await asyncio.to_thread(disk.get_many, missing)
+            except Exception as e:
+                logging.error(f"Error reading embedding cache: {e}")
+                from_disk = {}
+            self.disk_hits += len(from_disk)
+            for key, packed in from_disk.items():
+                self.memory.set(key, packed)
+            found.update(from_disk)
+
+        return {key: array("f", packed).tolist() for key, packed in found.items()}
+
+    async def set_many(self, vectors: Dict[str, List[float]]) -> None:
+        """Store vectors in both tiers.
+
+        Args:
+            vectors: Vectors by cache key
+        """
+        packed = {key: array("f", vector).tobytes() for key, vector in vectors.items()}
+        for key, value in packed.items():
+            self.memory.set(key, value)
+        disk = self.disk
+        if disk is not None:
+            try:
+                await asyncio.to_thread(disk.put_many, packed)
+            except Exception as e:
+                logging.error(f"Error writing embedding cache: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the counters of both tiers.
+
+        Returns:
+            Dict[str, Any]: Memory tier counters, plus disk tier counters if enabled
+        """
+        stats = {"memory": self.memory.stats()}
+        disk = self.disk
+        if disk is not None:
+            stats["disk"] = {**disk.stats(), "hits": self.disk_hits}
+        return stats
+
+
+# Shared cache instance used by the OpenAI service
+embedding_cache = EmbeddingCache(
+    max_bytes=settings.embedding_cache_max_bytes,
+    disk_path=settings.embedding_cache_path,
+    disk_max_entries=settings.embedding_cache_disk_max_entries,
+)
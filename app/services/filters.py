@@ -0,0 +1,163 @@
+"""Structured search filters on company metadata.
+
+Filters are plain dictionaries built from ``SearchFilters`` requests:
+``batch``, ``industry`` and ``status`` hold lists of accepted values (a
+company matches if any of its values is accepted), ``team_size_min`` and
+``team_size_max`` bound the team size. All conditions must hold.
+
+They are pushed into the vector query, so the top-k is computed over
+eligible companies only:
+- Pinecone receives them as a metadata filter (``compile_pinecone_filter``)
+- local indexes select eligible rows from a ``BitmapIndex`` and score just those
+Lexical hits and name lookups are checked with ``matches``.
+"""
+
+import math
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Metadata fields filtered by accepted values
+CATEGORICAL_FIELDS = ("batch", "industry", "status")
+
+# Metadata field filtered by range
+TEAM_SIZE_FIELD = "team_size"
+
+
+def _values(value: Any) -> Iterable[Any]:
+    """Return the values of a metadata field, which may hold one value or a list."""
+    if value is None:
+        return ()
+    if isinstance(value, (list, tuple)):
+        return value
+    return (value,)
+
+
+def _number(value: Any) -> float:
+    """Convert a metadata value to a number, NaN when it is missing or not numeric."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def filter_key(filters: Optional[Dict[str, Any]]) -> Optional[Tuple]:
+    """Return a hashable, order-independent form of filters for cache keys.
+
+    Args:
+        filters: Search filters, None for none
+
+    Returns:
+        Optional[Tuple]: Sorted (field, value) pairs, None without filters
+    """
+    if not filters:
+        return None
+    return tuple(sorted(
+        (field, tuple(sorted(map(str, value))) if isinstance(value, list) else value)
+        for field, value in filters.items()
+    ))
+
+
+def matches(metadata: Dict[str, Any], filters: Optional[Dict[str, Any]]) -> bool:
+    """Check one company's metadata against filters.
+
+    Args:
+        metadata: Company metadata
+        filters: Search filters, None for none
+
+    Returns:
+        bool: Whether the company is eligible
+    """
+    if not filters:
+        return True
+    for field in CATEGORICAL_FIELDS:
+        accepted = filters.get(field)
+        if accepted and not any(value in accepted for value in _values(metadata.get(field))):
+            return False
+    team_size = _number(metadata.get(TEAM_SIZE_FIELD))
+    if filters.get("team_size_min") is not None and not team_size >= filters["team_size_min"]:
+        return False
+    if filters.get("team_size_max") is not None and not team_size <= filters["team_size_max"]:
+        return False
+    return True
+
+
+def compile_pinecone_filter(filters: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Compile filters to a Pinecone metadata filter.
+
+    Args:
+        filters: Search filters, None for none
+
+    Returns:
+        Optional[Dict[str, Any]]: Pinecone filter expression, None without filters
+    """
+    if not filters:
+        return None
+    clauses = [{field: {"$in": filters[field]}} for field in CATEGORICAL_FIELDS if filters.get(field)]
+    team_size = {}
+    if filters.get("team_size_min") is not None:
+        team_size["$gte"] = filters["team_size_min"]
+    if filters.get("team_size_max") is not None:
+        team_size["$lte"] = filters["team_size_max"]
+    if team_size:
+        clauses.append({TEAM_SIZE_FIELD: team_size})
+    if not clauses:
+        return None
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
+class BitmapIndex:
+    """Per-value bitmaps over the rows of a local vector index.
+
+    Every value of a categorical field maps to a boolean array marking the
+    rows holding it, so a filter resolves to a few vectorized ORs and ANDs
+    instead of a scan over the metadata dictionaries.
+
+    Attributes:
+        bitmaps: Row bitmaps by field and value
+        team_sizes: Team size of each row, NaN where unknown
+    """
+
+    def __init__(self, metadata: Sequence[Dict[str, Any]]):
+        """Build the bitmaps.
+
+        Args:
+            metadata: Metadata dictionaries in row order
+        """
+        self.count = len(metadata)
+        self.bitmaps: Dict[str, Dict[Any, np.ndarray]] = {field: {} for field in CATEGORICAL_FIELDS}
+        for row, item in enumerate(metadata):
+            for field in CATEGORICAL_FIELDS:
+                for value in _values(item.get(field)):
+                    bitmap = self.bitmaps[field].get(value)
+                    if bitmap is None:
+                        bitmap = self.bitmaps[field][value] = np.zeros(self.count, dtype=bool)
+                    bitmap[row] = True
+        self.team_sizes = np.array([_number(item.get(TEAM_SIZE_FIELD)) for item in metadata], dtype=np.float64)
+
+    def mask(self, filters: Dict[str, Any]) -> np.ndarray:
+        """Resolve filters to the eligible rows.
+
+        Args:
+            filters: Search filters
+
+        Returns:
+            np.ndarray: Boolean array, True for eligible rows
+        """
+        mask = np.ones(self.count, dtype=bool)
+        for field in CATEGORICAL_FIELDS:
+            accepted = filters.get(field)
+            if not accepted:
+                continue
+            any_value = np.zeros(self.count, dtype=bool)
+            for value in accepted:
+                bitmap = self.bitmaps[field].get(value)
+                if bitmap is not None:
+                    any_value |= bitmap
+            mask &= any_value
+        # NaN team sizes compare False, so unknown sizes never pass a bound
+        if filters.get("team_size_min") is not None:
+            mask &= self.team_sizes >= filters["team_size_min"]
+        if filters.get("team_size_max") is not None:
+            mask &= self.team_sizes <= filters["team_size_max"]
+        return mask
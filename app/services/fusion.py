@@ -0,0 +1,112 @@
+"""Fusion and re-ranking of ranked result lists."""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def reciprocal_rank_fusion(
+    result_sets: Sequence[List[Dict[str, Any]]],
+    k: int = 60,
+    weights: Optional[Sequence[float]] = None,
+) -> List[Dict[str, Any]]:
+    """Merge ranked result lists with (weighted) reciprocal rank fusion.
+
+    Each result scores ``weight / (k + rank)`` in every list it appears in,
+    so lists with incomparable scores (BM25, cosine) can be combined. A
+    result keeps the metadata of the first list that returned it.
+
+    Args:
+        result_sets: Ranked results with id, score and metadata, best first
+        k: Rank smoothing constant; larger values flatten the rank weights
+        weights: Weight of each list, 1.0 each if None
+
+    Returns:
+        List[Dict[str, Any]]: Deduplicated results with fused scores, best first
+    """
+    weights = weights or [1.0] * len(result_sets)
+    fused: Dict[str, Dict[str, Any]] = {}
+    for results, weight in zip(result_sets, weights):
+        for rank, item in enumerate(results, start=1):
+            entry = fused.get(item["id"])
+            if entry is None:
+                entry = fused[item["id"]] = {**item, "score": 0.0}
+            entry["score"] += weight / (k + rank)
+
+    return sorted(fused.values(), key=lambda x: x["score"], reverse=True)
+
+
+def normalized_score_fusion(result_sets: Sequence[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Merge result lists by summing min-max normalized scores.
+
+    Each list's scores are rescaled to [0, 1] before summing, so a list
+    with a narrow, high score range cannot outweigh the others. A list
+    whose scores are all equal contributes 1.0 per result.
+
+    Args:
+        result_sets: Ranked results with id, score and metadata
+
+    Returns:
+        List[Dict[str, Any]]: Deduplicated results with fused scores, best first
+    """
+    items: List[Dict[str, Any]] = []
+    positions: Dict[str, int] = {}
+    rows, contributions = [], []
+    for results in result_sets:
+        if not results:
+            continue
+        scores = np.fromiter((item["score"] for item in results), dtype=np.float64, count=len(results))
+        low, high = scores.min(), scores.max()
+        contributions.append((scores - low) / (high - low) if high > low else np.ones_like(scores))
+        for item in results:
+            if item["id"] not in positions:
+                positions[item["id"]] = len(items)
+                items.append(item)
+        rows.append(np.fromiter((positions[item["id"]] for item in results), dtype=np.int64, count=len(results)))
+    if not items:
+        return []
+
+    totals = np.zeros(len(items))
+    np.add.at(totals, np.concatenate(rows), np.concatenate(contributions))
+    order = np.argsort(-totals, kind="stable")
+    return [{**items[i], "score": float(totals[i])} for i in order.tolist()]
+
+
+def maximal_marginal_relevance(
+    relevance: np.ndarray, vectors: np.ndarray, k: int, lambda_: float = 0.5
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Order candidates by Maximal Marginal Relevance.
+
+    The first ``k`` candidates are picked greedily, each maximizing
+    ``lambda_ * relevance - (1 - lambda_) * max similarity to the picks so
+    far``; the rest follow by their marginal gain after the last pick.
+    Similarities to picks are computed one row at a time, so the cost is
+    ``k`` matrix-vector products rather than a full similarity matrix.
+    Negative similarities count as 0, which keeps the gains non-increasing.
+
+    Args:
+        relevance: Relevance of each candidate, ideally in [0, 1]
+        vectors: Unit-length candidate vectors of shape (n, dimension)
+        k: Number of candidates picked greedily
+        lambda_: Trade-off between relevance (1.0) and diversity (0.0)
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Candidate positions in MMR order and their marginal gains
+    """
+    count = len(relevance)
+    k = min(k, count)
+    weighted = lambda_ * np.asarray(relevance, dtype=np.float32)
+    redundancy = np.zeros(count, dtype=np.float32)
+    order = np.empty(count, dtype=np.int64)
+    gains = np.empty(count, dtype=np.float32)
+    for step in range(k):
+        gain = weighted - (1 - lambda_) * redundancy
+        pick = int(np.argmax(gain))
+        order[step], gains[step] = pick, gain[pick]
+        np.maximum(redundancy, vectors @ vectors[pick], out=redundancy)
+        weighted[pick] = -np.inf
+
+    gain = weighted - (1 - lambda_) * redundancy
+    rest = np.argsort(-gain, kind="stable")[:count - k]
+    order[k:], gains[k:] = rest, gain[rest]
+    return order, gains
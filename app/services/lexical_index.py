@@ -0,0 +1,227 @@
+"""BM25 lexical index over company names, one-liners, tags and batches.
+
+Dense retrieval runs on an LLM paraphrase of the query, which loses exact
+names and keywords ("Stripe", "W21 fintech"). This in-memory inverted index
+scores those directly with field-weighted BM25. It is built from the
+company catalog snapshot and rebuilt whenever the snapshot changes.
+
+Companies are keyed by the ``COMPANY_KEY_FIELD`` document field so lexical
+hits share ids with the vector index and can be fused with its matches.
+"""
+
+import asyncio
+import logging
+import math
+import re
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
+import orjson
+
+from app.core.config import get_settings
+from app.db.catalog import catalog, company_metadata
+from app.db.company_data import normalize_name
+from app.services.filters import matches
+from app.utils.data_normalization import normalize_text
+
+# Get settings
+settings = get_settings()
+
+# Indexed document fields and their term-frequency weights
+FIELD_WEIGHTS = {"name": 3.0, "tags": 2.0, "batch": 1.5, "one_liner": 1.0}
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into normalized word tokens.
+
+    Args:
+        text: Input text
+
+    Returns:
+        List[str]: Casefolded word tokens
+    """
+    return _TOKEN.findall(normalize_text(text))
+
+
+def _field_text(value: Any) -> str:
+    if isinstance(value, list):
+        return " ".join(str(item) for item in value)
+    return str(value) if value is not None else ""
+
+
+class BM25Index:
+    """Field-weighted BM25 inverted index.
+
+    Attributes:
+        ids: Company keys in document order
+        metadata: Company documents in document order
+        postings: Weighted term frequencies by term, as (document, frequency) pairs
+    """
+
+    def __init__(self, docs: Iterable[Dict[str, Any]], key_field: str):
+        """Index company documents.
+
+        Documents without a value in ``key_field`` are skipped.
+
+        Args:
+            docs: Company documents
+            key_field: Document field used as the company id
+        """
+        self.ids: List[str] = []
+        self.metadata: List[Dict[str, Any]] = []
+        self.postings: Dict[str, List[tuple]] = defaultdict(list)
+        lengths = []
+
+        for doc in docs:
+            key = doc.get(key_field)
+            if key is None:
+                continue
+            frequencies: Dict[str, float] = defaultdict(float)
+            for field, weight in FIELD_WEIGHTS.items():
+                for token in tokenize(_field_text(doc.get(field))):
+                    frequencies[token] += weight
+            position = len(self.ids)
+            self.ids.append(str(key))
+            self.metadata.append(company_metadata(doc))
+            lengths.append(sum(frequencies.values()))
+            for token, frequency in frequencies.items():
+                self.postings[token].append((position, frequency))
+
+        count = len(self.ids)
+        average_length = sum(lengths) / count if count else 0.0
+        self._norms = [
+            BM25_K1 * (1 - BM25_B + BM25_B * length / average_length) if average_length else BM25_K1
+            for length in lengths
+        ]
+        self._idf = {
+            token: math.log(1 + (count - len(docs_with_token) + 0.5) / (len(docs_with_token) + 0.5))
+            for token, docs_with_token in self.postings.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def search(self, query: str, k: int, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Score companies against a query.
+
+        Args:
+            query: The user query
+            k: Number of results
+            filters: Search filters restricting the eligible companies, None for none
+
+        Returns:
+            List[Dict[str, Any]]: Results with id, BM25 score and metadata, best first
+        """
+        scores: Dict[int, float] = defaultdict(float)
+        for token in set(tokenize(query)):
+            idf = self._idf.get(token)
+            if idf is None:
+                continue
+            for position, frequency in self.postings[token]:
+                scores[position] += idf * frequency * (BM25_K1 + 1) / (frequency + self._norms[position])
+
+        if filters:
+            scores = {
+                position: score for position, score in scores.items() if matches(self.metadata[position], filters)
+            }
+        best = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [
+            {"id": self.ids[position], "score": score, "metadata": self.metadata[position]}
+            for position, score in best
+        ]
+
+
+_index: Optional[BM25Index] = None
+_index_version = -1
+_rebuild: Optional[asyncio.Task] = None
+
+
+def _build(records: List[bytes], version: int) -> BM25Index:
+    global _index, _index_version
+    index = BM25Index((orjson.loads(record) for record in records), settings.company_key_field)
+    _index, _index_version = index, version
+    logging.info(f"Built lexical index over {len(index)} companies")
+    return index
+
+
+async def _build_index() -> BM25Index:
+    return await asyncio.to_thread(_build, list(catalog.records.values()), catalog.version)
+
+
+def preload_lexical_index() -> Optional[BM25Index]:
+    """Build the lexical index synchronously, before the event loop starts.
+
+    Returns:
+        Optional[BM25Index]: The index, or None if the catalog is not loaded
+    """
+    if not catalog.ready:
+        return None
+    return _build(list(catalog.records.values()), catalog.version)
+
+
+async def get_lexical_index() -> Optional[BM25Index]:
+    """Get the lexical index, rebuilding it if the catalog changed.
+
+    The first build is awaited; later rebuilds run in the background while
+    the previous index keeps serving.
+
+    Returns:
+        Optional[BM25Index]: The index, or None if the catalog is not loaded
+    """
+    global _rebuild
+    if not catalog.ready:
+        return None
+    if _index_version != catalog.version and (_rebuild is None or _rebuild.done()):
+        _rebuild = asyncio.create_task(_build_index())
+    if _index is None:
+        return await asyncio.shield(_rebuild)
+    return _index
+
+
+def is_decisive(query: str, results: List[Dict[str, Any]]) -> bool:
+    """Tell whether the top lexical hit clearly answers a query.
+
+    The top hit is decisive when its name equals the query, or when the
+    query tokens all appear in its name and it outscores the runner-up
+    by ``LEXICAL_DECISIVE_RATIO``.
+
+    Args:
+        query: The user query
+        results: Lexical results for the query, best first
+
+    Returns:
+        bool: True if the query names the top hit
+    """
+    if not results:
+        return False
+    top = results[0]
+    name = normalize_name(_field_text(top["metadata"].get("name")))
+    if name and name == normalize_name(query):
+        return True
+
+    query_tokens = set(tokenize(query))
+    if not query_tokens or not query_tokens.issubset(tokenize(name)):
+        return False
+    return len(results) == 1 or top["score"] >= settings.lexical_decisive_ratio * results[1]["score"]
+
+
+async def lexical_search(query: str, k: int, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """Search the lexical index.
+
+    Args:
+        query: The user query
+        k: Number of results
+        filters: Search filters restricting the eligible companies, None for none
+
+    Returns:
+        List[Dict[str, Any]]: Results with id, BM25 score and metadata, empty
+            if the catalog is not loaded
+    """
+    index = await get_lexical_index()
+    return index.search(query, k, filters) if index is not None else []
@@ -0,0 +1,362 @@
+"""Local exact vector index stored as a memory-mapped NumPy matrix.
+
+An index directory contains:
+- ``manifest.json``: dimension, storage dtype and vector count
+- ``vectors.npy``: unit-normalized vectors, one row per company
+- ``scales.npy``: per-row dequantization scales (int8 storage only)
+- ``ids.json``: vector ids in row order
+- ``metadata.json``: metadata dictionaries in row order
+- ``full_vectors.npy``: optional full-dimension float32 vectors for re-ranking
+
+Rows are normalized at build time, so cosine similarity is a dot product.
+Vectors can be stored as float32, float16 or int8 to trade precision for
+memory; scoring always accumulates in float32.
+
+text-embedding-3 vectors are Matryoshka embeddings: their leading
+components carry most of the signal, so an index can store only the first
+``dimensions`` components (renormalized). Longer query vectors are then
+truncated the same way, and ``rerank`` can rescore the short-vector
+candidates with the full-dimension vectors.
+"""
+
+import json
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Storage dtypes supported by the index
+SUPPORTED_DTYPES = ("float32", "float16", "int8")
+
+# Rows dequantized per block; small blocks keep the float32 scratch in cache
+SCORE_BLOCK_ROWS = 256
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """Scale each row of a matrix to unit length.
+
+    Args:
+        vectors: Matrix of shape (n, dimension)
+
+    Returns:
+        np.ndarray: float32 matrix with unit-length rows (zero rows stay zero)
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def truncate_vectors(vectors: np.ndarray, dimensions: Optional[int]) -> np.ndarray:
+    """Keep the leading components of each row and renormalize.
+
+    Args:
+        vectors: Matrix of shape (n, full_dimension)
+        dimensions: Number of components to keep, all if None or larger
+
+    Returns:
+        np.ndarray: float32 matrix with unit-length rows
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if dimensions and dimensions < vectors.shape[1]:
+        vectors = vectors[:, :dimensions]
+    return normalize_rows(vectors)
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Return the positions of the ``k`` highest scores, best first.
+
+    Uses ``argpartition`` so only the selected candidates are sorted.
+
+    Args:
+        scores: 1-D array of scores
+        k: Number of positions to return
+
+    Returns:
+        np.ndarray: Positions sorted by descending score
+    """
+    k = min(k, scores.shape[0])
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+class LocalVectorIndex:
+    """Exact cosine-similarity index over a memory-mapped matrix.
+
+    Attributes:
+        ids: Vector ids in row order
+        metadata: Metadata dictionaries in row order
+        vectors: Stored (possibly quantized) vectors
+        scales: Per-row dequantization scales for int8 storage, else None
+        full_vectors: Full-dimension float32 vectors for re-ranking, else None
+        dimension: Vector dimension
+    """
+
+    def __init__(
+        self,
+        ids: List[str],
+        metadata: List[Dict[str, Any]],
+        vectors: np.ndarray,
+        scales: Optional[np.ndarray] = None,
+        full_vectors: Optional[np.ndarray] = None,
+    ):
+        """Wrap already-normalized vectors.
+
+        Args:
+            ids: Vector ids in row order
+            metadata: Metadata dictionaries in row order
+            vectors: Stored vectors of shape (n, dimension)
+            scales: Per-row scales when ``vectors`` is int8
+            full_vectors: Full-dimension vectors when ``vectors`` are truncated
+        """
+        self.ids = ids
+        self.metadata = metadata
+        self.vectors = vectors
+        self.scales = scales
+        self.full_vectors = full_vectors
+        self.dimension = int(vectors.shape[1]) if vectors.ndim == 2 else 0
+        self.positions = {vector_id: i for i, vector_id in enumerate(ids)}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def build(
+        cls,
+        ids: Sequence[str],
+        vectors: np.ndarray,
+        metadata: Sequence[Dict[str, Any]],
+        dtype: str = "float32",
+        dimensions: Optional[int] = None,
+        keep_full: bool = False,
+    ) -> "LocalVectorIndex":
+        """Build an in-memory index from raw vectors.
+
+        Args:
+            ids: Vector ids
+            vectors: Raw vectors of shape (n, dimension)
+            metadata: Metadata dictionaries
+            dtype: Storage dtype, one of ``SUPPORTED_DTYPES``
+            dimensions: Leading components kept for search, all if None
+            keep_full: Also keep full-dimension float32 vectors for re-ranking
+
+        Returns:
+            LocalVectorIndex: The built index
+
+        Raises:
+            ValueError: If the dtype is unsupported or the inputs disagree in length
+        """
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(f"Unsupported dtype {dtype!r}, expected one of {SUPPORTED_DTYPES}")
+        if not len(ids) == len(vectors) == len(metadata):
+            raise ValueError("ids, vectors and metadata must have the same length")
+
+        normalized = truncate_vectors(vectors, dimensions)
+        full_vectors = normalize_rows(vectors) if keep_full and normalized.shape[1] < np.shape(vectors)[1] else None
+        scales = None
+        if dtype == "int8":
+            scales = np.abs(normalized).max(axis=1) / 127.0
+            scales[scales == 0] = 1.0
+            stored = np.round(normalized / scales[:, None]).astype(np.int8)
+            scales = scales.astype(np.float32)
+        else:
+            stored = normalized.astype(dtype)
+        return cls(list(ids), list(metadata), stored, scales, full_vectors)
+
+    def save(self, directory: str) -> None:
+        """Write the index files to a directory.
+
+        Args:
+            directory: Target directory, created if missing
+        """
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, "vectors.npy"), self.vectors)
+        if self.scales is not None:
+            np.save(os.path.join(directory, "scales.npy"), self.scales)
+        if self.full_vectors is not None:
+            np.save(os.path.join(directory, "full_vectors.npy"), self.full_vectors)
+        with open(os.path.join(directory, "ids.json"), "w") as f:
+            json.dump(self.ids, f)
+        with open(os.path.join(directory, "metadata.json"), "w") as f:
+            json.dump(self.metadata, f)
+        with open(os.path.join(directory, "manifest.json"), "w") as f:
+            json.dump({
+                "dimension": self.dimension,
+                "dtype": str(self.vectors.dtype),
+                "count": len(self.ids),
+                "full_dimension": int(self.full_vectors.shape[1]) if self.full_vectors is not None else None,
+            }, f)
+
+    @classmethod
+    def load(cls, directory: str) -> "LocalVectorIndex":
+        """Load an index directory, memory-mapping the vectors.
+
+        Args:
+            directory: Directory written by ``save``
+
+        Returns:
+            LocalVectorIndex: The loaded index
+        """
+        vectors = np.load(os.path.join(directory, "vectors.npy"), mmap_mode="r")
+        scales_path = os.path.join(directory, "scales.npy")
+        scales = np.load(scales_path) if os.path.exists(scales_path) else None
+        full_path = os.path.join(directory, "full_vectors.npy")
+        full_vectors = np.load(full_path, mmap_mode="r") if os.path.exists(full_path) else None
+        with open(os.path.join(directory, "ids.json")) as f:
+            ids = json.load(f)
+        with open(os.path.join(directory, "metadata.json")) as f:
+            metadata = json.load(f)
+        return cls(ids, metadata, vectors, scales, full_vectors)
+
+    def prepare_query(self, query: np.ndarray) -> np.ndarray:
+        """Truncate a query to the index dimension and normalize it.
+
+        Args:
+            query: Query vector, at least ``dimension`` long
+
+        Returns:
+            np.ndarray: Unit-length float32 query of length ``dimension``
+        """
+        return truncate_vectors(np.asarray(query, dtype=np.float32)[None, :], self.dimension)[0]
+
+    def vectors_for(self, rows: np.ndarray) -> np.ndarray:
+        """Return dequantized float32 vectors for some rows.
+
+        Args:
+            rows: Row positions
+
+        Returns:
+            np.ndarray: float32 matrix of shape (len(rows), dimension)
+        """
+        block = np.asarray(self.vectors[rows], dtype=np.float32)
+        if self.scales is not None:
+            block *= self.scales[rows, None]
+        return block
+
+    def score(self, query: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Compute cosine similarities between a query and stored rows.
+
+        Args:
+            query: Query vector, truncated to the index dimension if longer
+            rows: Row positions to score, all rows if None
+
+        Returns:
+            np.ndarray: float32 scores aligned with ``rows`` (or all rows)
+        """
+        query = self.prepare_query(query)
+        if rows is not None:
+            return self.vectors_for(rows) @ query
+
+        count = len(self.ids)
+        if self.vectors.dtype == np.float32:
+            return np.asarray(self.vectors @ query)
+
+        scores = np.empty(count, dtype=np.float32)
+        for start in range(0, count, SCORE_BLOCK_ROWS):
+            stop = min(start + SCORE_BLOCK_ROWS, count)
+            block = np.asarray(self.vectors[start:stop], dtype=np.float32)
+            scores[start:stop] = block @ query
+        if self.scales is not None:
+            scores *= self.scales
+        return scores
+
+    def search(self, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Find the ``k`` rows most similar to a query.
+
+        Args:
+            query: Query vector, truncated to the index dimension if longer
+            k: Number of results
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Row positions and their scores, best first
+        """
+        scores = self.score(query)
+        rows = top_k(scores, k)
+        return rows, scores[rows]
+
+    def search_rows(self, query: np.ndarray, rows: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Find the ``k`` rows most similar to a query among some rows.
+
+        Used for filtered search: only the eligible rows are scored.
+
+        Args:
+            query: Query vector, truncated to the index dimension if longer
+            rows: Eligible row positions
+            k: Number of results
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Row positions and their scores, best first
+        """
+        scores = self.score(query, rows)
+        best = top_k(scores, k)
+        return rows[best], scores[best]
+
+    def search_many(
+        self, queries: np.ndarray, k: int, rows: Optional[np.ndarray] = None
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Find the ``k`` rows most similar to each of several queries.
+
+        All queries are scored in one pass over the stored vectors, as a
+        matrix product instead of one matrix-vector product per query.
+
+        Args:
+            queries: Query vectors of shape (m, dimension) or longer rows
+            k: Number of results per query
+            rows: Eligible row positions, all rows if None
+
+        Returns:
+            List[Tuple[np.ndarray, np.ndarray]]: Row positions and scores of each query, best first
+        """
+        queries = truncate_vectors(queries, self.dimension)
+        if rows is not None:
+            scores = queries @ self.vectors_for(rows).T
+            results = []
+            for query_scores in scores:
+                best = top_k(query_scores, k)
+                results.append((rows[best], query_scores[best]))
+            return results
+
+        count = len(self.ids)
+        if self.vectors.dtype == np.float32:
+            scores = np.asarray(queries @ self.vectors.T)
+        else:
+            scores = np.empty((len(queries), count), dtype=np.float32)
+            for start in range(0, count, SCORE_BLOCK_ROWS):
+                stop = min(start + SCORE_BLOCK_ROWS, count)
+                scores[:, start:stop] = queries @ np.asarray(self.vectors[start:stop], dtype=np.float32).T
+            if self.scales is not None:
+                scores *= self.scales
+
+        results = []
+        for query_scores in scores:
+            rows = top_k(query_scores, k)
+            results.append((rows, query_scores[rows]))
+        return results
+
+    def rerank(self, query: np.ndarray, rows: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Rescore candidate rows with the full-dimension vectors.
+
+        Without stored full vectors, or with a query shorter than them, the
+        candidates are returned unchanged (cut to ``k``).
+
+        Args:
+            query: Full-dimension query vector
+            rows: Candidate row positions
+            k: Number of results
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Row positions and exact scores, best first
+        """
+        query = np.asarray(query, dtype=np.float32)
+        if self.full_vectors is None or query.shape[0] < self.full_vectors.shape[1] or len(rows) == 0:
+            rows = rows[:k]
+            return rows, self.score(query, rows)
+
+        order = np.argsort(rows)
+        sorted_rows = rows[order]
+        query = normalize_rows(query[None, :self.full_vectors.shape[1]])[0]
+        scores = np.asarray(self.full_vectors[sorted_rows], dtype=np.float32) @ query
+        best = top_k(scores, k)
+        return sorted_rows[best], scores[best]
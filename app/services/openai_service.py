@@ -1,23 +1,49 @@
 """Service for interacting with OpenAI API."""
 
-from openai import OpenAI
+from openai import RateLimitError
+import asyncio
 import logging
-from typing import List, Any
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+from app.core import metrics
 from app.core.config import get_settings
-from app.services.prompts import SystemPrompt, SystemPrompt_Question
+from app.services.clients import get_openai_client
+from app.services.embedding_cache import embedding_cache, embedding_key
+from app.services.rate_limiter import scheduler
+from app.services.prompts import (
+    SystemPrompt,
+    SystemPrompt_Question,
+    SystemPrompt_Version,
+    SystemPrompt_Question_Version,
+)
+from app.utils.cache import CoalescingCache, LRUCache
+from app.utils.data_normalization import normalize_text
 
 # Get settings
 settings = get_settings()
 
-# Initialize OpenAI client
-client = OpenAI(api_key=settings.openai_api_key)
+# Embedding model and per-request limits of the embeddings endpoint
+EMBEDDING_MODEL = "text-embedding-3-large"
+EMBEDDING_MAX_INPUTS = 2048
+EMBEDDING_MAX_TOKENS = 300000
 
+# Completion tokens budgeted per chat call; the prompts ask for short answers
+COMPLETION_TOKEN_ESTIMATE = 400
 
-def create_embeddings(content: str) -> List[float]:
+# Memoized LLM outputs for query expansion and question generation
+expansion_cache = CoalescingCache(
+    LRUCache(max_entries=settings.llm_cache_max_entries, ttl=settings.llm_cache_ttl)
+)
+question_cache = CoalescingCache(
+    LRUCache(max_entries=settings.llm_cache_max_entries, ttl=settings.llm_cache_ttl)
+)
+
+
+async def create_embeddings(content: str) -> List[float]:
     """Generate embeddings using OpenAI API.
     
     This function converts text content into a vector embedding
-    that can be used for semantic search.
+    that can be used for semantic search. Repeated texts are served
+    from the embedding cache.
     
     Args:
         content: The text content to embed
@@ -28,22 +54,176 @@ def create_embeddings(content: str) -> List[float]:
     Raises:
         Exception: If there is an issue generating embeddings
     """
+    return (await create_embeddings_batch([content]))[0]
+
+
+def requested_dimensions() -> Optional[int]:
+    """Return the embedding size to request from the API.
+
+    With ``EMBEDDING_REDUCTION=api`` the API shortens the embeddings itself.
+    In ``local`` mode full embeddings are requested and the vector backend
+    truncates them, which keeps the full query vector for re-ranking.
+
+    Returns:
+        Optional[int]: Number of dimensions to request, None for the full size
+    """
+    if settings.embedding_dimensions and settings.embedding_reduction == "api":
+        return settings.embedding_dimensions
+    return None
+
+
+def estimate_tokens(content: str) -> int:
+    """Conservatively estimate the token count of a text.
+
+    English text averages about four bytes per token, so counting one token
+    per three bytes over-estimates and keeps batches under the limit.
+
+    Args:
+        content: The text to measure
+
+    Returns:
+        int: Estimated number of tokens
+    """
+    return len(content.encode("utf-8")) // 3 + 1
+
+
+async def scheduled_call(
+    model: str, tokens: int, request: Callable[[], Awaitable[Any]], max_wait: Optional[float] = None
+) -> Any:
+    """Make an OpenAI call once the rate-limit scheduler grants budget for it.
+
+    The rate-limit headers of the response (or of a final 429) update the
+    model's budget.
+
+    Args:
+        model: Model the call uses
+        tokens: Estimated tokens of the call
+        request: Zero-argument coroutine function making a ``with_raw_response`` call
+        max_wait: Seconds to wait for budget before giving up, no limit if None
+
+    Returns:
+        Any: The parsed API response
+
+    Raises:
+        LoadShed: If no budget was granted within ``max_wait``
+    """
+    with metrics.stage("openai_queue"):
+        await scheduler.acquire(model, tokens, max_wait)
     try:
-        response = client.embeddings.create(
-            model="text-embedding-3-large",
-            input=content
+        with metrics.dependency("openai", model):
+            raw = await request()
+    except RateLimitError as e:
+        scheduler.throttle(model, e.response.headers)
+        raise
+    scheduler.observe(model, raw.headers)
+    return raw.parse()
+
+
+def split_embedding_batches(contents: List[str]) -> List[List[int]]:
+    """Split texts into batches that respect the embeddings request limits.
+
+    Args:
+        contents: Texts to embed
+
+    Returns:
+        List[List[int]]: Positions of the texts in each batch, in order
+    """
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_tokens = 0
+    for position, content in enumerate(contents):
+        tokens = estimate_tokens(content)
+        if current and (len(current) >= EMBEDDING_MAX_INPUTS or current_tokens + tokens > EMBEDDING_MAX_TOKENS):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(position)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+async def create_embeddings_batch(contents: List[str]) -> List[List[float]]:
+    """Generate embeddings for several texts with as few API calls as possible.
+
+    Texts already in the embedding cache are not sent. The remaining ones are
+    deduplicated, split only where the provider's input count or token limits
+    require it, and the batches are sent concurrently.
+
+    Args:
+        contents: The text contents to embed
+
+    Returns:
+        List[List[float]]: Vector embeddings in the same order as ``contents``
+
+    Raises:
+        Exception: If there is an issue generating embeddings
+    """
+    if not contents:
+        return []
+
+    dimensions = requested_dimensions()
+    model_key = f"{EMBEDDING_MODEL}@{dimensions}" if dimensions else EMBEDDING_MODEL
+    keys = [embedding_key(model_key, content) for content in contents]
+    vectors = await embedding_cache.get_many(list(dict.fromkeys(keys)))
+    uncached = {key: content for key, content in zip(keys, contents) if key not in vectors}
+    if not uncached:
+        return [vectors[key] for key in keys]
+
+    uncached_keys = list(uncached)
+    uncached_contents = list(uncached.values())
+
+    async def embed_batch(positions: List[int]) -> List[List[float]]:
+        inputs = [uncached_contents[p] for p in positions]
+        response = await scheduled_call(
+            EMBEDDING_MODEL,
+            sum(estimate_tokens(content) for content in inputs),
+            lambda: get_openai_client().embeddings.with_raw_response.create(
+                model=EMBEDDING_MODEL,
+                input=inputs,
+                timeout=settings.embedding_timeout,
+                **({"dimensions": dimensions} if dimensions else {})
+            ),
         )
-        return response.data[0].embedding
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+    try:
+        batches = split_embedding_batches(uncached_contents)
+        batch_vectors = await asyncio.gather(*(embed_batch(b) for b in batches))
+        fetched = {}
+        for positions, embeddings in zip(batches, batch_vectors):
+            for position, embedding in zip(positions, embeddings):
+                fetched[uncached_keys[position]] = embedding
+        await embedding_cache.set_many(fetched)
+        vectors.update(fetched)
+        return [vectors[key] for key in keys]
     except Exception as e:
-        logging.error(f"Error generating embeddings: {e}")
+        logging.error(f"Error generating batch embeddings: {e}")
         raise
 
 
-def explain_user_query(query: str) -> str:
+def _completion_key(prompt_version: str, model: str, temperature: Optional[float], query: str) -> Tuple:
+    """Build the LLM cache key for a completion.
+
+    Args:
+        prompt_version: Version stamp of the system prompt
+        model: Chat model name
+        temperature: Sampling temperature, None for the API default
+        query: The user query
+
+    Returns:
+        Tuple: Key combining prompt version, model, temperature and normalized query
+    """
+    return (prompt_version, model, temperature, normalize_text(query))
+
+
+async def explain_user_query(query: str) -> str:
     """Refine user query using OpenAI's GPT model.
     
     This function enhances the user's query by generating a more detailed
-    and focused description to improve search quality.
+    and focused description to improve search quality. Expansions are
+    memoized, and concurrent identical queries share one completion. When
+    the rate-limit budget is exhausted the original query is used.
     
     Args:
         query: The original user query
@@ -54,29 +234,43 @@ def explain_user_query(query: str) -> str:
     Raises:
         Exception: If there is an issue with the OpenAI API
     """
-    try:
+    model = "gpt-4o-mini"
+    temperature = 0.0 if settings.llm_cache_pin_temperature else 0.9
+
+    async def complete() -> str:
         messages = [
             {"role": "system", "content": SystemPrompt},
             {"role": "user", "content": query}
         ]
         
-        response = client.chat.completions.create(
-            messages=messages,
-            model="gpt-4o-mini",
-            temperature=0.9
+        response = await scheduled_call(
+            model,
+            estimate_tokens(SystemPrompt + query) + COMPLETION_TOKEN_ESTIMATE,
+            lambda: get_openai_client().chat.completions.with_raw_response.create(
+                messages=messages,
+                model=model,
+                temperature=temperature
+            ),
+            max_wait=settings.rate_limit_max_wait,
         )
         return response.choices[0].message.content
+
+    try:
+        key = _completion_key(SystemPrompt_Version, model, temperature, query)
+        return await expansion_cache.get_or_compute(key, complete)
     except Exception as e:
         logging.error(f"Error explaining user query: {e}")
         # Fall back to original query if the API call fails
         return query
 
 
-def deep_question(query: str) -> List[str]:
+async def deep_question(query: str) -> List[str]:
     """Generate research questions based on the query.
     
     This function creates multiple related questions to broaden
-    the search and find more relevant results.
+    the search and find more relevant results. Generated questions are
+    memoized, and concurrent identical queries share one completion. When
+    the rate-limit budget is exhausted the original query is used alone.
     
     Args:
         query: The original user query
@@ -87,19 +281,32 @@ def deep_question(query: str) -> List[str]:
     Raises:
         Exception: If there is an issue with the OpenAI API
     """
-    try:
+    model = "gpt-4o"
+    temperature = 0.0 if settings.llm_cache_pin_temperature else None
+
+    async def complete() -> List[str]:
         messages = [
             {"role": "system", "content": SystemPrompt_Question},
             {"role": "user", "content": query}
         ]
         
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=messages
+        response = await scheduled_call(
+            model,
+            estimate_tokens(SystemPrompt_Question + query) + COMPLETION_TOKEN_ESTIMATE,
+            lambda: get_openai_client().chat.completions.with_raw_response.create(
+                model=model,
+                messages=messages,
+                **({"temperature": temperature} if temperature is not None else {})
+            ),
+            max_wait=settings.rate_limit_max_wait,
         )
         
         return response.choices[0].message.content.split("\n")
+
+    try:
+        key = _completion_key(SystemPrompt_Question_Version, model, temperature, query)
+        return list(await question_cache.get_or_compute(key, complete))
     except Exception as e:
         logging.error(f"Error generating deep questions: {e}")
         # Fall back to just the original query
-        return [query] 
\ No newline at end of file
+        return [query]
@@ -0,0 +1,184 @@
+"""Stateless cursors for paginated search.
+
+A paginated search ranks the top ``RESULT_WINDOW_SIZE`` results once and
+returns them a page at a time. The cursor of the next page carries the
+rest of that ranking, as ids and scores, signed with ``CURSOR_SECRET``.
+Any worker or instance serves a later page by slicing the cursor and
+filling in the metadata of the page's companies, so pages never rerun the
+search pipeline and never repeat or skip a company, whichever process
+serves them.
+
+Cursors expire after ``RESULT_WINDOW_TTL`` seconds and when the index
+version changes, which bounds how stale a page can be.
+"""
+
+import base64
+import binascii
+import hashlib
+import hmac
+import secrets
+import time
+import zlib
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+
+from app.core.config import get_settings
+
+# Get settings
+settings = get_settings()
+
+# Must be set when several workers or instances serve the API. Generated when
+# unset: preloaded gunicorn workers inherit it from the master, but cursors
+# then fail on other instances, on workers that import the app themselves
+# (uvicorn --workers) and after a restart
+_secret = (settings.cursor_secret or secrets.token_hex(32)).encode()
+
+# Bytes of HMAC-SHA256 kept in a cursor
+SIGNATURE_BYTES = 16
+
+
+class InvalidCursor(ValueError):
+    """Raised for a cursor that was not issued by this server for this endpoint."""
+
+
+class CursorExpired(Exception):
+    """Raised when a cursor is too old to be served."""
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """Position in the ranked results of a paginated search.
+
+    Attributes:
+        endpoint: Endpoint that issued the cursor
+        index_version: Index version the ranking was computed against
+        offset: Position of the next page's first result
+        issued_at: Unix time the first page was served
+        window: Ids and scores of the ranked results from ``offset`` on
+    """
+    endpoint: str
+    index_version: str = ""
+    offset: int = 0
+    issued_at: float = 0.0
+    window: List[Tuple[str, float]] = field(default_factory=list)
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(payload: bytes) -> bytes:
+    return hmac.new(_secret, payload, hashlib.sha256).digest()[:SIGNATURE_BYTES]
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    """Serialize, compress and sign a cursor.
+
+    Args:
+        cursor: The cursor
+
+    Returns:
+        str: URL-safe ``<payload>.<signature>`` token
+    """
+    payload = zlib.compress(orjson.dumps([
+        cursor.endpoint, cursor.index_version, cursor.offset, cursor.issued_at, cursor.window,
+    ]))
+    return f"{_b64encode(payload)}.{_b64encode(_sign(payload))}"
+
+
+def decode_cursor(token: str, endpoint: str, index_version: str) -> Cursor:
+    """Verify a cursor and check that it can still be served.
+
+    Args:
+        token: Cursor returned with a previous page
+        endpoint: Endpoint receiving the cursor
+        index_version: Current index version
+
+    Returns:
+        Cursor: The decoded cursor
+
+    Raises:
+        InvalidCursor: If the cursor is malformed, tampered with or issued by another endpoint
+        CursorExpired: If the cursor is older than ``RESULT_WINDOW_TTL`` or the index changed
+    """
+    try:
+        encoded_payload, encoded_signature = token.split(".")
+        payload = _b64decode(encoded_payload)
+        signature = _b64decode(encoded_signature)
+    except (binascii.Error, ValueError):
+        raise InvalidCursor(f"Malformed cursor {token[:32]!r}")
+    # Only signed payloads are decompressed
+    if not hmac.compare_digest(signature, _sign(payload)):
+        raise InvalidCursor(f"Malformed cursor {token[:32]!r}")
+    try:
+        issuer, version, offset, issued_at, window = orjson.loads(zlib.decompress(payload))
+        cursor = Cursor(issuer, version, offset, issued_at, [(str(key), float(score)) for key, score in window])
+    except (zlib.error, orjson.JSONDecodeError, TypeError, ValueError):
+        raise InvalidCursor(f"Malformed cursor {token[:32]!r}")
+
+    if cursor.endpoint != endpoint:
+        raise InvalidCursor(f"Cursor was issued by /{cursor.endpoint}")
+    if time.time() - cursor.issued_at > settings.result_window_ttl or cursor.index_version != index_version:
+        raise CursorExpired("Result window expired, repeat the search without a cursor")
+    return cursor
+
+
+def page_size(limit: int) -> int:
+    """Clamp a requested page size to the result window.
+
+    Args:
+        limit: Requested number of results
+
+    Returns:
+        int: Page size between 1 and ``RESULT_WINDOW_SIZE``
+    """
+    return max(1, min(limit, settings.result_window_size))
+
+
+def _following(cursor: Cursor, size: int, rest: List[Tuple[str, float]]) -> Optional[str]:
+    """Encode the cursor of the page after one of ``size`` results, None on the last page."""
+    if not rest:
+        return None
+    return encode_cursor(replace(cursor, offset=cursor.offset + size, window=rest))
+
+
+def first_page(
+    results: List[Dict[str, Any]], cursor: Cursor, limit: int
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Return the first page of a ranking and the cursor of the next one.
+
+    The next cursor carries the ids and scores of the rest of the ranking.
+
+    Args:
+        results: Full ranked results
+        cursor: Cursor of the first page, with the endpoint and index version
+        limit: Page size
+
+    Returns:
+        Tuple[List[Dict[str, Any]], Optional[str]]: The page and the cursor of the next one, if any
+    """
+    cursor = replace(cursor, issued_at=time.time())
+    size = page_size(limit)
+    rest = [(item["id"], item["score"]) for item in results[size:]]
+    return results[:size], _following(cursor, size, rest)
+
+
+def next_page(cursor: Cursor, limit: int) -> Tuple[List[Tuple[str, float]], Optional[str]]:
+    """Return the ids and scores of the page a cursor points to.
+
+    Args:
+        cursor: Cursor returned with the previous page
+        limit: Page size
+
+    Returns:
+        Tuple[List[Tuple[str, float]], Optional[str]]: Ids and scores of the page,
+            and the cursor of the next one, if any
+    """
+    size = page_size(limit)
+    return cursor.window[:size], _following(cursor, size, cursor.window[size:])
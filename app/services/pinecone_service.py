@@ -2,20 +2,56 @@
 
 from pinecone import Pinecone
 import os
+import asyncio
 import logging
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, lru_cache
+from typing import Any, Callable, Dict, List, Optional
 from app.core.config import get_settings
+from app.core.metrics import dependency
+from app.utils.retry import retry_async
 
 
 # Get settings
 settings = get_settings()
 
-# Initialize Pinecone client
-pc = Pinecone(api_key=settings.pinecone_api_key)
 
+@lru_cache()
+def get_client() -> Pinecone:
+    """Get the shared Pinecone client.
+    
+    The client is created on first use, so deployments running the local
+    vector backend do not need Pinecone credentials.
+    
+    Returns:
+        Pinecone: Initialized Pinecone client
+    """
+    return Pinecone(api_key=settings.pinecone_api_key)
+
+
+# The Pinecone client is synchronous, so queries run on a dedicated pool
+# instead of blocking the event loop
+query_executor = ThreadPoolExecutor(
+    max_workers=settings.pinecone_query_threads,
+    thread_name_prefix="pinecone-query"
+)
+
+# Free threads of query_executor. A slot is held until the blocking call
+# returns, even when the awaiting attempt timed out, so retries wait for a
+# thread instead of queuing behind abandoned calls
+query_slots = asyncio.Semaphore(settings.pinecone_query_threads)
 
+# Per-request timeout of the Pinecone client: (connect, read) seconds. It
+# ends the blocking call itself, which the per-attempt timeout cannot do
+REQUEST_TIMEOUT = (settings.connect_timeout, settings.pinecone_timeout)
+
+
+@lru_cache()
 def get_index():
-    """Retrieve the Pinecone index.
+    """Retrieve the shared Pinecone index handle.
+    
+    The handle owns a keep-alive connection pool sized to the query thread
+    pool, so it is created once and reused by every query.
     
     Returns:
         Pinecone.Index: The initialized Pinecone index
@@ -24,22 +60,70 @@ def get_index():
         Exception: If there is an issue connecting to Pinecone
     """
     try:
-        return pc.Index(host=settings.pinecone_host_url)
+        return get_client().Index(
+            host=settings.pinecone_host_url,
+            pool_threads=settings.pinecone_query_threads,
+            connection_pool_maxsize=settings.pinecone_query_threads,
+        )
     except Exception as e:
         logging.error(f"Error connecting to Pinecone: {e}")
         raise
 
 
-def query_index(index, query_vector: List[float], number_of_results: int = 10) -> List[Dict[str, Any]]:
+async def run_blocking(call: Callable[[], Any]) -> Any:
+    """Run a blocking client call on ``query_executor``.
+
+    Waits for a free slot of ``query_slots`` first, so at most
+    ``PINECONE_QUERY_THREADS`` calls are in flight, and frees it once the
+    call has returned in its thread.
+
+    Args:
+        call: Zero-argument blocking function
+
+    Returns:
+        Any: Result of the call
+    """
+    await query_slots.acquire()
+    loop = asyncio.get_running_loop()
+
+    def release(_) -> None:
+        try:
+            loop.call_soon_threadsafe(query_slots.release)
+        except RuntimeError:
+            # The event loop is closed, nobody waits for the slot anymore
+            pass
+
+    try:
+        future = query_executor.submit(call)
+    except BaseException:
+        query_slots.release()
+        raise
+    future.add_done_callback(release)
+    return await asyncio.wrap_future(future)
+
+
+async def query_index(
+    index,
+    query_vector: List[float],
+    number_of_results: int = 10,
+    include_metadata: bool = True,
+    metadata_filter: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
     """Query Pinecone index with the provided vector.
     
     This function performs a similarity search against the Pinecone vector database
-    to find the most similar vectors to the query vector.
+    to find the most similar vectors to the query vector. The blocking client call
+    is dispatched to ``query_executor`` so the event loop stays free. Each attempt
+    is bounded by ``PINECONE_TIMEOUT``, which is also the client's request timeout
+    so a timed out call releases its thread; rate-limited, failed (5xx) and timed
+    out attempts are retried with jittered exponential backoff.
     
     Args:
         index: The Pinecone index to query
         query_vector: Vector embedding of the query
         number_of_results: Number of results to return
+        include_metadata: Whether to return the metadata stored with each vector
+        metadata_filter: Pinecone metadata filter restricting the eligible vectors
     
     Returns:
         List of matching documents with their similarity scores and metadata
@@ -48,17 +132,105 @@ def query_index(index, query_vector: List[float], number_of_results: int = 10) -
         Exception: If there is an issue querying the index
     """
     try:
-        response = index.query_namespaces(
+        query = partial(
+            index.query_namespaces,
             vector=query_vector,
             namespaces=[""],  # Search in the default namespace
             metric="cosine",
             top_k=number_of_results,
+            filter=metadata_filter,
             include_values=False,
-            include_metadata=True,
+            include_metadata=include_metadata,
             show_progress=False,
+            _request_timeout=REQUEST_TIMEOUT,
         )
+        with dependency("pinecone", "query"):
+            response = await retry_async(
+                lambda: run_blocking(query),
+                attempts=settings.pinecone_max_retries,
+                base_delay=settings.retry_base_delay,
+                max_delay=settings.retry_max_delay,
+                timeout=settings.pinecone_timeout,
+                name="Pinecone query",
+            )
         
         return response.matches if hasattr(response, 'matches') else response.get("matches", response)
     except Exception as e:
         logging.error(f"Error querying Pinecone index: {e}")
-        raise 
\ No newline at end of file
+        raise 
+
+
+async def fetch_vectors(index, ids: List[str]) -> Dict[str, List[float]]:
+    """Fetch the stored vectors of some ids.
+    
+    Runs on ``query_executor`` with the same timeout and retries as
+    ``query_index``.
+    
+    Args:
+        index: The Pinecone index to fetch from
+        ids: Vector ids
+    
+    Returns:
+        Dict[str, List[float]]: Vector values by id; unknown ids are missing
+        
+    Raises:
+        Exception: If there is an issue fetching from the index
+    """
+    try:
+        fetch = partial(index.fetch, ids=ids, _request_timeout=REQUEST_TIMEOUT)
+        with dependency("pinecone", "fetch"):
+            response = await retry_async(
+                lambda: run_blocking(fetch),
+                attempts=settings.pinecone_max_retries,
+                base_delay=settings.retry_base_delay,
+                max_delay=settings.retry_max_delay,
+                timeout=settings.pinecone_timeout,
+                name="Pinecone fetch",
+            )
+        
+        vectors = response.vectors if hasattr(response, 'vectors') else response.get("vectors", {})
+        return {
+            vector_id: vector.values if hasattr(vector, 'values') else vector["values"]
+            for vector_id, vector in vectors.items()
+        }
+    except Exception as e:
+        logging.error(f"Error fetching Pinecone vectors: {e}")
+        raise
+
+
+async def fetch_metadata(index, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Fetch the metadata stored with some ids.
+    
+    Runs on ``query_executor`` with the same timeout and retries as
+    ``query_index``.
+    
+    Args:
+        index: The Pinecone index to fetch from
+        ids: Vector ids
+    
+    Returns:
+        Dict[str, Dict[str, Any]]: Metadata by id; unknown ids are missing
+        
+    Raises:
+        Exception: If there is an issue fetching from the index
+    """
+    try:
+        fetch = partial(index.fetch, ids=ids, _request_timeout=REQUEST_TIMEOUT)
+        with dependency("pinecone", "fetch"):
+            response = await retry_async(
+                lambda: run_blocking(fetch),
+                attempts=settings.pinecone_max_retries,
+                base_delay=settings.retry_base_delay,
+                max_delay=settings.retry_max_delay,
+                timeout=settings.pinecone_timeout,
+                name="Pinecone fetch",
+            )
+        
+        vectors = response.vectors if hasattr(response, 'vectors') else response.get("vectors", {})
+        return {
+            vector_id: dict((vector.metadata if hasattr(vector, 'metadata') else vector.get("metadata")) or {})
+            for vector_id, vector in vectors.items()
+        }
+    except Exception as e:
+        logging.error(f"Error fetching Pinecone metadata: {e}")
+        raise
@@ -1,9 +1,25 @@
 """Prompt templates for OpenAI API interactions."""
 
+import hashlib
 from pydantic import BaseModel
 from typing import List
 
 
+def prompt_version(prompt: str) -> str:
+    """Derive a short version stamp from a prompt's text.
+
+    Cached LLM outputs are keyed by this stamp, so editing a prompt
+    automatically stops serving answers produced by the old wording.
+
+    Args:
+        prompt: The prompt text
+
+    Returns:
+        str: First 12 hex characters of the prompt's SHA-256 digest
+    """
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:12]
+
+
 class QuestionGeneration(BaseModel):
     """Schema for question generation response.
     
@@ -44,4 +60,9 @@ Your writing should be clear, engaging, and in the tone of Paul Graham—direct,
 
 **Output Example**: "a company passionately driven to make the world sustainable by integrating cutting-edge technology into everyday life. Their mission is simple yet powerful: to reduce carbon footprints globally. Leveraging a multi-faceted tech stack that includes AI-driven solutions and IoT devices, they are continuously innovating to create more sustainable practices. It's all about impact here—transforming our planet for the better, one tech solution at a time."
 
-(Note: The output should be tailored according to the specific company's mission and tech stack, ensuring it reflects the tone and style specified above.)""" 
\ No newline at end of file
+(Note: The output should be tailored according to the specific company's mission and tech stack, ensuring it reflects the tone and style specified above.)""" 
+
+
+# Version stamps of the prompts above, used as part of LLM cache keys
+SystemPrompt_Version = prompt_version(SystemPrompt)
+SystemPrompt_Question_Version = prompt_version(SystemPrompt_Question)
@@ -0,0 +1,164 @@
+"""Per-query choice of the search path.
+
+The LLM expansion is most of the single-query search latency, but it only
+helps vague, descriptive queries. Each query is routed to one of:
+- ``lookup``: the query names a company, found in the lexical index (or,
+  without the company catalog, by a MongoDB name lookup); it is listed first,
+  above the results of the ``direct`` route, with no LLM call
+- ``direct``: a short keyword query; embed it as typed, skipping the LLM
+- ``expand``: anything longer or phrased as a question; expand it with the
+  LLM before embedding, as before
+
+Decisions use cheap heuristics and are cached per normalized query,
+filters and catalog version, since the lexical hits they rest on are
+filtered. Per-route counts and latencies are reported on ``/stats``.
+"""
+
+import logging
+import re
+from typing import Any, Dict, List, Optional
+
+from app.core.config import get_settings
+from app.core.metrics import ROUTE_SECONDS
+from app.db.catalog import catalog, company_metadata
+from app.db.company_data import convert_objectid, find_company_by_name
+from app.services.filters import filter_key, matches
+from app.services.lexical_index import is_decisive, tokenize
+from app.utils.cache import LRUCache
+from app.utils.data_normalization import normalize_text
+
+# Get settings
+settings = get_settings()
+
+LOOKUP = "lookup"
+DIRECT = "direct"
+EXPAND = "expand"
+ROUTES = (LOOKUP, DIRECT, EXPAND)
+
+# Words that mark a descriptive query rather than a company name
+_DESCRIPTIVE = re.compile(
+    r"\b(who|what|which|where|when|why|how|startups?|compan(y|ies)|like|similar|that|for|with|using|building)\b"
+)
+
+# Routing decisions by normalized query and catalog version
+decision_cache = LRUCache(max_entries=settings.router_cache_max_entries)
+
+
+class RouteStats:
+    """Request counts and latency per route.
+
+    Attributes:
+        counts: Requests served by each route
+        seconds: Total latency of each route
+        max_seconds: Slowest request of each route
+    """
+
+    def __init__(self):
+        """Initialize empty counters."""
+        self.counts = {route: 0 for route in ROUTES}
+        self.seconds = {route: 0.0 for route in ROUTES}
+        self.max_seconds = {route: 0.0 for route in ROUTES}
+
+    def record(self, route: str, seconds: float) -> None:
+        """Record one request.
+
+        Args:
+            route: Route that served the request
+            seconds: Request latency
+        """
+        self.counts[route] += 1
+        self.seconds[route] += seconds
+        self.max_seconds[route] = max(self.max_seconds[route], seconds)
+        ROUTE_SECONDS.labels(route).observe(seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the per-route counters.
+
+        Returns:
+            Dict[str, Any]: Count, mean and max latency in milliseconds per route
+        """
+        return {
+            route: {
+                "count": self.counts[route],
+                "mean_ms": 1000 * self.seconds[route] / self.counts[route] if self.counts[route] else 0.0,
+                "max_ms": 1000 * self.max_seconds[route],
+            }
+            for route in ROUTES
+        }
+
+
+route_stats = RouteStats()
+
+
+def _decision_key(query: str, filters: Optional[Dict[str, Any]]) -> tuple:
+    return (normalize_text(query), filter_key(filters), catalog.version)
+
+
+def classify(query: str, lexical: List[Dict[str, Any]], filters: Optional[Dict[str, Any]] = None) -> str:
+    """Choose the search path for a query.
+
+    Args:
+        query: The user query
+        lexical: Lexical hits for the query, empty without the catalog
+        filters: Search filters the lexical hits were restricted by
+
+    Returns:
+        str: ``lookup``, ``direct`` or ``expand``
+    """
+    if not settings.query_router:
+        return EXPAND
+    key = _decision_key(query, filters)
+    route = decision_cache.get(key)
+    if route is not None:
+        return route
+
+    words = tokenize(query)
+    descriptive = "?" in query or _DESCRIPTIVE.search(key[0]) is not None
+    if is_decisive(query, lexical):
+        route = LOOKUP
+    elif not catalog.ready and not descriptive and 0 < len(words) <= 3:
+        # Might be a name; without the catalog only MongoDB can tell
+        route = LOOKUP
+    elif not descriptive and len(words) <= settings.router_direct_max_words:
+        route = DIRECT
+    else:
+        route = EXPAND
+    decision_cache.set(key, route)
+    return route
+
+
+async def lookup(
+    query: str,
+    lexical: List[Dict[str, Any]],
+    filters: Optional[Dict[str, Any]] = None,
+) -> Optional[Dict[str, Any]]:
+    """Find the company a ``lookup`` query names, without the LLM.
+
+    Uses the top lexical hit when it is decisive, otherwise an exact slug
+    or name lookup in MongoDB. A query that finds nothing is re-routed to
+    ``direct`` for next time.
+
+    Args:
+        query: The user query
+        lexical: Lexical hits for the query, already filtered
+        filters: Search filters; a named company outside them finds nothing
+
+    Returns:
+        Optional[Dict[str, Any]]: The company as a result with id, score and
+            metadata, or None if the query names no company
+    """
+    if is_decisive(query, lexical):
+        return lexical[0]
+
+    try:
+        doc = await find_company_by_name(query)
+    except Exception as e:
+        logging.error(f"Error in name lookup for query routing: {e}")
+        return None
+    if doc is None or doc.get(settings.company_key_field) is None:
+        decision_cache.set(_decision_key(query, filters), DIRECT)
+        return None
+    doc = convert_objectid(doc)
+    if not matches(doc, filters):
+        return None
+    return {"id": str(doc[settings.company_key_field]), "score": 1.0, "metadata": company_metadata(doc)}
@@ -0,0 +1,335 @@
+"""Process-wide scheduler for outbound OpenAI calls.
+
+OpenAI enforces requests-per-minute and tokens-per-minute limits per model.
+Instead of firing every call and handling 429s after the fact, each call
+first acquires capacity from a per-model budget that refills continuously
+and is corrected from the ``x-ratelimit-*`` headers of every response.
+
+Calls that cannot start immediately wait in a priority queue: interactive
+searches go before deep research, which marks its calls with the
+``background`` priority. Calls that can be skipped (LLM query expansion,
+question generation) give up with ``LoadShed`` after ``RATE_LIMIT_MAX_WAIT``
+seconds so callers degrade, e.g. by searching the unexpanded query.
+
+Limits come from ``OPENAI_RPM``/``OPENAI_TPM`` until the first response
+reports the real ones; with neither, a model is not throttled.
+"""
+
+import asyncio
+import heapq
+import itertools
+import re
+import time
+from contextvars import ContextVar
+from typing import Any, Awaitable, Dict, List, Mapping, Optional
+
+from app.core.config import get_settings
+from app.core.metrics import SHED_CALLS
+
+# Get settings
+settings = get_settings()
+
+INTERACTIVE = 0
+BACKGROUND = 1
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BACKGROUND: "background"}
+
+# Priority of the outbound calls made by the current request
+request_priority: ContextVar[int] = ContextVar("request_priority", default=INTERACTIVE)
+
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+class LoadShed(Exception):
+    """Raised when a call waited too long for rate-limit capacity."""
+
+
+def parse_duration(value: Optional[str]) -> float:
+    """Parse a rate-limit reset duration such as ``"6m0s"`` or ``"20ms"``.
+
+    Args:
+        value: Duration header value, or plain seconds
+
+    Returns:
+        float: Duration in seconds, 0 if missing or unparseable
+    """
+    if not value:
+        return 0.0
+    try:
+        return float(value)
+    except ValueError:
+        return sum(float(amount) * _UNITS[unit] for amount, unit in _DURATION.findall(value))
+
+
+async def with_priority(priority: int, awaitable: Awaitable[Any]) -> Any:
+    """Await something with the outbound calls it makes at a given priority.
+
+    Args:
+        priority: ``INTERACTIVE`` or ``BACKGROUND``
+        awaitable: Coroutine to run
+
+    Returns:
+        Any: Result of the awaitable
+    """
+    token = request_priority.set(priority)
+    try:
+        return await awaitable
+    finally:
+        request_priority.reset(token)
+
+
+class RateBucket:
+    """Continuously refilling request and token budget of one model.
+
+    Attributes:
+        request_limit: Requests per minute, 0 if unknown
+        token_limit: Tokens per minute, 0 if unknown
+        requests: Requests available now
+        tokens: Tokens available now
+    """
+
+    def __init__(self, request_limit: int, token_limit: int):
+        """Start with a full budget.
+
+        Args:
+            request_limit: Requests per minute, 0 if unknown
+            token_limit: Tokens per minute, 0 if unknown
+        """
+        self.request_limit = request_limit
+        self.token_limit = token_limit
+        self.requests = float(request_limit)
+        self.tokens = float(token_limit)
+        self.blocked_until = 0.0
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self.updated
+        self.updated = now
+        if self.request_limit:
+            self.requests = min(self.request_limit, self.requests + elapsed * self.request_limit / 60)
+        if self.token_limit:
+            self.tokens = min(self.token_limit, self.tokens + elapsed * self.token_limit / 60)
+
+    def wait_time(self, tokens: int) -> float:
+        """Return the seconds until a call of ``tokens`` fits the budget.
+
+        Args:
+            tokens: Estimated tokens of the call
+
+        Returns:
+            float: Seconds to wait, 0 if it fits now
+        """
+        now = time.monotonic()
+        self._refill(now)
+        wait = max(0.0, self.blocked_until - now)
+        if self.request_limit and self.requests < 1:
+            wait = max(wait, (1 - self.requests) * 60 / self.request_limit)
+        if self.token_limit:
+            needed = min(tokens, self.token_limit)
+            if self.tokens < needed:
+                wait = max(wait, (needed - self.tokens) * 60 / self.token_limit)
+        return wait
+
+    def try_take(self, tokens: int) -> bool:
+        """Take budget for a call if it fits now.
+
+        Args:
+            tokens: Estimated tokens of the call
+
+        Returns:
+            bool: True if the budget was taken
+        """
+        if self.wait_time(tokens) > 0:
+            return False
+        if self.request_limit:
+            self.requests -= 1
+        if self.token_limit:
+            self.tokens -= tokens
+        return True
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """Adopt the limits and remaining budget reported by the API.
+
+        Args:
+            headers: Response headers
+        """
+        self._refill(time.monotonic())
+        for field, limit_header, remaining_header in (
+            ("request", "x-ratelimit-limit-requests", "x-ratelimit-remaining-requests"),
+            ("token", "x-ratelimit-limit-tokens", "x-ratelimit-remaining-tokens"),
+        ):
+            try:
+                limit = int(headers[limit_header])
+                remaining = float(headers[remaining_header])
+            except (KeyError, TypeError, ValueError):
+                continue
+            setattr(self, f"{field}_limit", limit)
+            setattr(self, f"{field}s", remaining)
+
+    def block(self, seconds: float) -> None:
+        """Stop granting budget for a while, e.g. after a 429.
+
+        Args:
+            seconds: Seconds to block
+        """
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+class RateLimitScheduler:
+    """Priority queue of outbound calls waiting for per-model budget.
+
+    Attributes:
+        granted: Calls granted budget
+        shed: Calls that gave up waiting
+        waited: Calls that had to queue
+        wait_seconds: Total queueing time of granted calls
+        max_wait_seconds: Longest queueing time of a granted call
+    """
+
+    def __init__(self, request_limit: int, token_limit: int):
+        """Initialize with default limits for models not yet seen.
+
+        Args:
+            request_limit: Default requests per minute, 0 if unknown
+            token_limit: Default tokens per minute, 0 if unknown
+        """
+        self.request_limit = request_limit
+        self.token_limit = token_limit
+        self.buckets: Dict[str, RateBucket] = {}
+        self.queues: Dict[str, List[list]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._sequence = itertools.count()
+        self.granted = 0
+        self.shed = 0
+        self.waited = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def bucket(self, model: str) -> RateBucket:
+        """Get the budget of a model.
+
+        Args:
+            model: Model name
+
+        Returns:
+            RateBucket: The model's budget
+        """
+        if model not in self.buckets:
+            self.buckets[model] = RateBucket(self.request_limit, self.token_limit)
+        return self.buckets[model]
+
+    async def acquire(self, model: str, tokens: int, max_wait: Optional[float] = None) -> None:
+        """Wait for budget for one call at the current request's priority.
+
+        Args:
+            model: Model the call uses
+            tokens: Estimated prompt plus completion tokens
+            max_wait: Seconds to wait before giving up, no limit if None
+
+        Raises:
+            LoadShed: If no budget was granted within ``max_wait``
+        """
+        bucket = self.bucket(model)
+        queue = self.queues.setdefault(model, [])
+        if not any(not entry[3].done() for entry in queue) and bucket.try_take(tokens):
+            self.granted += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(queue, [request_priority.get(), next(self._sequence), tokens, future])
+        self._pump(model)
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(future, timeout=max_wait)
+        except asyncio.TimeoutError:
+            self.shed += 1
+            SHED_CALLS.labels(model).inc()
+            raise LoadShed(f"No {model} rate-limit budget within {max_wait}s")
+
+        waited = time.monotonic() - started
+        self.granted += 1
+        self.waited += 1
+        self.wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def observe(self, model: str, headers: Mapping[str, str]) -> None:
+        """Update a model's budget from response headers.
+
+        Args:
+            model: Model the call used
+            headers: Response headers
+        """
+        self.bucket(model).update(headers)
+        self._pump(model)
+
+    def throttle(self, model: str, headers: Optional[Mapping[str, str]] = None) -> None:
+        """Pause a model's budget after a rate-limit (429) response.
+
+        Args:
+            model: Model the call used
+            headers: Headers of the 429 response, if any
+        """
+        headers = headers or {}
+        bucket = self.bucket(model)
+        bucket.update(headers)
+        bucket.block(parse_duration(headers.get("retry-after")) or max(
+            parse_duration(headers.get("x-ratelimit-reset-requests")),
+            parse_duration(headers.get("x-ratelimit-reset-tokens")),
+            1.0,
+        ))
+        self._pump(model)
+
+    def _pump(self, model: str) -> None:
+        queue = self.queues.get(model, [])
+        bucket = self.bucket(model)
+        while queue:
+            _, _, tokens, future = queue[0]
+            if future.done():
+                heapq.heappop(queue)
+            elif bucket.try_take(tokens):
+                heapq.heappop(queue)
+                future.set_result(None)
+            else:
+                break
+
+        if queue and model not in self._timers:
+            delay = max(bucket.wait_time(queue[0][2]), 0.01)
+            self._timers[model] = asyncio.get_running_loop().call_later(delay, self._on_timer, model)
+
+    def _on_timer(self, model: str) -> None:
+        self._timers.pop(model, None)
+        self._pump(model)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue and budget metrics.
+
+        Returns:
+            Dict[str, Any]: Queue depth per priority, wait times, shed calls
+                and the budget of each model
+        """
+        depth = {name: 0 for name in PRIORITY_NAMES.values()}
+        for queue in self.queues.values():
+            for priority, _, _, future in queue:
+                if not future.done():
+                    depth[PRIORITY_NAMES.get(priority, str(priority))] += 1
+        return {
+            "queue_depth": depth,
+            "granted": self.granted,
+            "waited": self.waited,
+            "shed": self.shed,
+            "mean_wait_ms": 1000 * self.wait_seconds / self.waited if self.waited else 0.0,
+            "max_wait_ms": 1000 * self.max_wait_seconds,
+            "models": {
+                model: {
+                    "request_limit": bucket.request_limit,
+                    "token_limit": bucket.token_limit,
+                    "requests_available": round(bucket.requests, 2),
+                    "tokens_available": round(bucket.tokens),
+                }
+                for model, bucket in self.buckets.items()
+            },
+        }
+
+
+# Shared scheduler for every OpenAI call of the process
+scheduler = RateLimitScheduler(settings.openai_requests_per_minute, settings.openai_tokens_per_minute)
@@ -0,0 +1,661 @@
+"""Search pipeline orchestration shared by the search endpoints."""
+
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core import metrics
+from app.core.config import get_settings
+from app.db.catalog import catalog, company_metadata
+from app.services.vector_store import get_vector_backend
+from app.services.filters import filter_key
+from app.services.fusion import maximal_marginal_relevance, normalized_score_fusion, reciprocal_rank_fusion
+from app.services.local_index import truncate_vectors
+from app.services.lexical_index import lexical_search
+from app.services.rate_limiter import BACKGROUND, with_priority
+from app.services.query_router import DIRECT, EXPAND, LOOKUP, classify, lookup, route_stats
+from app.services.openai_service import (
+    create_embeddings,
+    create_embeddings_batch,
+    explain_user_query,
+    deep_question,
+)
+from app.utils.cache import CoalescingCache, LRUCache
+from app.utils.data_normalization import normalize_data, normalize_text
+from app.utils.serialization import dumps
+
+# Get settings
+settings = get_settings()
+
+# Re-ranking strategies for merged deep research results
+SUM = "sum"
+RRF = "rrf"
+NORMALIZED = "normalized"
+MMR = "mmr"
+RERANK_STRATEGIES = (SUM, RRF, NORMALIZED, MMR)
+
+# Process-wide cap on deep research sub-searches in flight, shared by all requests
+deep_research_limit = asyncio.Semaphore(settings.deep_research_global_concurrency)
+
+# Whole-response cache for the search endpoints, bounded by approximate JSON size;
+# deep research entries hold the per-question result sets, re-ranked per request
+response_cache = CoalescingCache(
+    LRUCache(
+        max_weight=settings.response_cache_max_bytes,
+        ttl=settings.response_cache_ttl,
+        weigher=lambda results: len(dumps(results)),
+    )
+)
+
+# Bumped in-process when the vector index is re-ingested
+_index_generation = 0
+
+
+def index_version() -> str:
+    """Return the version stamp of the vector index contents.
+
+    Combines the configured ``INDEX_VERSION`` (changed on deploy after a
+    re-ingest) with an in-process generation bumped by ``invalidate_search_cache``.
+
+    Returns:
+        str: Current index version stamp
+    """
+    return f"{settings.index_version}.{_index_generation}"
+
+
+def invalidate_search_cache() -> str:
+    """Invalidate every cached search response after an index re-ingest.
+
+    Returns:
+        str: The new index version stamp
+    """
+    global _index_generation
+    _index_generation += 1
+    response_cache.cache.clear()
+    return index_version()
+
+
+async def cached_response(
+    endpoint: str,
+    query: str,
+    compute: Callable[[], Awaitable[List[Dict[str, Any]]]],
+    filters: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """Serve search results from the response cache, computing them on a miss.
+
+    Entries are keyed by endpoint, normalized query, filters and index
+    version. Concurrent identical requests share one computation.
+
+    Args:
+        endpoint: Name of the endpoint producing the results
+        query: The user query
+        compute: Zero-argument coroutine function computing the results
+        filters: Search filters applied by ``compute``
+
+    Returns:
+        List[Dict[str, Any]]: Cached or freshly computed results
+    """
+    if settings.response_cache_ttl <= 0:
+        return await compute()
+    return await response_cache.get_or_compute(_response_key(endpoint, query, filters), compute)
+
+
+def lookup_cached_response(
+    endpoint: str, query: str, filters: Optional[Dict[str, Any]] = None
+) -> Optional[List[Dict[str, Any]]]:
+    """Return cached search results without computing them on a miss.
+
+    Args:
+        endpoint: Name of the endpoint producing the results
+        query: The user query
+        filters: Search filters of the request
+
+    Returns:
+        Optional[List[Dict[str, Any]]]: Cached results, or None
+    """
+    if settings.response_cache_ttl <= 0:
+        return None
+    return response_cache.cache.get(_response_key(endpoint, query, filters))
+
+
+def store_cached_response(
+    endpoint: str, query: str, results: List[Dict[str, Any]], filters: Optional[Dict[str, Any]] = None
+) -> None:
+    """Store search results computed outside ``cached_response``.
+
+    Args:
+        endpoint: Name of the endpoint producing the results
+        query: The user query
+        results: Results to cache
+        filters: Search filters applied to the results
+    """
+    if settings.response_cache_ttl > 0:
+        response_cache.cache.set(_response_key(endpoint, query, filters), results)
+
+
+def _response_key(endpoint: str, query: str, filters: Optional[Dict[str, Any]]) -> tuple:
+    return (endpoint, normalize_text(query), filter_key(filters), index_version())
+
+
+async def hydrate_results(ranked: List[Tuple[str, float]]) -> List[Dict[str, Any]]:
+    """Rebuild results from the ids and scores carried by a pagination cursor.
+
+    Metadata comes from the vector backend, and from the company catalog
+    for ids the backend does not hold.
+
+    Args:
+        ranked: Ids and scores, best first
+
+    Returns:
+        List[Dict[str, Any]]: Normalized results with id, score, and metadata
+    """
+    metadata = await get_vector_backend().metadata([company_id for company_id, _ in ranked])
+    results = []
+    for company_id, score in ranked:
+        item = metadata.get(company_id)
+        if item is None:
+            doc = catalog.document(company_id, exact=True)
+            item = company_metadata(doc) if doc is not None else {}
+        results.append({"id": company_id, "score": score, "metadata": item})
+    return results
+
+
+async def lexical_candidates(query: str, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """Return the BM25 hits fused into single-query search.
+
+    Args:
+        query: The user query
+        filters: Search filters restricting the eligible companies
+
+    Returns:
+        List[Dict[str, Any]]: Lexical results, empty when hybrid search is off
+            or the company catalog is not loaded
+    """
+    if not settings.hybrid_search:
+        return []
+    return await lexical_search(query, settings.lexical_candidates, filters)
+
+
+def fuse_hybrid(
+    dense: List[Dict[str, Any]], lexical: List[Dict[str, Any]], number_of_results: int, route: str
+) -> List[Dict[str, Any]]:
+    """Fuse the vector matches of a keyword query with its lexical hits.
+
+    Only queries embedded as typed (``direct`` and ``lookup``) are fused:
+    their exact names and keywords are what BM25 scores well. Expanded
+    descriptive queries keep their vector ranking. Lexical hits are weighted
+    by ``LEXICAL_WEIGHT``.
+
+    Args:
+        dense: Normalized vector matches
+        lexical: Lexical hits for the same query
+        number_of_results: Number of results to return
+        route: Route the query took
+
+    Returns:
+        List[Dict[str, Any]]: Fused results with RRF scores, or the vector
+            matches unchanged when the query is not fused
+    """
+    if not lexical or route == EXPAND:
+        return dense
+    return reciprocal_rank_fusion(
+        [dense, lexical], k=settings.rrf_k, weights=[1.0, settings.lexical_weight]
+    )[:number_of_results]
+
+
+async def pin_company(
+    named: Dict[str, Any], results: List[Dict[str, Any]], number_of_results: int
+) -> List[Dict[str, Any]]:
+    """List the company a ``lookup`` query names first, above the similar companies.
+
+    The company scores 1.0 and keeps the metadata of the vector path: that
+    of its own vector match if the search found it, else the metadata stored
+    with its vector, else the lookup's.
+
+    Args:
+        named: The company found by ``lookup``
+        results: Results of the query's direct search
+        number_of_results: Number of results to return
+
+    Returns:
+        List[Dict[str, Any]]: The named company followed by the other results
+    """
+    others = [item for item in results if item["id"] != named["id"]]
+    metadata = next((item["metadata"] for item in results if item["id"] == named["id"]), None)
+    if metadata is None:
+        try:
+            metadata = (await get_vector_backend().metadata([named["id"]])).get(named["id"])
+        except Exception as e:
+            logging.error(f"Error fetching the metadata of {named['id']}: {e}")
+    pinned = {"id": named["id"], "score": 1.0, "metadata": metadata or named["metadata"]}
+    return [pinned] + others[:number_of_results - 1]
+
+
+async def run_search(
+    query: str, number_of_results: int = 30, filters: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, Any]]:
+    """Run the single-query search pipeline.
+
+    The query router picks the path: short keyword queries are embedded as
+    typed, and other queries are expanded by the LLM first. Embedded queries
+    are matched against the configured vector backend, and the matches of
+    keyword queries are fused with the lexical hits. A query naming a
+    company is searched like a keyword query, with that company listed
+    first. Filters are applied inside the vector and lexical searches, so
+    every result is eligible.
+
+    Args:
+        query: The user query
+        number_of_results: Number of results to return
+        filters: Search filters restricting the eligible companies
+
+    Returns:
+        List[Dict[str, Any]]: Normalized results with id, score, and metadata
+    """
+    started = time.perf_counter()
+    with metrics.stage("lexical"):
+        lexical = await lexical_candidates(query, filters)
+    route = classify(query, lexical, filters)
+    named = None
+    if route == LOOKUP:
+        with metrics.stage("lookup"):
+            named = await lookup(query, lexical, filters)
+        if named is None:
+            route = DIRECT
+
+    text = query
+    if route == EXPAND:
+        with metrics.stage("expand"):
+            text = await explain_user_query(query)
+    with metrics.stage("embed"):
+        vector = await create_embeddings(text)
+    with metrics.stage("vector_query"):
+        results = await get_vector_backend().query(vector, number_of_results, filters)
+    with metrics.stage("normalize"):
+        results = fuse_hybrid(normalize_data(results), lexical, number_of_results, route)
+        if named is not None:
+            results = await pin_company(named, results, number_of_results)
+    route_stats.record(route, time.perf_counter() - started)
+    return results
+
+
+async def run_search_batch(
+    queries: List[str], number_of_results: int = 30, filters: Optional[Dict[str, Any]] = None
+) -> List[List[Dict[str, Any]]]:
+    """Run the single-query search pipeline for many queries at once.
+
+    Queries are deduplicated by normalized text and served from the
+    response cache where possible. The rest are routed like ``run_search``;
+    the queries to expand are expanded concurrently, every query text is
+    embedded in one batched embeddings call and all vectors are matched in
+    one ``query_many`` call to the vector backend.
+
+    Args:
+        queries: The user queries
+        number_of_results: Number of results per query
+        filters: Search filters applied to every query
+
+    Returns:
+        List[List[Dict[str, Any]]]: Results of each query, in the order of ``queries``
+    """
+    started = time.perf_counter()
+    unique: Dict[str, str] = {}
+    for query in queries:
+        unique.setdefault(normalize_text(query), query)
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    pending: List[str] = []
+    for key, query in unique.items():
+        cached = lookup_cached_response("search_companies", query, filters)
+        if cached is not None:
+            results[key] = cached
+        else:
+            pending.append(key)
+
+    with metrics.stage("lexical"):
+        lexical = dict(zip(pending, await asyncio.gather(*(
+            lexical_candidates(unique[key], filters) for key in pending
+        ))))
+    routes = {key: classify(unique[key], lexical[key], filters) for key in pending}
+    lookups = [key for key in pending if routes[key] == LOOKUP]
+    with metrics.stage("lookup"):
+        found = await asyncio.gather(*(lookup(unique[key], lexical[key], filters) for key in lookups))
+    named = {key: company for key, company in zip(lookups, found) if company is not None}
+    for key in lookups:
+        if key not in named:
+            routes[key] = DIRECT
+
+    async def query_text(key: str) -> str:
+        return await explain_user_query(unique[key]) if routes[key] == EXPAND else unique[key]
+
+    with metrics.stage("expand"):
+        texts = await asyncio.gather(*(query_text(key) for key in pending))
+    with metrics.stage("embed"):
+        vectors = await create_embeddings_batch(list(texts))
+    with metrics.stage("vector_query"):
+        matches = await get_vector_backend().query_many(vectors, number_of_results, filters)
+    with metrics.stage("normalize"):
+        for key, dense in zip(pending, matches):
+            results[key] = fuse_hybrid(normalize_data(dense), lexical[key], number_of_results, routes[key])
+        pinned = await asyncio.gather(*(
+            pin_company(company, results[key], number_of_results) for key, company in named.items()
+        ))
+        results.update(zip(named, pinned))
+
+    elapsed = time.perf_counter() - started
+    for key in pending:
+        route_stats.record(routes[key], elapsed)
+        store_cached_response("search_companies", unique[key], results[key], filters)
+    return [results[normalize_text(query)] for query in queries]
+
+
+async def _run_limited(coro, request_limit: asyncio.Semaphore, default: Any, stage: str) -> Any:
+    """Await one deep research sub-step under the concurrency limits.
+
+    A failing or timed out sub-step is logged and replaced by ``default``,
+    so one slow question cannot fail the whole research request.
+
+    Args:
+        coro: The coroutine to run
+        request_limit: Per-request concurrency limit
+        default: Value returned on failure or timeout
+        stage: Name of the sub-step, used in log messages
+
+    Returns:
+        Any: Result of the coroutine, or ``default`` on failure
+    """
+    async with request_limit, deep_research_limit:
+        try:
+            return await asyncio.wait_for(coro, timeout=settings.sub_query_timeout)
+        except asyncio.TimeoutError:
+            logging.error(f"Deep research {stage} timed out after {settings.sub_query_timeout}s")
+        except Exception as e:
+            logging.error(f"Error in deep research {stage}: {e}")
+        return default
+
+
+def merge_results(result_sets: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Merge result sets by company id, summing the scores of duplicates.
+
+    Args:
+        result_sets: Normalized results of each sub-search
+
+    Returns:
+        List[Dict[str, Any]]: Deduplicated results sorted by combined score
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+    for results in result_sets:
+        for item in results:
+            existing_item = merged.get(item['id'])
+            if existing_item is None:
+                merged[item['id']] = dict(item)
+            else:
+                existing_item['score'] += item['score']
+
+    return sorted(merged.values(), key=lambda x: x['score'], reverse=True)
+
+
+def fuse_result_sets(result_sets: List[List[Dict[str, Any]]], strategy: str) -> List[Dict[str, Any]]:
+    """Merge sub-search result sets with a re-ranking strategy, without MMR.
+
+    ``mmr`` merges by normalized scores here; its diversity pass needs the
+    candidate vectors and is applied by ``rerank_results``.
+
+    Args:
+        result_sets: Normalized results of each sub-search
+        strategy: One of ``RERANK_STRATEGIES``
+
+    Returns:
+        List[Dict[str, Any]]: Deduplicated results, best first
+    """
+    if strategy == RRF:
+        return reciprocal_rank_fusion(result_sets, k=settings.rrf_k)
+    if strategy in (NORMALIZED, MMR):
+        return normalized_score_fusion(result_sets)
+    return merge_results(result_sets)
+
+
+async def rerank_results(
+    result_sets: List[List[Dict[str, Any]]], strategy: Optional[str] = None, mmr_lambda: Optional[float] = None
+) -> List[Dict[str, Any]]:
+    """Merge and re-rank deep research result sets.
+
+    Strategies:
+    - ``sum``: sum the raw cosine scores of duplicates
+    - ``rrf``: reciprocal rank fusion of the sub-search rankings
+    - ``normalized``: sum of per-sub-search min-max normalized scores
+    - ``mmr``: normalized fusion, then Maximal Marginal Relevance over the
+      candidates' vectors (truncated to ``MMR_DIMENSIONS``) so near-duplicate
+      companies do not crowd the top ``MMR_TOP_K`` results
+
+    Without candidate vectors, ``mmr`` returns the normalized fusion.
+
+    Args:
+        result_sets: Normalized results of each sub-search
+        strategy: One of ``RERANK_STRATEGIES``, ``DEEP_RESEARCH_RERANK`` if None
+        mmr_lambda: MMR trade-off between relevance (1.0) and diversity (0.0),
+            ``MMR_LAMBDA`` if None
+
+    Returns:
+        List[Dict[str, Any]]: Deduplicated results, best first
+    """
+    strategy = strategy or settings.deep_research_rerank
+    fused = fuse_result_sets(result_sets, strategy)
+    if strategy != MMR or len(fused) < 2:
+        return fused
+
+    with metrics.stage("rerank"):
+        try:
+            vectors = await get_vector_backend().vectors([item["id"] for item in fused])
+        except Exception as e:
+            logging.error(f"Error fetching vectors for MMR re-ranking: {e}")
+            vectors = None
+        if vectors is None:
+            return fused
+        vectors = truncate_vectors(vectors, settings.mmr_dimensions)
+        relevance = np.fromiter((item["score"] for item in fused), dtype=np.float32, count=len(fused))
+        relevance /= relevance[0] or 1.0
+        lambda_ = settings.mmr_lambda if mmr_lambda is None else mmr_lambda
+        order, gains = maximal_marginal_relevance(relevance, vectors, settings.mmr_top_k, lambda_)
+        return [{**fused[i], "score": gain} for i, gain in zip(order.tolist(), gains.tolist())]
+
+
+async def research_result_sets(
+    query: str, number_of_results: int = 30, filters: Optional[Dict[str, Any]] = None
+) -> List[List[Dict[str, Any]]]:
+    """Expand a query into research questions and search them concurrently.
+
+    Every question is expanded concurrently, all expansions are embedded in
+    a single batched request, and the vector queries then run concurrently.
+    The per-question results are returned unmerged, so they can be cached
+    once and re-ranked per request.
+
+    Args:
+        query: The user query
+        number_of_results: Number of results to fetch per question
+        filters: Search filters restricting the eligible companies
+
+    Returns:
+        List[List[Dict[str, Any]]]: Normalized results of each question
+    """
+    # Deep research yields outbound OpenAI budget to interactive searches
+    return await with_priority(BACKGROUND, _deep_research(query, number_of_results, filters))
+
+
+async def run_deep_research(
+    query: str,
+    number_of_results: int = 30,
+    filters: Optional[Dict[str, Any]] = None,
+    rerank: Optional[str] = None,
+    mmr_lambda: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """Run deep research and merge the per-question results.
+
+    Args:
+        query: The user query
+        number_of_results: Number of results to fetch per question
+        filters: Search filters restricting the eligible companies
+        rerank: Re-ranking strategy, see ``rerank_results``
+        mmr_lambda: MMR relevance/diversity trade-off
+
+    Returns:
+        List[Dict[str, Any]]: Combined and ranked results
+    """
+    result_sets = await research_result_sets(query, number_of_results, filters)
+    return await rerank_results(result_sets, rerank, mmr_lambda)
+
+
+async def _question_vectors(questions: List[str], request_limit: asyncio.Semaphore) -> List[List[float]]:
+    """Expand research questions concurrently and embed them in one batch.
+
+    A question whose expansion fails is embedded as written.
+
+    Args:
+        questions: Research questions
+        request_limit: Semaphore bounding the concurrent expansions
+
+    Returns:
+        List[List[float]]: One vector per question, in question order
+    """
+    with metrics.stage("expand"):
+        explained_queries = await asyncio.gather(*(
+            _run_limited(explain_user_query(q), request_limit, q, "expansion") for q in questions
+        ))
+    with metrics.stage("embed"):
+        return await create_embeddings_batch(list(explained_queries))
+
+
+async def _deep_research(
+    query: str, number_of_results: int, filters: Optional[Dict[str, Any]]
+) -> List[List[Dict[str, Any]]]:
+    with metrics.stage("questions"):
+        questions = [q.strip() for q in await deep_question(query) if q.strip()]
+    request_limit = asyncio.Semaphore(settings.deep_research_concurrency)
+    vectors = await _question_vectors(questions, request_limit)
+
+    backend = get_vector_backend()
+    with metrics.stage("vector_query"):
+        result_sets = await asyncio.gather(*(
+            _run_limited(backend.query(v, number_of_results, filters), request_limit, [], "vector query")
+            for v in vectors
+        ))
+    with metrics.stage("normalize"):
+        return [normalize_data(results) for results in result_sets]
+
+
+async def stream_search(
+    query: str, number_of_results: int = 30, filters: Optional[Dict[str, Any]] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """Run the single-query search pipeline, yielding progress events.
+
+    Events, in order: ``expanded`` once the query is ready to embed (after
+    the LLM expansion, or immediately for routes that skip it), then
+    ``done`` with the same results as ``run_search``. Cached responses are
+    yielded as ``done`` immediately.
+
+    Args:
+        query: The user query
+        number_of_results: Number of results to return
+        filters: Search filters restricting the eligible companies
+
+    Yields:
+        Dict[str, Any]: Events with an ``event`` name and payload
+    """
+    cached = lookup_cached_response("search_companies", query, filters)
+    if cached is not None:
+        yield {"event": "done", "results": cached}
+        return
+
+    started = time.perf_counter()
+    with metrics.stage("lexical"):
+        lexical = await lexical_candidates(query, filters)
+    route = classify(query, lexical, filters)
+    named = None
+    if route == LOOKUP:
+        with metrics.stage("lookup"):
+            named = await lookup(query, lexical, filters)
+        if named is None:
+            route = DIRECT
+
+    text = query
+    if route == EXPAND:
+        with metrics.stage("expand"):
+            text = await explain_user_query(query)
+    yield {"event": "expanded"}
+    with metrics.stage("embed"):
+        vector = await create_embeddings(text)
+    with metrics.stage("vector_query"):
+        dense = await get_vector_backend().query(vector, number_of_results, filters)
+    with metrics.stage("normalize"):
+        results = fuse_hybrid(normalize_data(dense), lexical, number_of_results, route)
+        if named is not None:
+            results = await pin_company(named, results, number_of_results)
+    route_stats.record(route, time.perf_counter() - started)
+    store_cached_response("search_companies", query, results, filters)
+    yield {"event": "done", "results": results}
+
+
+async def stream_deep_research(
+    query: str,
+    number_of_results: int = 30,
+    filters: Optional[Dict[str, Any]] = None,
+    rerank: Optional[str] = None,
+    mmr_lambda: Optional[float] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Run deep research, yielding merged results as each sub-search completes.
+
+    Questions are expanded and embedded in one batch as in
+    ``run_deep_research``, then their vector queries run concurrently and
+    report as they finish. Events, in order:
+    - ``questions``: the generated research questions
+    - ``update`` (one per finished vector query): completion counts and the
+      current top ``STREAM_UPDATE_SIZE`` merged results (without the MMR
+      diversity pass, which runs once at the end)
+    - ``done``: the full merged results, ordered exactly as the
+      non-streaming endpoint orders them
+
+    Args:
+        query: The user query
+        number_of_results: Number of results to fetch per question
+        filters: Search filters restricting the eligible companies
+        rerank: Re-ranking strategy, see ``rerank_results``
+        mmr_lambda: MMR relevance/diversity trade-off
+
+    Yields:
+        Dict[str, Any]: Events with an ``event`` name and payload
+    """
+    strategy = rerank or settings.deep_research_rerank
+    cached = lookup_cached_response("deep_research", query, filters)
+    if cached is not None:
+        yield {"event": "done", "results": await rerank_results(cached, strategy, mmr_lambda)}
+        return
+
+    questions = [q.strip() for q in await with_priority(BACKGROUND, deep_question(query)) if q.strip()]
+    yield {"event": "questions", "questions": questions}
+
+    request_limit = asyncio.Semaphore(settings.deep_research_concurrency)
+    vectors = await with_priority(BACKGROUND, _question_vectors(questions, request_limit))
+    backend = get_vector_backend()
+
+    async def sub_search(position: int, vector: List[float]):
+        pending = backend.query(vector, number_of_results, filters)
+        results = await _run_limited(pending, request_limit, [], "vector query")
+        return position, normalize_data(results)
+
+    tasks = [asyncio.ensure_future(sub_search(i, v)) for i, v in enumerate(vectors)]
+    result_sets: List[List[Dict[str, Any]]] = [[] for _ in questions]
+    try:
+        for completed, next_done in enumerate(asyncio.as_completed(tasks), start=1):
+            position, results = await next_done
+            result_sets[position] = results
+            # Merge in question order so float sums and ties match run_deep_research
+            top = fuse_result_sets(result_sets, strategy)[:settings.stream_update_size]
+            yield {"event": "update", "completed": completed, "total": len(tasks), "results": top}
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    store_cached_response("deep_research", query, result_sets, filters)
+    yield {"event": "done", "results": await rerank_results(result_sets, strategy, mmr_lambda)}
@@ -0,0 +1,317 @@
+"""Pluggable vector search backends.
+
+``get_vector_backend`` returns the backend selected by the ``VECTOR_BACKEND``
+setting:
+- ``pinecone``: the remote Pinecone index (default)
+- ``local``: an in-process index loaded from ``LOCAL_INDEX_PATH``, searched
+  exactly or through an IVF/HNSW index depending on ``LOCAL_INDEX_MODE``
+
+Both return matches exposing ``id``, ``score`` and ``metadata`` attributes,
+so results feed ``normalize_data`` unchanged.
+"""
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.services.ann_index import load_index, index_info
+from app.services.filters import BitmapIndex, compile_pinecone_filter
+from app.services.local_index import LocalVectorIndex, truncate_vectors
+
+# Get settings
+settings = get_settings()
+
+
+@dataclass
+class VectorMatch:
+    """A single vector search match.
+
+    Attributes:
+        id: Vector id
+        score: Cosine similarity to the query
+        metadata: Metadata stored with the vector
+        values: The stored vector, when requested
+    """
+    id: str
+    score: float
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    values: Optional[List[float]] = None
+
+
+class VectorBackend(ABC):
+    """Interface of a vector search backend."""
+
+    name = "base"
+
+    @abstractmethod
+    async def query(
+        self, vector: List[float], top_k: int, filters: Optional[Dict[str, Any]] = None
+    ) -> List[Any]:
+        """Find the vectors most similar to a query vector.
+
+        Args:
+            vector: Query embedding
+            top_k: Number of results to return
+            filters: Search filters restricting the eligible companies, None for none
+
+        Returns:
+            List[Any]: Matches with ``id``, ``score`` and ``metadata`` attributes
+        """
+
+    async def query_many(
+        self, vectors: List[List[float]], top_k: int, filters: Optional[Dict[str, Any]] = None
+    ) -> List[List[Any]]:
+        """Find the most similar vectors for several query vectors.
+
+        Runs the queries concurrently; backends that can search several
+        vectors at once override this.
+
+        Args:
+            vectors: Query embeddings
+            top_k: Number of results per query
+            filters: Search filters restricting the eligible companies, None for none
+
+        Returns:
+            List[List[Any]]: Matches of each query, in the order of ``vectors``
+        """
+        return list(await asyncio.gather(*(self.query(vector, top_k, filters) for vector in vectors)))
+
+    async def vectors(self, ids: List[str]) -> Optional[np.ndarray]:
+        """Return the stored vectors of some ids, for re-ranking.
+
+        Args:
+            ids: Vector ids
+
+        Returns:
+            Optional[np.ndarray]: float32 matrix aligned with ``ids`` (zero rows
+                for unknown ids), or None if the backend cannot provide vectors
+        """
+        return None
+
+    async def metadata(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Return the metadata stored with some ids, to rebuild paginated results.
+
+        Args:
+            ids: Vector ids
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Metadata by id; unknown ids are missing
+        """
+        return {}
+
+
+class PineconeBackend(VectorBackend):
+    """Backend querying the remote Pinecone index.
+
+    With ``VECTOR_METADATA_FROM_CATALOG``, matches are fetched without
+    metadata and filled from the in-memory company catalog, so only ids
+    and scores travel over the wire. If the catalog is not loaded or
+    misses a match, the query is repeated with metadata.
+    """
+
+    name = "pinecone"
+
+    def __init__(self):
+        """Import the Pinecone service lazily so local deployments need no API key."""
+        from app.db.catalog import catalog
+        from app.services import pinecone_service
+        self.catalog = catalog
+        self.service = pinecone_service
+
+    def _from_catalog(self, matches: List[Any]) -> Optional[List[VectorMatch]]:
+        filled = []
+        for match in matches:
+            metadata = self.catalog.document(match.id, exact=True)
+            if metadata is None:
+                return None
+            filled.append(VectorMatch(id=match.id, score=match.score, metadata=metadata))
+        return filled
+
+    async def query(
+        self, vector: List[float], top_k: int, filters: Optional[Dict[str, Any]] = None
+    ) -> List[Any]:
+        if settings.embedding_dimensions and len(vector) > settings.embedding_dimensions:
+            # The index was ingested with truncated vectors
+            vector = truncate_vectors(np.asarray([vector]), settings.embedding_dimensions)[0].tolist()
+        index = self.service.get_index()
+        metadata_filter = compile_pinecone_filter(filters)
+        if settings.vector_metadata_from_catalog and self.catalog.ready:
+            matches = await self.service.query_index(
+                index, vector, top_k, include_metadata=False, metadata_filter=metadata_filter
+            )
+            filled = self._from_catalog(matches)
+            if filled is not None:
+                return filled
+            logging.warning("Vector match missing from the company catalog, querying with metadata")
+        return await self.service.query_index(index, vector, top_k, metadata_filter=metadata_filter)
+
+    async def vectors(self, ids: List[str]) -> Optional[np.ndarray]:
+        if not ids:
+            return None
+        values = await self.service.fetch_vectors(self.service.get_index(), ids)
+        if not values:
+            return None
+        dimension = len(next(iter(values.values())))
+        matrix = np.zeros((len(ids), dimension), dtype=np.float32)
+        for row, vector_id in enumerate(ids):
+            if vector_id in values:
+                matrix[row] = values[vector_id]
+        return matrix
+
+    async def metadata(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        if not ids:
+            return {}
+        if settings.vector_metadata_from_catalog and self.catalog.ready:
+            filled = self._from_catalog([VectorMatch(id=vector_id, score=0.0) for vector_id in ids])
+            if filled is not None:
+                return {match.id: match.metadata for match in filled}
+        return await self.service.fetch_metadata(self.service.get_index(), ids)
+
+
+class LocalBackend(VectorBackend):
+    """Backend searching an in-process exact or approximate index.
+
+    Filtered queries select the eligible rows from a bitmap index over the
+    metadata and score them exactly, bypassing IVF/HNSW candidate lists
+    that could hold too few eligible companies.
+    """
+
+    name = "local"
+
+    def __init__(self, index):
+        """Wrap a loaded index.
+
+        Args:
+            index: Index exposing ``search``, ``ids`` and ``metadata``
+                (``LocalVectorIndex``, ``IVFIndex`` or ``HNSWIndex``)
+        """
+        self.index = index
+        self._bitmaps: Optional[BitmapIndex] = None
+
+    def eligible_rows(self, filters: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """Resolve filters to the positions of the eligible rows.
+
+        Args:
+            filters: Search filters, None for none
+
+        Returns:
+            Optional[np.ndarray]: Eligible row positions, None without filters
+        """
+        if not filters:
+            return None
+        if self._bitmaps is None:
+            self._bitmaps = BitmapIndex(self.index.metadata)
+        return np.flatnonzero(self._bitmaps.mask(filters))
+
+    def search(self, vector: np.ndarray, top_k: int, rows: Optional[np.ndarray] = None):
+        """Search the index, re-ranking short-vector candidates when configured.
+
+        With ``RERANK_CANDIDATES`` set and full-dimension vectors stored in
+        the index, the top candidates found with the (truncated) index
+        vectors are rescored exactly with the full-precision vectors.
+
+        Args:
+            vector: Query embedding
+            top_k: Number of results
+            rows: Eligible row positions, all rows if None
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Row positions and scores, best first
+        """
+        base = getattr(self.index, "base", self.index)
+        rerank = settings.rerank_candidates and base.full_vectors is not None
+        k = max(top_k, settings.rerank_candidates) if rerank else top_k
+        if rows is not None:
+            candidates, scores = base.search_rows(vector, rows, k)
+        else:
+            candidates, scores = self.index.search(vector, k)
+        if rerank:
+            return base.rerank(vector, candidates, top_k)
+        return candidates, scores
+
+    def search_many(self, vectors: np.ndarray, top_k: int, rows: Optional[np.ndarray] = None):
+        """Search several queries, in one pass over the vectors for exact search.
+
+        Args:
+            vectors: Query embeddings of shape (m, dimension)
+            top_k: Number of results per query
+            rows: Eligible row positions, all rows if None
+
+        Returns:
+            List[Tuple[np.ndarray, np.ndarray]]: Row positions and scores of each query
+        """
+        base = getattr(self.index, "base", self.index)
+        rerank = settings.rerank_candidates and base.full_vectors is not None
+        if rerank:
+            return [self.search(vector, top_k, rows) for vector in vectors]
+        if rows is not None:
+            return base.search_many(vectors, top_k, rows)
+        if isinstance(self.index, LocalVectorIndex):
+            return self.index.search_many(vectors, top_k)
+        return [self.search(vector, top_k) for vector in vectors]
+
+    def _matches(self, rows: np.ndarray, scores: np.ndarray) -> List[VectorMatch]:
+        return [
+            VectorMatch(id=self.index.ids[row], score=float(score), metadata=self.index.metadata[row])
+            for row, score in zip(rows.tolist(), scores.tolist())
+        ]
+
+    async def query(
+        self, vector: List[float], top_k: int, filters: Optional[Dict[str, Any]] = None
+    ) -> List[VectorMatch]:
+        rows = self.eligible_rows(filters)
+        result = await asyncio.to_thread(self.search, np.asarray(vector, dtype=np.float32), top_k, rows)
+        return self._matches(*result)
+
+    async def query_many(
+        self, vectors: List[List[float]], top_k: int, filters: Optional[Dict[str, Any]] = None
+    ) -> List[List[VectorMatch]]:
+        if not vectors:
+            return []
+        rows = self.eligible_rows(filters)
+        results = await asyncio.to_thread(self.search_many, np.asarray(vectors, dtype=np.float32), top_k, rows)
+        return [self._matches(rows, scores) for rows, scores in results]
+
+    async def vectors(self, ids: List[str]) -> Optional[np.ndarray]:
+        base = getattr(self.index, "base", self.index)
+        rows = np.array([base.positions.get(vector_id, -1) for vector_id in ids], dtype=np.int64)
+        matrix = np.zeros((len(ids), base.dimension), dtype=np.float32)
+        known = rows >= 0
+        matrix[known] = base.vectors_for(rows[known])
+        return matrix
+
+    async def metadata(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        base = getattr(self.index, "base", self.index)
+        rows = {vector_id: base.positions.get(vector_id) for vector_id in ids}
+        return {vector_id: base.metadata[row] for vector_id, row in rows.items() if row is not None}
+
+
+@lru_cache()
+def get_vector_backend() -> VectorBackend:
+    """Get the configured vector backend.
+
+    Returns:
+        VectorBackend: Shared backend instance
+
+    Raises:
+        ValueError: If ``VECTOR_BACKEND`` names an unknown backend
+    """
+    if settings.vector_backend == "pinecone":
+        return PineconeBackend()
+    if settings.vector_backend == "local":
+        index = load_index(
+            settings.local_index_path,
+            mode=settings.local_index_mode,
+            nprobe=settings.ivf_nprobe,
+            # Paginated searches rank a whole result window
+            ef=max(settings.hnsw_ef, settings.result_window_size),
+        )
+        logging.info(f"Loaded local vector index from {settings.local_index_path}: {index_info(index)}")
+        return LocalBackend(index)
+    raise ValueError(f"Unknown vector backend: {settings.vector_backend}")
@@ -0,0 +1,224 @@
+"""In-process caching primitives shared by the service layer."""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+# Sentinel distinguishing a cache miss from a cached None
+_MISSING = object()
+
+
+class LRUCache:
+    """Least-recently-used cache bounded by entry count and/or total weight.
+
+    Entries can optionally expire after a time-to-live. The cache is meant to
+    be used from a single event loop thread and is not thread-safe.
+
+    Attributes:
+        hits: Number of lookups that found a live entry
+        misses: Number of lookups that found nothing or an expired entry
+        evictions: Number of entries dropped to respect the bounds
+        expirations: Number of entries dropped because their TTL elapsed
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_weight: Optional[int] = None,
+        ttl: Optional[float] = None,
+        weigher: Optional[Callable[[Any], int]] = None,
+    ):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries, unbounded if None
+            max_weight: Maximum total weight of the entries, unbounded if None
+            ttl: Seconds after which an entry expires, never if None
+            weigher: Function returning the weight of a value, 1 if None
+        """
+        self.max_entries = max_entries
+        self.max_weight = max_weight
+        self.ttl = ttl
+        self.weigher = weigher or (lambda value: 1)
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.weight = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for a key and mark it as recently used.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            Any: The cached value, or ``default``
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        value, weight, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting least-recently-used entries if needed.
+
+        Values heavier than ``max_weight`` on their own are not stored.
+
+        Args:
+            key: Cache key
+            value: Value to store
+        """
+        weight = self.weigher(value)
+        if self.max_weight is not None and weight > self.max_weight:
+            return
+
+        if key in self._data:
+            self._remove(key)
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        self._data[key] = (value, weight, expires_at)
+        self.weight += weight
+
+        while self._data and (
+            (self.max_entries is not None and len(self._data) > self.max_entries)
+            or (self.max_weight is not None and self.weight > self.max_weight)
+        ):
+            oldest = next(iter(self._data))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Remove a key if it is cached.
+
+        Args:
+            key: Cache key
+        """
+        if key in self._data:
+            self._remove(key)
+
+    def clear(self) -> None:
+        """Remove every entry, keeping the counters."""
+        self._data.clear()
+        self.weight = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the cache counters.
+
+        Returns:
+            Dict[str, Any]: Hit, miss, eviction and size counters
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "weight": self.weight,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def _remove(self, key: Hashable) -> None:
+        _, weight, _ = self._data.pop(key)
+        self.weight -= weight
+
+
+class SingleFlight:
+    """Deduplicate concurrent calls that share a key.
+
+    The first caller for a key starts the computation; callers arriving
+    while it is in flight await the same task instead of starting their own.
+    The task is shielded, so a cancelled caller does not cancel the others.
+
+    Attributes:
+        shared: Number of calls that joined an in-flight computation
+    """
+
+    def __init__(self):
+        """Initialize with no calls in flight."""
+        self._inflight: Dict[Hashable, "asyncio.Task"] = {}
+        self.shared = 0
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def do(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``compute`` once per key among concurrent callers.
+
+        Args:
+            key: Deduplication key
+            compute: Zero-argument coroutine function producing the value
+
+        Returns:
+            Any: Result of the shared computation
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            self.shared += 1
+        else:
+            task = asyncio.ensure_future(compute())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+
+class CoalescingCache:
+    """LRU cache whose misses are computed once via single-flight."""
+
+    def __init__(self, cache: LRUCache):
+        """Initialize the cache.
+
+        Args:
+            cache: Underlying LRU cache storing computed values
+        """
+        self.cache = cache
+        self.flight = SingleFlight()
+
+    async def get_or_compute(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for a key, computing it on a miss.
+
+        Concurrent misses for the same key share one computation. Exceptions
+        propagate to every waiting caller and nothing is cached.
+
+        Args:
+            key: Cache key
+            compute: Zero-argument coroutine function producing the value
+
+        Returns:
+            Any: The cached or freshly computed value
+        """
+        value = self.cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        async def compute_and_store() -> Any:
+            result = await compute()
+            self.cache.set(key, result)
+            return result
+
+        return await self.flight.do(key, compute_and_store)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the cache counters plus single-flight counters.
+
+        Returns:
+            Dict[str, Any]: Cache counters, in-flight and coalesced call counts
+        """
+        return {**self.cache.stats(), "in_flight": len(self.flight), "coalesced": self.flight.shared}
@@ -1,8 +1,24 @@
 """Utilities for normalizing data from external sources."""
 
+import re
+import unicodedata
 from typing import List, Dict, Any
 
 
+def normalize_text(text: str) -> str:
+    """Normalize free text so equivalent queries map to the same cache key.
+
+    Applies Unicode NFKC normalization, case folding and whitespace collapsing.
+
+    Args:
+        text: Input text
+
+    Returns:
+        str: Normalized text
+    """
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text).casefold()).strip()
+
+
 def normalize_data(result) -> List[Dict[str, Any]]:
     """Normalize query results for consistent output format.
     
@@ -0,0 +1,79 @@
+"""Bounded retries with jittered exponential backoff for outbound calls."""
+
+import asyncio
+import logging
+import random
+from typing import Any, Awaitable, Callable
+
+from urllib3.exceptions import MaxRetryError, ProtocolError, TimeoutError as RequestTimeoutError
+
+# HTTP statuses worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Tell whether a failed call may succeed if retried.
+
+    Args:
+        error: Exception raised by the call
+
+    Returns:
+        bool: True for rate limiting, server errors, timeouts and connection errors
+    """
+    status = getattr(error, "status", None) or getattr(error, "status_code", None)
+    if status is not None:
+        return status in RETRYABLE_STATUSES
+    # urllib3 errors are raised by the synchronous Pinecone client's request timeout
+    return isinstance(error, (TimeoutError, ConnectionError, RequestTimeoutError, ProtocolError, MaxRetryError))
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """Return a "full jitter" backoff delay.
+
+    Delays are drawn uniformly below an exponentially growing cap, so
+    clients failing together do not retry together.
+
+    Args:
+        attempt: Number of the failed attempt, starting at 1
+        base_delay: Cap of the first delay in seconds
+        max_delay: Upper bound of any delay in seconds
+
+    Returns:
+        float: Seconds to wait before the next attempt
+    """
+    return random.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1)))
+
+
+async def retry_async(
+    call: Callable[[], Awaitable[Any]],
+    attempts: int,
+    base_delay: float,
+    max_delay: float,
+    timeout: float,
+    name: str = "call",
+) -> Any:
+    """Await a call with a per-attempt timeout, retrying transient failures.
+
+    Args:
+        call: Zero-argument coroutine function making one attempt
+        attempts: Maximum number of attempts
+        base_delay: Cap of the first backoff delay in seconds
+        max_delay: Upper bound of any backoff delay in seconds
+        timeout: Seconds allowed per attempt
+        name: Name of the call for logging
+
+    Returns:
+        Any: Result of the first successful attempt
+
+    Raises:
+        Exception: The last error, or the first error that is not retryable
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            return await asyncio.wait_for(call(), timeout=timeout)
+        except Exception as e:
+            if attempt == attempts or not is_retryable(e):
+                raise
+            delay = backoff_delay(attempt, base_delay, max_delay)
+            logging.warning(f"{name} failed ({e!r}), retrying in {delay:.2f}s ({attempt}/{attempts})")
+            await asyncio.sleep(delay)
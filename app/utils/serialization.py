@@ -0,0 +1,42 @@
+"""Fast JSON encoding of API payloads with orjson."""
+
+from typing import Any, Dict, List, Optional
+
+import orjson
+
+
+def dumps(value: Any) -> bytes:
+    """Encode a value as JSON bytes.
+
+    Args:
+        value: JSON-compatible value; unknown types are encoded with ``str``
+
+    Returns:
+        bytes: The JSON encoding
+    """
+    return orjson.dumps(value, default=str)
+
+
+def encode_results(results: List[Dict[str, Any]]) -> bytes:
+    """Encode search results as a ``SearchResponse`` JSON body.
+
+    Args:
+        results: Normalized results with id, score and metadata
+
+    Returns:
+        bytes: ``{"results": [...]}`` encoded as JSON
+    """
+    return dumps({"results": results})
+
+
+def encode_page(results: List[Dict[str, Any]], next_cursor: Optional[str]) -> bytes:
+    """Encode one page of search results as a ``SearchResponse`` JSON body.
+
+    Args:
+        results: Normalized results of the page
+        next_cursor: Cursor of the next page, None on the last page
+
+    Returns:
+        bytes: ``{"results": [...], "next_cursor": ...}`` encoded as JSON
+    """
+    return dumps({"results": results, "next_cursor": next_cursor})
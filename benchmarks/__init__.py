@@ -0,0 +1,6 @@
+"""Benchmarks for the YC ATLAS backend.
+
+These scripts exercise the API against local stand-ins for the external
+services (OpenAI, Pinecone) so performance changes can be measured
+without network access or API keys.
+"""
@@ -0,0 +1,97 @@
+"""Recall@k and latency of the ANN index modes against exact search.
+
+Uses the local index at ``--index`` when given, otherwise a synthetic
+clustered corpus. For every ``nprobe`` (IVF) and ``ef`` (HNSW) value it
+reports mean recall@k against exact search and mean query latency.
+
+Run with:
+    python -m benchmarks.ann_recall --synthetic 100000 --dimension 3072
+    python -m benchmarks.ann_recall --index data/vector_index --nprobe 4 8 16 32
+"""
+
+import argparse
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from app.services.ann_index import HNSWIndex, IVFIndex, hnswlib
+from app.services.local_index import LocalVectorIndex
+from benchmarks.synthetic import perturbed_queries, synthetic_corpus
+
+
+def measure(search: Callable, queries: np.ndarray, truth: List[set], k: int) -> Dict[str, float]:
+    """Run a search function over queries and compare with exact results.
+
+    Args:
+        search: Function taking (query, k) and returning (rows, scores)
+        queries: Query vectors
+        truth: Exact top-k row sets per query
+        k: Number of results per query
+
+    Returns:
+        Dict[str, float]: Mean recall@k and mean latency in milliseconds
+    """
+    recalls = []
+    started = time.perf_counter()
+    for query, expected in zip(queries, truth):
+        rows, _ = search(query, k)
+        recalls.append(len(expected.intersection(rows.tolist())) / len(expected))
+    elapsed = time.perf_counter() - started
+    return {"recall": float(np.mean(recalls)), "latency_ms": 1000 * elapsed / len(queries)}
+
+
+def main() -> None:
+    """Parse command-line arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--index", help="Local index directory (default: synthetic corpus)")
+    parser.add_argument("--synthetic", type=int, default=50000, help="Synthetic corpus size")
+    parser.add_argument("--dimension", type=int, default=3072, help="Synthetic vector dimension")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=30)
+    parser.add_argument("--nlist", type=int, default=None)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    parser.add_argument("--ef", type=int, nargs="+", default=[32, 64, 128, 256])
+    args = parser.parse_args()
+
+    if args.index:
+        base = LocalVectorIndex.load(args.index)
+    else:
+        ids, vectors, metadata = synthetic_corpus(args.synthetic, args.dimension)
+        base = LocalVectorIndex.build(ids, vectors, metadata)
+    queries = perturbed_queries(base.vectors_for(np.arange(len(base))), args.queries)
+
+    started = time.perf_counter()
+    truth = [set(base.search(q, args.k)[0].tolist()) for q in queries]
+    exact_ms = 1000 * (time.perf_counter() - started) / len(queries)
+    print(f"{len(base)} vectors, {base.dimension} dims, {len(queries)} queries, recall@{args.k}")
+    print(f"{'mode':<6} {'param':>10} {'recall':>8} {'ms/query':>9}")
+    print(f"{'exact':<6} {'-':>10} {1.0:>8.3f} {exact_ms:>9.3f}")
+
+    started = time.perf_counter()
+    ivf = IVFIndex.build(base, nlist=args.nlist)
+    print(f"# IVF built with nlist={len(ivf.centroids)} in {time.perf_counter() - started:.1f}s")
+    for nprobe in args.nprobe:
+        report = measure(lambda q, k: ivf.search(q, k, nprobe=nprobe), queries, truth, args.k)
+        print(f"{'ivf':<6} {'nprobe=' + str(nprobe):>10} {report['recall']:>8.3f} {report['latency_ms']:>9.3f}")
+
+    if hnswlib is None:
+        print("# hnswlib not installed, skipping HNSW")
+        return
+    started = time.perf_counter()
+    hnsw = HNSWIndex.build(base)
+    with tempfile.TemporaryDirectory() as directory:
+        # Round-trip through save/load to exercise the persisted format
+        base.save(directory)
+        hnsw.save(directory)
+        hnsw = HNSWIndex.load(LocalVectorIndex.load(directory), directory)
+        print(f"# HNSW built in {time.perf_counter() - started:.1f}s")
+        for ef in args.ef:
+            hnsw.set_ef(ef)
+            report = measure(hnsw.search, queries, truth, args.k)
+            print(f"{'hnsw':<6} {'ef=' + str(ef):>10} {report['recall']:>8.3f} {report['latency_ms']:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""Load benchmark for ``/api/search_companies`` against local stub servers.
+
+The benchmark starts the dependency stub (see ``benchmarks.stub_servers``)
+and a single uvicorn worker serving the API, then fires the same number of
+search requests at several concurrency levels. Because every search waits
+on the stubbed OpenAI and Pinecone latency, throughput should grow with
+concurrency when the pipeline is non-blocking and stay flat when it blocks
+the event loop.
+
+Every cache in front of the dependencies is disabled and each level sends
+its own queries, so later levels measure the pipeline rather than cache
+hits left by earlier ones.
+
+Run with:
+    python -m benchmarks.load_search --requests 200 --concurrency 1 50 200
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+import httpx
+
+
+def start_process(args: List[str], env: Dict[str, str]) -> subprocess.Popen:
+    """Start a Python module in a subprocess.
+
+    Args:
+        args: Arguments passed to ``python -m``
+        env: Environment for the subprocess
+
+    Returns:
+        subprocess.Popen: The running process
+    """
+    return subprocess.Popen([sys.executable, "-m", *args], env=env)
+
+
+async def wait_until_ready(url: str, timeout: float = 30.0) -> None:
+    """Poll a URL until it answers or the timeout expires.
+
+    Args:
+        url: URL to poll
+        timeout: Maximum number of seconds to wait
+
+    Raises:
+        RuntimeError: If the URL does not answer in time
+    """
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"{url} did not become ready within {timeout}s")
+
+
+async def run_load(base_url: str, total: int, concurrency: int, run: str = "") -> Dict[str, float]:
+    """Send ``total`` search requests keeping ``concurrency`` in flight.
+
+    Args:
+        base_url: Base URL of the API under test
+        total: Number of requests to send
+        concurrency: Maximum number of requests in flight
+        run: Tag making the queries of this run unique
+
+    Returns:
+        Dict[str, float]: Throughput, latency percentiles and error count
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=120.0, limits=limits) as client:
+        async def one(i: int) -> None:
+            nonlocal errors
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post(
+                    "/api/search_companies", json={"query": f"startups building tools for sector {i} {run}"}
+                )
+                latencies.append(time.perf_counter() - start)
+                if response.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(total)))
+        elapsed = time.perf_counter() - started
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "throughput": total / elapsed,
+        "p50": quantiles[49],
+        "p95": quantiles[94],
+        "p99": quantiles[98],
+        "errors": errors,
+    }
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    """Start the servers, run every concurrency level and print a report."""
+    env = dict(os.environ)
+    env.update({
+        "OPENAI_API_KEY": "stub",
+        "OPENAI_BASE_URL": f"http://127.0.0.1:{args.stub_port}/v1",
+        "PINECONE_API_KEY": "stub",
+        "PINECONE_HOST_URL2": f"http://127.0.0.1:{args.stub_port}",
+        "MONGO_URI": env.get("MONGO_URI") or "mongodb://127.0.0.1:27017",
+        # Measure the pipeline, not cache hits
+        "RESPONSE_CACHE_TTL": "0",
+        "LLM_CACHE_MAX_ENTRIES": "0",
+        "EMBEDDING_CACHE_MAX_BYTES": "0",
+        "EMBEDDING_CACHE_PATH": "",
+        "ROUTER_CACHE_MAX_ENTRIES": "0",
+    })
+    stub = start_process([
+        "benchmarks.stub_servers",
+        "--port", str(args.stub_port),
+        "--llm-latency", str(args.llm_latency),
+        "--embed-latency", str(args.embed_latency),
+        "--vector-latency", str(args.vector_latency),
+    ], env)
+    api = start_process([
+        "uvicorn", "app.main:app", "--port", str(args.api_port), "--log-level", "warning",
+    ], env)
+
+    try:
+        await wait_until_ready(f"http://127.0.0.1:{args.stub_port}/docs")
+        await wait_until_ready(f"http://127.0.0.1:{args.api_port}/health")
+
+        run_id = f"run{time.time_ns()}"
+        print(f"{'concurrency':>12} {'req/s':>8} {'p50 s':>8} {'p95 s':>8} {'p99 s':>8} {'errors':>7}")
+        baseline = None
+        for concurrency in args.concurrency:
+            report = await run_load(
+                f"http://127.0.0.1:{args.api_port}", args.requests, concurrency, run=f"{run_id} c{concurrency}"
+            )
+            baseline = baseline or report["throughput"]
+            print(
+                f"{concurrency:>12} {report['throughput']:>8.1f} {report['p50']:>8.3f} "
+                f"{report['p95']:>8.3f} {report['p99']:>8.3f} {report['errors']:>7}"
+                f"   ({report['throughput'] / baseline:.1f}x)"
+            )
+    finally:
+        for process in (api, stub):
+            process.terminate()
+            process.wait()
+
+
+def main() -> None:
+    """Parse command-line arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 50, 200])
+    parser.add_argument("--stub-port", type=int, default=9100)
+    parser.add_argument("--api-port", type=int, default=9200)
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--embed-latency", type=float, default=0.1)
+    parser.add_argument("--vector-latency", type=float, default=0.05)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Recall and latency trade-off of reduced-dimension (Matryoshka) retrieval.
+
+For each retrieval dimension, builds a truncated index and reports
+recall@k against exact full-dimension search, with and without exact
+re-ranking of the top candidates, plus query latency and matrix size.
+
+Uses the full-dimension local index at ``--index`` when given. Otherwise a
+synthetic clustered corpus is used, with component variance decaying along
+the vector to mimic how text-embedding-3 front-loads information; real
+embeddings give the numbers to trust.
+
+Run with:
+    python -m benchmarks.matryoshka_recall --index data/vector_index
+    python -m benchmarks.matryoshka_recall --synthetic 20000 --dims 256 512 1024
+"""
+
+import argparse
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from app.services.local_index import LocalVectorIndex
+from benchmarks.synthetic import perturbed_queries, synthetic_corpus
+
+
+def evaluate(index: LocalVectorIndex, queries: np.ndarray, truth: List[set], k: int, candidates: int) -> Dict[str, float]:
+    """Measure recall@k and latency of an index, optionally re-ranking.
+
+    Args:
+        index: Truncated index, with full vectors when re-ranking
+        queries: Full-dimension query vectors
+        truth: Exact full-dimension top-k row sets per query
+        k: Number of results
+        candidates: Candidates re-ranked with full vectors, 0 to disable
+
+    Returns:
+        Dict[str, float]: Mean recall@k and mean latency in milliseconds
+    """
+    recalls = []
+    started = time.perf_counter()
+    for query, expected in zip(queries, truth):
+        if candidates:
+            rows, _ = index.search(query, max(k, candidates))
+            rows, _ = index.rerank(query, rows, k)
+        else:
+            rows, _ = index.search(query, k)
+        recalls.append(len(expected.intersection(rows.tolist())) / len(expected))
+    elapsed = time.perf_counter() - started
+    return {"recall": float(np.mean(recalls)), "latency_ms": 1000 * elapsed / len(queries)}
+
+
+def main() -> None:
+    """Parse command-line arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--index", help="Full-dimension local index directory (default: synthetic corpus)")
+    parser.add_argument("--synthetic", type=int, default=20000, help="Synthetic corpus size")
+    parser.add_argument("--dimension", type=int, default=3072, help="Synthetic vector dimension")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=30)
+    parser.add_argument("--dims", type=int, nargs="+", default=[256, 512, 1024, 1536])
+    parser.add_argument("--candidates", type=int, nargs="+", default=[0, 100, 300])
+    args = parser.parse_args()
+
+    if args.index:
+        full = LocalVectorIndex.load(args.index)
+        ids, metadata = full.ids, full.metadata
+        vectors = full.vectors_for(np.arange(len(full)))
+    else:
+        ids, vectors, metadata = synthetic_corpus(args.synthetic, args.dimension)
+        vectors = vectors * (1.0 + np.arange(args.dimension, dtype=np.float32)) ** -0.5
+        full = LocalVectorIndex.build(ids, vectors, metadata)
+    queries = perturbed_queries(vectors, args.queries)
+
+    started = time.perf_counter()
+    truth = [set(full.search(q, args.k)[0].tolist()) for q in queries]
+    exact_ms = 1000 * (time.perf_counter() - started) / len(queries)
+
+    print(f"{len(full)} vectors, {full.dimension} dims, {len(queries)} queries, recall@{args.k}")
+    print(f"{'dims':>6} {'rerank':>7} {'recall':>8} {'ms/query':>9} {'matrix MB':>10}")
+    print(f"{full.dimension:>6} {'-':>7} {1.0:>8.3f} {exact_ms:>9.3f} {full.vectors.nbytes / 2**20:>10.1f}")
+    for dims in args.dims:
+        if dims >= full.dimension:
+            continue
+        reduced = LocalVectorIndex.build(ids, vectors, metadata, dimensions=dims, keep_full=True)
+        for candidates in args.candidates:
+            report = evaluate(reduced, queries, truth, args.k, candidates)
+            print(
+                f"{dims:>6} {candidates or '-':>7} {report['recall']:>8.3f} "
+                f"{report['latency_ms']:>9.3f} {reduced.vectors.nbytes / 2**20:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Multi-worker check of paginated search against local stub servers.
+
+Starts the dependency stub and the production gunicorn server with several
+workers over a synthetic local index, then has many clients page through
+``/api/search_companies`` and ``/api/deep_research`` with ``limit`` and
+``next_cursor``. Connections are not reused, so consecutive pages of one
+client land on different workers. Every page must succeed and every
+client must see each result exactly once; the process exits with status 1
+otherwise.
+
+Run with:
+    python -m benchmarks.pagination_workers --workers 4 --clients 32
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+from collections import Counter
+from typing import Dict, List, Tuple
+
+import httpx
+
+from benchmarks.load_search import start_process, wait_until_ready
+from benchmarks.synthetic import synthetic_corpus
+
+
+def build_index(path: str, count: int, dimension: int) -> None:
+    """Write a synthetic exact local index.
+
+    Args:
+        path: Index directory
+        count: Number of companies
+        dimension: Embedding dimension, matching the stub server
+    """
+    from app.services.local_index import LocalVectorIndex
+
+    ids, vectors, metadata = synthetic_corpus(count, dimension)
+    LocalVectorIndex.build(ids, vectors, metadata).save(path)
+
+
+async def page_through(
+    client: httpx.AsyncClient, endpoint: str, query: str, limit: int, statuses: Counter
+) -> Tuple[List[str], bool]:
+    """Request every page of one search.
+
+    Args:
+        client: HTTP client without connection reuse
+        endpoint: Search endpoint path
+        query: The search query
+        limit: Page size
+        statuses: Counter of response status codes, updated in place
+
+    Returns:
+        Tuple[List[str], bool]: Result ids in page order, and whether every page succeeded
+    """
+    body: Dict[str, object] = {"query": query, "limit": limit}
+    ids: List[str] = []
+    while True:
+        response = await client.post(endpoint, json=body)
+        statuses[response.status_code] += 1
+        if response.status_code != 200:
+            return ids, False
+        page = response.json()
+        ids.extend(result["id"] for result in page["results"])
+        if not page["next_cursor"]:
+            return ids, True
+        body["cursor"] = page["next_cursor"]
+
+
+async def main_async(args: argparse.Namespace) -> int:
+    """Start the servers, page through searches from every client and report."""
+    index_path = tempfile.mkdtemp(prefix="yc-atlas-pagination-")
+    build_index(index_path, args.companies, args.dimension)
+
+    env = dict(os.environ)
+    env.update({
+        "OPENAI_API_KEY": "stub",
+        "OPENAI_BASE_URL": f"http://127.0.0.1:{args.stub_port}/v1",
+        "VECTOR_BACKEND": "local",
+        "LOCAL_INDEX_PATH": index_path,
+        "EMBEDDING_CACHE_PATH": "",
+        "CATALOG_ENABLED": "false",
+        "MONGO_URI": "mongodb://127.0.0.1:1/?serverSelectionTimeoutMS=500",
+        "WARMUP_TIMEOUT": "3",
+        "PORT": str(args.api_port),
+    })
+    # uvicorn also reads WEB_CONCURRENCY, so only the API server gets it
+    stub_env = {key: value for key, value in env.items() if key != "WEB_CONCURRENCY"}
+    stub = start_process(["benchmarks.stub_servers", "--port", str(args.stub_port)], stub_env)
+    api = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app.main:app"],
+        env={**env, "WEB_CONCURRENCY": str(args.workers)},
+    )
+
+    try:
+        await wait_until_ready(f"http://127.0.0.1:{args.stub_port}/docs")
+        await wait_until_ready(f"http://127.0.0.1:{args.api_port}/health")
+
+        statuses: Counter = Counter()
+        limits = httpx.Limits(max_keepalive_connections=0)
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{args.api_port}", timeout=120.0, limits=limits
+        ) as client:
+            searches = [
+                (endpoint, f"startups building tools for sector {i}")
+                for i in range(args.clients)
+                for endpoint in ("/api/search_companies", "/api/deep_research")
+            ]
+            outcomes = await asyncio.gather(*(
+                page_through(client, endpoint, query, args.limit, statuses) for endpoint, query in searches
+            ))
+
+        failed = sum(not complete for _, complete in outcomes)
+        duplicated = sum(len(ids) != len(set(ids)) for ids, _ in outcomes)
+        print(f"workers={args.workers} searches={len(searches)} statuses={dict(statuses)}")
+        print(f"incomplete searches: {failed}, searches with repeated results: {duplicated}")
+        return 1 if failed or duplicated else 0
+    finally:
+        for process in (api, stub):
+            process.terminate()
+            process.wait()
+
+
+def main() -> None:
+    """Parse command-line arguments and run the check."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--companies", type=int, default=1000)
+    parser.add_argument("--dimension", type=int, default=3072)
+    parser.add_argument("--stub-port", type=int, default=9100)
+    parser.add_argument("--api-port", type=int, default=9300)
+    sys.exit(asyncio.run(main_async(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+"""Offline benchmark of the full search pipeline over a recorded query corpus.
+
+Replays the queries in ``benchmarks/queries.json`` through
+``/api/search_companies`` (one by one and in batches of ``BATCH_SIZE``),
+``/api/deep_research`` and ``/api/company/{id}``
+with everything the API depends on replaced by local stand-ins:
+- OpenAI: the stub server of ``benchmarks.stub_servers`` with configurable
+  latency, started on the loopback interface
+- Vector search: the ``local`` backend over a YC-sized synthetic corpus
+  written to a temporary directory
+- MongoDB: the in-memory company catalog, loaded with the same corpus; no
+  MongoDB server is contacted, so the catalog-miss fallback is not measured
+
+The API runs in-process behind ``httpx.ASGITransport``, so no network
+access is needed. For every endpoint and concurrency level the queries are
+replayed with cold caches and again with warm caches, reporting throughput
+and p50/p95/p99 latency. A final sequential pass under ``tracemalloc``
+reports the peak and retained Python allocations per request.
+
+Reports can be saved with ``--output`` and compared against a previous run
+with ``--baseline``, so a performance change can be checked before it is
+deployed.
+
+Run with:
+    python -m benchmarks.pipeline --concurrency 1 16 64
+    python -m benchmarks.pipeline --output before.json
+    python -m benchmarks.pipeline --baseline before.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from benchmarks.load_search import start_process, wait_until_ready
+from benchmarks.synthetic import synthetic_corpus
+
+# Method, path and JSON body of one replayed request
+Request = Tuple[str, str, Optional[Dict[str, Any]]]
+
+DEFAULT_QUERIES = os.path.join(os.path.dirname(__file__), "queries.json")
+
+# Queries per replayed batch search request
+BATCH_SIZE = 10
+
+
+def chunks(items: List[Any], size: int) -> List[List[Any]]:
+    """Split a list into consecutive chunks of at most ``size`` items."""
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+def configure_environment(args: argparse.Namespace, index_path: str) -> None:
+    """Point the application settings at the local stand-ins.
+
+    Must run before any ``app`` module is imported, since settings are read
+    at import time.
+
+    Args:
+        args: Command-line arguments
+        index_path: Directory of the synthetic vector index
+    """
+    os.environ.update({
+        "OPENAI_API_KEY": "stub",
+        "OPENAI_BASE_URL": f"http://127.0.0.1:{args.stub_port}/v1",
+        "VECTOR_BACKEND": "local",
+        "LOCAL_INDEX_PATH": index_path,
+        "LOCAL_INDEX_MODE": args.index_mode,
+        "EMBEDDING_CACHE_PATH": "",
+        # Fail fast if a request unexpectedly reaches MongoDB
+        "MONGO_URI": "mongodb://127.0.0.1:1/?serverSelectionTimeoutMS=500",
+    })
+
+
+def build_fixtures(count: int, dimension: int, index_path: str, mode: str) -> List[Dict[str, Any]]:
+    """Write the synthetic vector index and return the matching company documents.
+
+    Args:
+        count: Number of companies
+        dimension: Embedding dimension, matching the stub server
+        index_path: Directory to write the index to
+        mode: Local index mode; IVF and HNSW structures are built when needed
+
+    Returns:
+        List[Dict[str, Any]]: Company documents for the catalog
+    """
+    from app.services.ann_index import HNSWIndex, IVFIndex
+    from app.services.local_index import LocalVectorIndex
+
+    ids, vectors, metadata = synthetic_corpus(count, dimension)
+    base = LocalVectorIndex.build(ids, vectors, metadata)
+    base.save(index_path)
+    if mode == "ivf":
+        IVFIndex.build(base).save(index_path)
+    elif mode == "hnsw":
+        HNSWIndex.build(base).save(index_path)
+    return [{"_id": f"{i:024x}", **doc} for i, doc in enumerate(metadata)]
+
+
+def load_requests(path: str, docs: List[Dict[str, Any]], lookups: int) -> Dict[str, List[Request]]:
+    """Build the replayed requests of every endpoint.
+
+    Name queries for ``search_companies`` and the ``get_company`` keys (ids,
+    slugs, names and name prefixes) are drawn from the corpus, since the
+    recorded queries cannot know the synthetic company names.
+
+    Args:
+        path: Query corpus file
+        docs: Company documents
+        lookups: Number of corpus-derived lookups per endpoint
+
+    Returns:
+        Dict[str, List[Request]]: Requests by endpoint name
+    """
+    with open(path) as f:
+        queries = json.load(f)
+
+    step = max(1, len(docs) // max(lookups, 1))
+    sampled = docs[::step][:lookups]
+    names = [doc["name"] for doc in sampled]
+    keys = [
+        (doc["_id"], doc["slug"], doc["name"], doc["name"][:5])[i % 4]
+        for i, doc in enumerate(sampled)
+    ]
+    return {
+        "search_companies": [
+            ("POST", "/api/search_companies", {"query": query})
+            for query in queries["search_companies"] + names
+        ],
+        "search_companies_batch": [
+            ("POST", "/api/search_companies/batch", {"queries": batch})
+            for batch in chunks(queries["search_companies"] + names, BATCH_SIZE)
+        ],
+        "deep_research": [
+            ("POST", "/api/deep_research", {"query": query}) for query in queries["deep_research"]
+        ],
+        "get_company": [("GET", f"/api/company/{key}", None) for key in keys],
+    }
+
+
+def reset_caches() -> None:
+    """Empty every in-process cache so the next pass starts cold."""
+    from app.services.embedding_cache import embedding_cache
+    from app.services.openai_service import expansion_cache, question_cache
+    from app.services.query_router import decision_cache
+    from app.services.search_service import response_cache
+
+    for cache in (
+        embedding_cache.memory, expansion_cache.cache, question_cache.cache, response_cache.cache, decision_cache
+    ):
+        cache.clear()
+
+
+async def send(client: httpx.AsyncClient, request: Request) -> bool:
+    """Send one request.
+
+    Args:
+        client: Client bound to the application
+        request: Method, path and JSON body
+
+    Returns:
+        bool: True if the response status was 200
+    """
+    method, path, body = request
+    response = await client.request(method, path, json=body)
+    return response.status_code == 200
+
+
+async def replay(client: httpx.AsyncClient, requests: List[Request], concurrency: int) -> Dict[str, float]:
+    """Send every request keeping ``concurrency`` in flight.
+
+    Args:
+        client: Client bound to the application
+        requests: Requests to send
+        concurrency: Maximum number of requests in flight
+
+    Returns:
+        Dict[str, float]: Throughput, latency percentiles in milliseconds and error count
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors = 0
+
+    async def one(request: Request) -> None:
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            ok = await send(client, request)
+            latencies.append(time.perf_counter() - started)
+            errors += not ok
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(request) for request in requests))
+    elapsed = time.perf_counter() - started
+
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {
+        "throughput": len(requests) / elapsed,
+        "p50": 1000 * quantiles[49],
+        "p95": 1000 * quantiles[94],
+        "p99": 1000 * quantiles[98],
+        "errors": errors,
+    }
+
+
+async def measure_allocations(client: httpx.AsyncClient, requests: List[Request]) -> Dict[str, float]:
+    """Trace the Python allocations of each request, sent one at a time.
+
+    Args:
+        client: Client bound to the application
+        requests: Requests to send
+
+    Returns:
+        Dict[str, float]: Mean peak and mean retained KiB per request
+    """
+    peaks, retained = [], []
+    tracemalloc.start()
+    try:
+        for request in requests:
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            await send(client, request)
+            current, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+            retained.append(current - before)
+    finally:
+        tracemalloc.stop()
+    return {"peak_kib": statistics.mean(peaks) / 1024, "retained_kib": statistics.mean(retained) / 1024}
+
+
+def print_row(endpoint: str, phase: str, concurrency: Any, report: Dict[str, float], baseline: Dict[str, Any]) -> None:
+    """Print one report line, with the change against the baseline if any."""
+    line = (
+        f"{endpoint:>22} {phase:>6} {concurrency:>5} {report['throughput']:>9.1f} "
+        f"{report['p50']:>9.1f} {report['p95']:>9.1f} {report['p99']:>9.1f} {report['errors']:>6}"
+    )
+    previous = baseline.get(endpoint, {}).get(phase, {}).get(str(concurrency))
+    if previous:
+        line += (
+            f"   req/s {report['throughput'] / previous['throughput'] - 1:+.0%}"
+            f"  p95 {report['p95'] / previous['p95'] - 1:+.0%}"
+        )
+    print(line)
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    """Build the fixtures, start the stub, replay every endpoint and print a report."""
+    workdir = tempfile.TemporaryDirectory(prefix="yc-atlas-bench-")
+    index_path = os.path.join(workdir.name, "vector_index")
+    configure_environment(args, index_path)
+    docs = build_fixtures(args.companies, args.dimension, index_path, args.index_mode)
+
+    # Imported only now that the environment points at the stand-ins
+    from app.db.catalog import catalog
+    from app.main import app
+    from app.services.clients import close_clients
+    from app.services.lexical_index import get_lexical_index
+
+    # The application logs every outbound and test-client request at INFO
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    catalog.load(docs)
+    await get_lexical_index()
+    requests = load_requests(args.queries, docs, args.lookups)
+    baseline: Dict[str, Any] = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    stub = start_process([
+        "benchmarks.stub_servers",
+        "--port", str(args.stub_port),
+        "--llm-latency", str(args.llm_latency),
+        "--embed-latency", str(args.embed_latency),
+        "--dimension", str(args.dimension),
+    ], dict(os.environ))
+    report: Dict[str, Any] = {}
+    try:
+        await wait_until_ready(f"http://127.0.0.1:{args.stub_port}/docs")
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120.0) as client:
+            print(
+                f"{'endpoint':>22} {'caches':>6} {'conc':>5} {'req/s':>9} {'p50 ms':>9} "
+                f"{'p95 ms':>9} {'p99 ms':>9} {'errors':>6}"
+            )
+            for endpoint, endpoint_requests in requests.items():
+                report[endpoint] = {"cold": {}, "warm": {}}
+                for concurrency in args.concurrency:
+                    reset_caches()
+                    for phase in ("cold", "warm"):
+                        result = await replay(client, endpoint_requests, concurrency)
+                        report[endpoint][phase][str(concurrency)] = result
+                        print_row(endpoint, phase, concurrency, result, baseline)
+
+            print(f"\n{'endpoint':>22} {'peak KiB/req':>13} {'retained KiB/req':>17}")
+            for endpoint, endpoint_requests in requests.items():
+                reset_caches()
+                allocations = await measure_allocations(client, endpoint_requests)
+                report[endpoint]["allocations"] = allocations
+                print(f"{endpoint:>22} {allocations['peak_kib']:>13.1f} {allocations['retained_kib']:>17.1f}")
+        await close_clients()
+    finally:
+        stub.terminate()
+        stub.wait()
+        workdir.cleanup()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+def main() -> None:
+    """Parse command-line arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queries", default=DEFAULT_QUERIES, help="Query corpus (JSON)")
+    parser.add_argument("--companies", type=int, default=5000, help="Size of the synthetic corpus")
+    parser.add_argument("--dimension", type=int, default=3072)
+    parser.add_argument("--index-mode", default="exact", choices=["exact", "ivf", "hnsw"])
+    parser.add_argument("--lookups", type=int, default=20, help="Corpus-derived name lookups per endpoint")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--stub-port", type=int, default=9100)
+    parser.add_argument("--llm-latency", type=float, default=0.3)
+    parser.add_argument("--embed-latency", type=float, default=0.05)
+    parser.add_argument("--output", help="Write the report to this JSON file")
+    parser.add_argument("--baseline", help="Compare against a report written with --output")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
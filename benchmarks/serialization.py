@@ -0,0 +1,79 @@
+"""Serialization cost of search responses per result count.
+
+Compares, for each result count:
+- ``pydantic``: ``SearchResponse`` validation plus FastAPI's
+  ``jsonable_encoder`` and stdlib ``json.dumps`` (the previous response path)
+- ``stdlib``: encoding the result dicts with ``json.dumps`` only
+- ``orjson``: ``encode_results``, the current response path
+
+Metadata comes from the synthetic corpus, which mirrors the fields of the
+real Pinecone metadata.
+
+Run with:
+    python -m benchmarks.serialization --counts 10 30 100 300 1000
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Callable, Dict, List
+
+from fastapi.encoders import jsonable_encoder
+
+from app.api.models import SearchResponse
+from app.utils.serialization import encode_results
+from benchmarks.synthetic import synthetic_corpus
+
+
+def pydantic_path(results: List[Dict[str, Any]]) -> bytes:
+    """Validate with Pydantic and encode like FastAPI's default response."""
+    content = jsonable_encoder(SearchResponse(results=results))
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def stdlib_path(results: List[Dict[str, Any]]) -> bytes:
+    """Encode the result dicts with the stdlib encoder."""
+    return json.dumps({"results": results}, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def time_per_call(encode: Callable[[List[Dict[str, Any]]], bytes], results: List[Dict[str, Any]], repeat: int) -> float:
+    """Return the mean encoding time in microseconds.
+
+    Args:
+        encode: Encoding function
+        results: Results to encode
+        repeat: Number of timed calls
+
+    Returns:
+        float: Mean time per call in microseconds
+    """
+    encode(results)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        encode(results)
+    return 1e6 * (time.perf_counter() - started) / repeat
+
+
+def main() -> None:
+    """Parse command-line arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[10, 30, 100, 300, 1000])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    ids, _, metadata = synthetic_corpus(max(args.counts), 8)
+    paths = {"pydantic": pydantic_path, "stdlib": stdlib_path, "orjson": encode_results}
+
+    print(f"{'results':>8} " + " ".join(f"{name + ' (us)':>14}" for name in paths) + f" {'speedup':>8}")
+    for count in args.counts:
+        results = [
+            {"id": ids[i], "score": 1.0 - i / count, "metadata": metadata[i]}
+            for i in range(count)
+        ]
+        timings = {name: time_per_call(encode, results, args.repeat) for name, encode in paths.items()}
+        speedup = timings["pydantic"] / timings["orjson"]
+        print(f"{count:>8} " + " ".join(f"{timings[name]:>14.1f}" for name in paths) + f" {speedup:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
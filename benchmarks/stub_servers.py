@@ -0,0 +1,157 @@
+"""Local stub server emulating the OpenAI and Pinecone HTTP APIs.
+
+The stub answers the handful of endpoints the backend uses with
+deterministic payloads after a configurable delay, which makes it possible
+to measure how many requests the API keeps in flight while it waits on
+its dependencies.
+
+Run with:
+    python -m benchmarks.stub_servers --port 9100 --llm-latency 0.5
+"""
+
+import argparse
+import asyncio
+import hashlib
+import random
+import time
+from functools import lru_cache
+from typing import Any, Dict, List
+
+import uvicorn
+from fastapi import FastAPI, Request
+
+from app.services.prompts import SystemPrompt_Question
+
+
+@lru_cache(maxsize=4096)
+def fake_embedding(text: str, dimension: int) -> List[float]:
+    """Build a deterministic unit-length pseudo-embedding for a text.
+
+    Args:
+        text: Text to embed
+        dimension: Length of the returned vector
+
+    Returns:
+        List[float]: Normalized vector seeded by the text hash
+    """
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+    rng = random.Random(seed)
+    values = [rng.gauss(0.0, 1.0) for _ in range(dimension)]
+    norm = sum(v * v for v in values) ** 0.5 or 1.0
+    return [v / norm for v in values]
+
+
+def create_stub_app(
+    llm_latency: float = 0.5,
+    embed_latency: float = 0.1,
+    vector_latency: float = 0.05,
+    dimension: int = 3072,
+    corpus_size: int = 5000,
+) -> FastAPI:
+    """Create the stub application.
+
+    Args:
+        llm_latency: Seconds to wait before answering a chat completion
+        embed_latency: Seconds to wait before answering an embedding request
+        vector_latency: Seconds to wait before answering a vector query
+        dimension: Dimension of the returned embeddings
+        corpus_size: Number of distinct fake companies returned by queries
+
+    Returns:
+        FastAPI: Application serving ``/v1/chat/completions``,
+        ``/v1/embeddings`` and the Pinecone ``/query`` endpoint
+    """
+    app = FastAPI(title="YC ATLAS dependency stub")
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request) -> Dict[str, Any]:
+        body = await request.json()
+        await asyncio.sleep(llm_latency)
+        messages = body.get("messages", [])
+        query = messages[-1]["content"] if messages else ""
+        if messages and messages[0]["content"] == SystemPrompt_Question:
+            content = "\n".join(f"Which startups work on {query} (angle {i})?" for i in range(5))
+        else:
+            content = f"A company focused on {query}, built on a modern cloud and AI tech stack."
+        return {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 50, "completion_tokens": 150, "total_tokens": 200},
+        }
+
+    @app.post("/v1/embeddings")
+    async def embeddings(request: Request) -> Dict[str, Any]:
+        body = await request.json()
+        await asyncio.sleep(embed_latency)
+        inputs = body["input"] if isinstance(body["input"], list) else [body["input"]]
+        size = body.get("dimensions") or dimension
+        return {
+            "object": "list",
+            "data": [
+                {"object": "embedding", "index": i, "embedding": fake_embedding(text, size)}
+                for i, text in enumerate(inputs)
+            ],
+            "model": body.get("model", "stub"),
+            "usage": {"prompt_tokens": 10 * len(inputs), "total_tokens": 10 * len(inputs)},
+        }
+
+    @app.post("/query")
+    async def query(request: Request) -> Dict[str, Any]:
+        body = await request.json()
+        await asyncio.sleep(vector_latency)
+        top_k = body.get("topK", 10)
+        # Rounded so float32 round-trips through the embedding cache hit the same matches
+        prefix = [round(v, 4) for v in body.get("vector", [])[:8]]
+        seed = int.from_bytes(hashlib.sha256(str(prefix).encode()).digest()[:8], "little")
+        rng = random.Random(seed)
+        ids = rng.sample(range(corpus_size), min(top_k, corpus_size))
+        scores = sorted((rng.uniform(0.2, 0.9) for _ in ids), reverse=True)
+        return {
+            "matches": [
+                {
+                    "id": f"company-{i}",
+                    "score": score,
+                    "metadata": {
+                        "name": f"Company {i}",
+                        "one_liner": f"Stub company number {i}",
+                        "batch": "W21",
+                    },
+                }
+                for i, score in zip(ids, scores)
+            ],
+            "namespace": body.get("namespace", ""),
+            "usage": {"readUnits": 5},
+        }
+
+    return app
+
+
+def main() -> None:
+    """Run the stub server from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--embed-latency", type=float, default=0.1)
+    parser.add_argument("--vector-latency", type=float, default=0.05)
+    parser.add_argument("--dimension", type=int, default=3072)
+    args = parser.parse_args()
+
+    app = create_stub_app(
+        llm_latency=args.llm_latency,
+        embed_latency=args.embed_latency,
+        vector_latency=args.vector_latency,
+        dimension=args.dimension,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
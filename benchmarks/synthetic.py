@@ -0,0 +1,116 @@
+"""Synthetic YC-like embedding corpora for offline benchmarks."""
+
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+# Values used to fill synthetic company metadata
+BATCHES = ["W20", "S20", "W21", "S21", "W22", "S22", "W23", "S23", "W24", "S24"]
+INDUSTRIES = ["Fintech", "Healthcare", "B2B", "Consumer", "Industrials", "Education", "Real Estate"]
+STATUSES = ["Active", "Acquired", "Inactive", "Public"]
+TAGS = [
+    "AI", "Developer Tools", "SaaS", "Payments", "Robotics", "Climate", "Security",
+    "Marketplace", "Analytics", "Biotech", "Logistics", "Insurance", "Hardware", "Open Source",
+]
+PRODUCTS = ["platform", "API", "copilot", "marketplace", "analytics suite", "infrastructure", "app"]
+AUDIENCES = [
+    "small businesses", "developers", "hospitals", "lenders", "retailers", "factories",
+    "students", "landlords", "insurers", "sales teams", "security teams", "farmers",
+]
+_SYLLABLES = ["al", "bri", "co", "da", "el", "fi", "gen", "ho", "ix", "ka", "lu", "mo", "nu", "pa", "qui", "ro",
+              "sy", "ta", "ve", "zo"]
+
+
+def company_name(position: int) -> str:
+    """Build a unique pronounceable company name for a corpus position.
+
+    Args:
+        position: Position of the company in the corpus
+
+    Returns:
+        str: Name made of at least three syllables, e.g. ``"Alcobri"``
+    """
+    syllables = []
+    while position or len(syllables) < 3:
+        position, digit = divmod(position, len(_SYLLABLES))
+        syllables.append(_SYLLABLES[digit])
+    return "".join(syllables).capitalize()
+
+
+def clustered_vectors(count: int, dimension: int, clusters: int = 64, spread: float = 0.35, seed: int = 0) -> np.ndarray:
+    """Generate vectors drawn around random topic centers.
+
+    Real company embeddings cluster by sector, which is what ANN indexes
+    exploit, so uniformly random vectors would understate their recall.
+
+    Args:
+        count: Number of vectors
+        dimension: Vector dimension
+        clusters: Number of topic centers
+        spread: Standard deviation of the per-vector noise relative to the centers
+        seed: Random seed
+
+    Returns:
+        np.ndarray: float32 matrix of shape (count, dimension)
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dimension)).astype(np.float32)
+    centers /= np.linalg.norm(centers, axis=1, keepdims=True)
+    labels = rng.integers(0, clusters, count)
+    noise = rng.standard_normal((count, dimension)).astype(np.float32) * (spread / np.sqrt(dimension))
+    return centers[labels] + noise
+
+
+def synthetic_corpus(count: int, dimension: int, seed: int = 0) -> Tuple[List[str], np.ndarray, List[Dict[str, Any]]]:
+    """Generate ids, vectors and metadata for a synthetic company corpus.
+
+    Args:
+        count: Number of companies
+        dimension: Vector dimension
+        seed: Random seed
+
+    Returns:
+        Tuple[List[str], np.ndarray, List[Dict[str, Any]]]: Ids, vectors and metadata
+    """
+    rng = np.random.default_rng(seed + 1)
+    names = [company_name(i) for i in range(count)]
+    ids = [name.lower() for name in names]
+    tags = [rng.choice(len(TAGS), 2, replace=False) for _ in range(count)]
+    metadata = [
+        {
+            "name": names[i],
+            "slug": ids[i],
+            "one_liner": (
+                f"{TAGS[tags[i][0]]} {PRODUCTS[int(rng.integers(len(PRODUCTS)))]} "
+                f"for {AUDIENCES[int(rng.integers(len(AUDIENCES)))]}"
+            ),
+            "tags": [TAGS[int(tag)] for tag in tags[i]],
+            "small_logo_thumb_url": f"https://example.com/logos/{i}.png",
+            "batch": BATCHES[int(rng.integers(len(BATCHES)))],
+            "industry": INDUSTRIES[int(rng.integers(len(INDUSTRIES)))],
+            "status": STATUSES[int(rng.integers(len(STATUSES)))],
+            "team_size": int(rng.integers(1, 500)),
+            "long_description": "Lorem ipsum dolor sit amet. " * 20,
+        }
+        for i in range(count)
+    ]
+    return ids, clustered_vectors(count, dimension, seed=seed), metadata
+
+
+def perturbed_queries(vectors: np.ndarray, count: int, noise: float = 0.5, seed: int = 1) -> np.ndarray:
+    """Build query vectors near random corpus vectors.
+
+    Args:
+        vectors: Corpus vectors
+        count: Number of queries
+        noise: Standard deviation of the noise relative to a unit vector
+        seed: Random seed
+
+    Returns:
+        np.ndarray: float32 matrix of shape (count, dimension)
+    """
+    rng = np.random.default_rng(seed)
+    base = np.asarray(vectors[rng.choice(len(vectors), count, replace=False)], dtype=np.float32)
+    base /= np.linalg.norm(base, axis=1, keepdims=True)
+    dimension = base.shape[1]
+    return base + rng.standard_normal(base.shape).astype(np.float32) * (noise / np.sqrt(dimension))
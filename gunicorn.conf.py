@@ -0,0 +1,54 @@
+"""Gunicorn configuration of the production server.
+
+Run with:
+    gunicorn -c gunicorn.conf.py app.main:app
+
+Starts ``WEB_CONCURRENCY`` uvicorn workers, one per CPU by default; set it
+explicitly where the CPU count seen by the container is not its CPU quota.
+The application is imported once in the master process, which also preloads
+the local vector index and the company catalog
+(``app.core.lifecycle.preload``) so workers share them copy-on-write.
+Network clients are recreated in each worker after the fork
+(``app.core.lifecycle.reset_after_fork``). Each worker warms up its
+connections in the background and reports ready on ``/health``. On SIGTERM,
+workers stop accepting connections and finish in-flight requests for up to
+``GRACEFUL_TIMEOUT`` seconds.
+"""
+
+import multiprocessing
+import os
+import tempfile
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = settings.web_concurrency or multiprocessing.cpu_count()
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+graceful_timeout = settings.graceful_timeout
+keepalive = 5
+
+# Aggregate metrics across workers; must be set before prometheus_client is imported
+if workers > 1:
+    os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", tempfile.mkdtemp(prefix="yc-atlas-metrics-"))
+
+
+def on_starting(server):
+    """Preload shared state in the master process, before workers are forked."""
+    from app.core.lifecycle import preload
+    preload()
+
+
+def post_fork(server, worker):
+    """Give the new worker its own network clients instead of the master's."""
+    from app.core.lifecycle import reset_after_fork
+    reset_after_fork()
+
+
+def child_exit(server, worker):
+    """Drop the live gauges of a worker that exited."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -2,7 +2,8 @@
 YC ATLAS Backend - Launch Script
 
 This script provides a convenient way to start the YC ATLAS Backend application.
-It configures environment variables and starts the uvicorn server.
+It configures environment variables and starts a single auto-reloading uvicorn
+server for development, or the multi-worker gunicorn server with --production.
 """
 
 import uvicorn
@@ -29,10 +30,14 @@ if missing_vars:
 
 if __name__ == "__main__":
     print("🚀 Starting YC ATLAS Backend...")
+    if "--production" in sys.argv:
+        # Workers, preloading and draining are configured in gunicorn.conf.py
+        os.execv(sys.executable, [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app.main:app"])
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=int(os.getenv("PORT", "8000")),
         reload=True,
-        log_level="info"
+        log_level="info",
+        timeout_graceful_shutdown=int(os.getenv("GRACEFUL_TIMEOUT", "30"))
     ) 
\ No newline at end of file
@@ -0,0 +1,5 @@
+"""Operational command-line tools for the YC ATLAS backend.
+
+Run them as modules from the repository root, e.g.
+``python -m scripts.sync_pinecone --out data/vector_index``.
+"""
@@ -0,0 +1,46 @@
+"""Build or inspect the approximate nearest neighbor index of a local vector index.
+
+Run with:
+    python -m scripts.build_ann_index build --mode ivf --nlist 256
+    python -m scripts.build_ann_index build --mode hnsw --m 16 --ef-construction 200
+    python -m scripts.build_ann_index info --mode ivf
+"""
+
+import argparse
+import time
+
+from app.core.config import get_settings
+from app.services.ann_index import HNSWIndex, IVFIndex, index_info, load_index
+from app.services.local_index import LocalVectorIndex
+
+
+def main() -> None:
+    """Parse command-line arguments and run the requested command."""
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=("build", "info"))
+    parser.add_argument("--index", default=settings.local_index_path, help="Local index directory")
+    parser.add_argument("--mode", default="ivf", choices=("ivf", "hnsw"))
+    parser.add_argument("--nlist", type=int, default=None, help="IVF clusters (default 4 * sqrt(n))")
+    parser.add_argument("--train-size", type=int, default=100000, help="IVF training sample size")
+    parser.add_argument("--m", type=int, default=16, help="HNSW links per node")
+    parser.add_argument("--ef-construction", type=int, default=200, help="HNSW build beam size")
+    args = parser.parse_args()
+
+    if args.command == "info":
+        index = load_index(args.index, mode=args.mode, nprobe=settings.ivf_nprobe, ef=settings.hnsw_ef)
+        print(index_info(index))
+        return
+
+    base = LocalVectorIndex.load(args.index)
+    started = time.perf_counter()
+    if args.mode == "ivf":
+        index = IVFIndex.build(base, nlist=args.nlist, train_size=args.train_size)
+    else:
+        index = HNSWIndex.build(base, m=args.m, ef_construction=args.ef_construction)
+    index.save(args.index)
+    print(f"Built {index_info(index)} in {time.perf_counter() - started:.1f}s, saved to {args.index}")
+
+
+if __name__ == "__main__":
+    main()
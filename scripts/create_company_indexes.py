@@ -0,0 +1,24 @@
+"""Prepare the company collection for indexed lookups.
+
+Backfills the normalized ``name_lower`` field and creates the slug,
+name and text indexes used by ``/api/company/{id}``. Safe to re-run.
+
+Run with:
+    python -m scripts.create_company_indexes
+"""
+
+import asyncio
+
+from app.db.company_data import backfill_name_lower, ensure_indexes
+
+
+async def main() -> None:
+    """Backfill normalized names, then create the indexes."""
+    updated = await backfill_name_lower()
+    print(f"Backfilled name_lower on {updated} documents")
+    await ensure_indexes()
+    print("Company indexes are in place")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
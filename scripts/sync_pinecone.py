@@ -0,0 +1,83 @@
+"""Export the Pinecone index into a local vector index directory.
+
+Pulls every vector id from the default namespace, fetches the vectors
+and metadata in batches, and writes a ``LocalVectorIndex`` that the
+``local`` vector backend can serve without a network hop.
+
+Run with:
+    python -m scripts.sync_pinecone --out data/vector_index --dtype float16
+    python -m scripts.sync_pinecone --dimensions 256 --keep-full
+"""
+
+import argparse
+import logging
+from typing import Any, Dict, List
+
+import numpy as np
+
+from app.core.config import get_settings
+from app.services.local_index import LocalVectorIndex, SUPPORTED_DTYPES
+from app.services.pinecone_service import get_index
+
+# Number of ids fetched per Pinecone fetch call
+FETCH_BATCH_SIZE = 100
+
+
+def export_index(namespace: str = "") -> Dict[str, Any]:
+    """Download all vectors and metadata of a Pinecone namespace.
+
+    Args:
+        namespace: Pinecone namespace to export
+
+    Returns:
+        Dict[str, Any]: ``ids``, ``vectors`` (float32 matrix) and ``metadata`` lists
+    """
+    index = get_index()
+    ids: List[str] = []
+    vectors: List[List[float]] = []
+    metadata: List[Dict[str, Any]] = []
+
+    for page in index.list(namespace=namespace):
+        for start in range(0, len(page), FETCH_BATCH_SIZE):
+            batch = page[start:start + FETCH_BATCH_SIZE]
+            response = index.fetch(ids=batch, namespace=namespace)
+            for vector_id in batch:
+                vector = response.vectors.get(vector_id)
+                if vector is None:
+                    continue
+                ids.append(vector_id)
+                vectors.append(vector.values)
+                metadata.append(dict(vector.metadata or {}))
+        logging.info(f"Exported {len(ids)} vectors")
+
+    return {"ids": ids, "vectors": np.asarray(vectors, dtype=np.float32), "metadata": metadata}
+
+
+def main() -> None:
+    """Parse command-line arguments and export the index."""
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", default=settings.local_index_path, help="Output index directory")
+    parser.add_argument("--dtype", default="float32", choices=SUPPORTED_DTYPES, help="Vector storage dtype")
+    parser.add_argument("--namespace", default="", help="Pinecone namespace to export")
+    parser.add_argument("--dimensions", type=int, default=settings.embedding_dimensions or None,
+                        help="Keep only the leading dimensions of each vector")
+    parser.add_argument("--keep-full", action="store_true",
+                        help="Also store full-dimension vectors for re-ranking")
+    args = parser.parse_args()
+
+    exported = export_index(args.namespace)
+    index = LocalVectorIndex.build(
+        exported["ids"],
+        exported["vectors"],
+        exported["metadata"],
+        dtype=args.dtype,
+        dimensions=args.dimensions,
+        keep_full=args.keep_full,
+    )
+    index.save(args.out)
+    print(f"Wrote {len(index)} vectors ({index.dimension} dims, {args.dtype}) to {args.out}")
+
+
+if __name__ == "__main__":
+    main()